@@ -17,7 +17,7 @@ from app.core.config import settings
 from app.db.base import Base
 
 # 3. Import ALL models so Alembic can see them (Critical for autogenerate)
-from app.models import users, jobs, submissions 
+from app.models import users, jobs, submissions, resumes, tasks, skills, dedup
 # --- CUSTOM IMPORTS END ---
 
 # this is the Alembic Config object, which provides
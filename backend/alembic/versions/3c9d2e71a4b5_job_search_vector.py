@@ -0,0 +1,43 @@
+"""Job full-text search vector
+
+Revision ID: 3c9d2e71a4b5
+Revises: f8f30b3c3fbf
+Create Date: 2026-10-19 16:05:12.418203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9d2e71a4b5'
+down_revision: Union[str, None] = 'f8f30b3c3fbf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        # Other databases use the in-process index in app.services.job_search
+        op.add_column('jobs', sa.Column('search_vector', sa.Text(), nullable=True))
+        op.create_index('ix_jobs_search_vector', 'jobs', ['search_vector'], unique=False)
+        return
+
+    op.add_column('jobs', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    # Same weights as app.services.job_search.search_vector_expression
+    op.execute("""
+        UPDATE jobs SET search_vector =
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(required_skills, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(requirements, '')), 'C') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'D')
+    """)
+    op.create_index('ix_jobs_search_vector', 'jobs', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jobs_search_vector', table_name='jobs')
+    op.drop_column('jobs', 'search_vector')
@@ -0,0 +1,42 @@
+"""Candidate duplicate detection
+
+Revision ID: 5b7f0e2c8d13
+Revises: a41e6b0d9c27
+Create Date: 2026-10-19 18:02:33.571940
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7f0e2c8d13'
+down_revision: Union[str, None] = 'a41e6b0d9c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('candidate_signatures',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('signature', sa.LargeBinary(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_table('candidate_lsh_buckets',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('band', sa.SmallInteger(), nullable=False),
+    sa.Column('bucket', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'band')
+    )
+    op.create_index('ix_candidate_lsh_buckets_band_bucket', 'candidate_lsh_buckets', ['band', 'bucket'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_candidate_lsh_buckets_band_bucket', table_name='candidate_lsh_buckets')
+    op.drop_table('candidate_lsh_buckets')
+    op.drop_table('candidate_signatures')
@@ -0,0 +1,102 @@
+"""Add submissions.stage_entered_at, jobs.stage_sla_days and submission_alerts
+
+Revision ID: 8f2b6d4c1e97
+Revises: e91c4b7a2f38
+Create Date: 2026-10-20 11:05:18.640219
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f2b6d4c1e97'
+down_revision: Union[str, None] = 'e91c4b7a2f38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def _backfill_stage_entered_at(table_name: str) -> None:
+    """Date of each submission's last timeline event, else applied_at, BATCH_SIZE rows at a time."""
+    bind = op.get_bind()
+    table = sa.table(
+        table_name, sa.column('id'), sa.column('applied_at'), sa.column('timeline_history', sa.JSON()),
+        sa.column('stage_entered_at'),
+    )
+    update = (
+        table.update()
+        .where(table.c.id == sa.bindparam('submission_id'))
+        .values(stage_entered_at=sa.bindparam('entered'))
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(table.c.id, table.c.applied_at, table.c.timeline_history)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        params = []
+        for submission_id, applied_at, history in rows:
+            entered = applied_at
+            if history:
+                try:
+                    entered = datetime.fromisoformat(str(history[-1]["date"]))
+                except (KeyError, TypeError, ValueError):
+                    pass
+            params.append({'submission_id': submission_id, 'entered': entered})
+        bind.execute(update, params)
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    postgres = op.get_bind().dialect.name == "postgresql"
+
+    op.add_column('jobs', sa.Column('stage_sla_days', sa.JSON(), nullable=True))
+
+    for table_name in ('submissions', 'submissions_archive'):
+        op.add_column(table_name, sa.Column('stage_entered_at', sa.DateTime(timezone=True), nullable=True))
+        _backfill_stage_entered_at(table_name)
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.alter_column(
+                'stage_entered_at', existing_type=sa.DateTime(timezone=True), nullable=False,
+                server_default=sa.text('(CURRENT_TIMESTAMP)'),
+            )
+    op.create_index('ix_submissions_status_stage_entered_at', 'submissions', ['status', 'stage_entered_at'], unique=False)
+
+    status_type = postgresql.ENUM(name='submissionstatus', create_type=False) if postgres else sa.Enum(
+        'APPLIED', 'ASSESSMENT', 'INTERVIEW_TECH', 'INTERVIEW_MANAGER', 'OFFER', 'REJECTED', name='submissionstatus'
+    )
+    op.create_table('submission_alerts',
+    sa.Column('submission_id', sa.Integer(), nullable=False),
+    sa.Column('candidate_id', sa.Integer(), nullable=False),
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('status', status_type, nullable=False),
+    sa.Column('stage_entered_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('threshold_days', sa.Integer(), nullable=False),
+    sa.Column('first_seen_at', sa.DateTime(), nullable=False),
+    sa.Column('last_seen_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['candidate_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ),
+    sa.PrimaryKeyConstraint('submission_id')
+    )
+    op.create_index(op.f('ix_submission_alerts_candidate_id'), 'submission_alerts', ['candidate_id'], unique=False)
+    op.create_index(op.f('ix_submission_alerts_job_id'), 'submission_alerts', ['job_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_submission_alerts_job_id'), table_name='submission_alerts')
+    op.drop_index(op.f('ix_submission_alerts_candidate_id'), table_name='submission_alerts')
+    op.drop_table('submission_alerts')
+    op.drop_index('ix_submissions_status_stage_entered_at', table_name='submissions')
+    op.drop_column('submissions_archive', 'stage_entered_at')
+    op.drop_column('submissions', 'stage_entered_at')
+    op.drop_column('jobs', 'stage_sla_days')
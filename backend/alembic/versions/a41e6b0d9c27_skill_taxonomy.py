@@ -0,0 +1,153 @@
+"""Skill taxonomy
+
+Revision ID: a41e6b0d9c27
+Revises: 3c9d2e71a4b5
+Create Date: 2026-10-19 17:21:40.902114
+
+"""
+import re
+from typing import Dict, List, Sequence, Set, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41e6b0d9c27'
+down_revision: Union[str, None] = '3c9d2e71a4b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+# A frozen copy of app.services.skills.SEED_SKILLS as of this revision; later edits there
+# must not change what this migration does
+SEED_SKILLS: Dict[str, List[str]] = {
+    "JavaScript": ["js", "ecmascript", "es6"],
+    "TypeScript": ["ts"],
+    "Python": ["py", "python3"],
+    "Go": ["golang"],
+    "Node.js": ["node", "nodejs", "node js"],
+    "React": ["reactjs", "react.js"],
+    "Vue.js": ["vue", "vuejs"],
+    "Angular": ["angularjs", "angular.js"],
+    "PostgreSQL": ["postgres", "psql"],
+    "Kubernetes": ["k8s"],
+    "Amazon Web Services": ["aws"],
+    "Google Cloud Platform": ["gcp"],
+    "Machine Learning": ["ml"],
+    "C#": ["csharp", "c sharp"],
+    "C++": ["cpp"],
+    ".NET": ["dotnet", "dot net"],
+}
+
+skills = sa.table('skills', sa.column('id', sa.Integer()), sa.column('name', sa.String()), sa.column('key', sa.String()))
+skill_aliases = sa.table('skill_aliases', sa.column('alias', sa.String()), sa.column('skill_id', sa.Integer()))
+
+
+def _split_skills(raw):
+    return {s.strip().lower() for s in re.split(r"[,;/|\n]", raw or "") if s.strip()}
+
+
+def _normalize(name: str) -> str:
+    return re.sub(r"\s+", " ", name.strip().lower())
+
+
+def _seed_and_backfill() -> None:
+    """Insert the seed skills and aliases, then parse existing skill strings into the junction tables."""
+    bind = op.get_bind()
+    ids: Dict[str, int] = {}
+
+    def get_or_create(name: str) -> int:
+        key = _normalize(name)
+        if key not in ids:
+            ids[key] = bind.execute(
+                skills.insert().values(name=name.strip(), key=key).returning(skills.c.id)
+            ).scalar_one()
+        return ids[key]
+
+    for name, aliases in SEED_SKILLS.items():
+        skill_id = get_or_create(name)
+        for alias in aliases:
+            key = _normalize(alias)
+            if key not in ids:
+                bind.execute(skill_aliases.insert().values(alias=key, skill_id=skill_id))
+                ids[key] = skill_id
+
+    # (source table, its id and skills columns, junction table, junction's owner column)
+    sources = (
+        ('candidate_profiles', 'user_id', 'primary_skills', 'candidate_skills', 'user_id'),
+        ('jobs', 'id', 'required_skills', 'job_skills', 'job_id'),
+    )
+    for source_name, owner, field, junction_name, junction_owner in sources:
+        source = sa.table(source_name, sa.column(owner), sa.column(field))
+        junction = sa.table(junction_name, sa.column(junction_owner), sa.column('skill_id'))
+        owner_column = source.c[owner]
+        last_id = 0
+        while True:
+            rows = bind.execute(
+                sa.select(owner_column, source.c[field])
+                .where(owner_column > last_id, source.c[field].isnot(None))
+                .order_by(owner_column)
+                .limit(BATCH_SIZE)
+            ).all()
+            if not rows:
+                break
+            params = []
+            for owner_id, raw in rows:
+                skill_ids: Set[int] = {get_or_create(name) for name in _split_skills(raw)}
+                params.extend({junction_owner: owner_id, 'skill_id': skill_id} for skill_id in skill_ids)
+            if params:
+                bind.execute(junction.insert(), params)
+            last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    op.create_table('skills',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('key', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_skills_id'), 'skills', ['id'], unique=False)
+    op.create_index(op.f('ix_skills_key'), 'skills', ['key'], unique=True)
+    op.create_table('skill_aliases',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('alias', sa.String(), nullable=False),
+    sa.Column('skill_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['skill_id'], ['skills.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_skill_aliases_id'), 'skill_aliases', ['id'], unique=False)
+    op.create_index(op.f('ix_skill_aliases_alias'), 'skill_aliases', ['alias'], unique=True)
+    op.create_table('candidate_skills',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('skill_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['skill_id'], ['skills.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'skill_id')
+    )
+    op.create_index(op.f('ix_candidate_skills_skill_id'), 'candidate_skills', ['skill_id'], unique=False)
+    op.create_table('job_skills',
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('skill_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ),
+    sa.ForeignKeyConstraint(['skill_id'], ['skills.id'], ),
+    sa.PrimaryKeyConstraint('job_id', 'skill_id')
+    )
+    op.create_index(op.f('ix_job_skills_skill_id'), 'job_skills', ['skill_id'], unique=False)
+
+    _seed_and_backfill()
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_job_skills_skill_id'), table_name='job_skills')
+    op.drop_table('job_skills')
+    op.drop_index(op.f('ix_candidate_skills_skill_id'), table_name='candidate_skills')
+    op.drop_table('candidate_skills')
+    op.drop_index(op.f('ix_skill_aliases_alias'), table_name='skill_aliases')
+    op.drop_index(op.f('ix_skill_aliases_id'), table_name='skill_aliases')
+    op.drop_table('skill_aliases')
+    op.drop_index(op.f('ix_skills_key'), table_name='skills')
+    op.drop_index(op.f('ix_skills_id'), table_name='skills')
+    op.drop_table('skills')
@@ -0,0 +1,219 @@
+"""Bring the initial schema up to the baseline models
+
+Revision ID: b5e2a9c4d710
+Revises: 7bbbcea4ce8c
+Create Date: 2026-10-20 11:02:15.318204
+
+The initial revision predates several model changes (first/last names, candidate
+profile fields, job details, submission timelines and the renamed roles and stages)
+and never created `resumes` or `candidate_assignments`; until now `create_all` at
+import filled those gaps. Existing values are carried over where a column was renamed.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e2a9c4d710'
+down_revision: Union[str, None] = '7bbbcea4ce8c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OLD_STATUSES = ('APPLIED', 'SCREENING', 'INTERVIEW', 'OFFER', 'REJECTED')
+submission_status = sa.Enum('APPLIED', 'ASSESSMENT', 'INTERVIEW_TECH', 'INTERVIEW_MANAGER', 'OFFER', 'REJECTED', name='submissionstatus')
+experience_level = sa.Enum('FRESHER', 'ONE_TO_THREE', 'THREE_TO_FIVE', 'FIVE_PLUS', name='experiencelevel')
+
+users = sa.table('users', sa.column('name', sa.String()), sa.column('first_name', sa.String()), sa.column('role', sa.String()))
+profiles = sa.table(
+    'candidate_profiles',
+    sa.column('location', sa.String()), sa.column('current_city', sa.String()),
+    sa.column('skills', sa.String()), sa.column('primary_skills', sa.String()),
+    sa.column('experience_years', sa.Integer()), sa.column('experience_level', experience_level),
+)
+jobs = sa.table('jobs', sa.column('manager_id', sa.Integer()), sa.column('creator_id', sa.Integer()))
+submissions = sa.table(
+    'submissions', sa.column('created_at', sa.DateTime()), sa.column('applied_at', sa.DateTime()), sa.column('status', sa.String()),
+)
+
+# Old enum value -> baseline enum value
+ROLE_RENAMES = {'TALENT_MANAGER': 'HIRING_MANAGER'}
+STATUS_RENAMES = {'SCREENING': 'ASSESSMENT', 'INTERVIEW': 'INTERVIEW_TECH'}
+# experience_years -> experience_level, as [low, high) ranges
+EXPERIENCE_LEVELS = (('FRESHER', None, 1), ('ONE_TO_THREE', 1, 3), ('THREE_TO_FIVE', 3, 5), ('FIVE_PLUS', 5, None))
+
+
+def _rename_enum_values(enum_name: str, table, column: str, renames: dict, reverse: bool = False) -> None:
+    """Postgres renames the type's labels in place; elsewhere enums are plain strings."""
+    pairs = [(new, old) if reverse else (old, new) for old, new in renames.items()]
+    if op.get_bind().dialect.name == 'postgresql':
+        for old, new in pairs:
+            op.execute(f"ALTER TYPE {enum_name} RENAME VALUE '{old}' TO '{new}'")
+        return
+    for old, new in pairs:
+        op.execute(table.update().where(table.c[column] == old).values({column: new}))
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    # users: name -> first_name, role TALENT_MANAGER -> HIRING_MANAGER
+    with op.batch_alter_table('users') as batch:
+        batch.add_column(sa.Column('first_name', sa.String(), nullable=True))
+        batch.add_column(sa.Column('last_name', sa.String(), nullable=True))
+        batch.add_column(sa.Column('phone', sa.String(), nullable=True))
+    op.execute(users.update().values(first_name=users.c.name))
+    _rename_enum_values('userrole', users, 'role', ROLE_RENAMES)
+    with op.batch_alter_table('users') as batch:
+        batch.drop_column('name')
+        batch.drop_column('updated_at')
+        batch.alter_column('role', existing_type=sa.Enum('ADMIN', 'HIRING_MANAGER', 'CANDIDATE', name='userrole'), nullable=True)
+        # The initial revision's literal now() doesn't exist on SQLite
+        batch.alter_column('created_at', existing_type=sa.DateTime(timezone=True), server_default=sa.func.now())
+
+    # candidate_profiles: location -> current_city, skills -> primary_skills, years -> level
+    experience_level.create(bind, checkfirst=True)
+    with op.batch_alter_table('candidate_profiles') as batch:
+        batch.add_column(sa.Column('current_city', sa.String(), nullable=True))
+        batch.add_column(sa.Column('visa_status', sa.String(), nullable=True))
+        batch.add_column(sa.Column('experience_level', experience_level, nullable=True))
+        batch.add_column(sa.Column('primary_skills', sa.String(), nullable=True))
+    op.execute(profiles.update().values(current_city=profiles.c.location, primary_skills=profiles.c.skills))
+    for level, low, high in EXPERIENCE_LEVELS:
+        condition = profiles.c.experience_years.isnot(None)
+        if low is not None:
+            condition &= profiles.c.experience_years >= low
+        if high is not None:
+            condition &= profiles.c.experience_years < high
+        op.execute(profiles.update().where(condition).values(experience_level=level))
+    with op.batch_alter_table('candidate_profiles') as batch:
+        for column in ('location', 'experience_years', 'skills', 'resume_1_url', 'resume_2_url'):
+            batch.drop_column(column)
+
+    # jobs: manager_id -> creator_id, plus the posting details
+    with op.batch_alter_table('jobs') as batch:
+        batch.add_column(sa.Column('company_name', sa.String(), nullable=False, server_default=''))
+        batch.add_column(sa.Column('department', sa.String(), nullable=True))
+        batch.add_column(sa.Column('employment_type', sa.String(), nullable=True))
+        batch.add_column(sa.Column('salary_range', sa.String(), nullable=True))
+        batch.add_column(sa.Column('required_skills', sa.Text(), nullable=True))
+        batch.add_column(sa.Column('experience_required', sa.String(), nullable=True))
+        batch.add_column(sa.Column('hiring_stages', sa.JSON(), nullable=True))
+        batch.add_column(sa.Column('creator_id', sa.Integer(), nullable=True))
+        batch.create_foreign_key('fk_jobs_creator_id_users', 'users', ['creator_id'], ['id'])
+    op.execute(jobs.update().values(creator_id=jobs.c.manager_id))
+    with op.batch_alter_table('jobs') as batch:
+        batch.alter_column('company_name', existing_type=sa.String(), server_default=None)
+        batch.drop_column('manager_id')
+        batch.drop_column('updated_at')
+        batch.alter_column('created_at', existing_type=sa.DateTime(timezone=True), type_=sa.DateTime(), server_default=None)
+
+    op.create_table('resumes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('file_name', sa.String(), nullable=False),
+    sa.Column('file_url', sa.String(), nullable=False),
+    sa.Column('is_primary', sa.Boolean(), nullable=True),
+    sa.Column('uploaded_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_resumes_id'), 'resumes', ['id'], unique=False)
+
+    op.create_table('candidate_assignments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('manager_id', sa.Integer(), nullable=False),
+    sa.Column('candidate_id', sa.Integer(), nullable=False),
+    sa.Column('assigned_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['candidate_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['manager_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('candidate_id')
+    )
+    op.create_index(op.f('ix_candidate_assignments_id'), 'candidate_assignments', ['id'], unique=False)
+
+    # submissions: created_at -> applied_at, the resume as a row, stages renamed
+    if bind.dialect.name == 'postgresql':
+        op.execute("ALTER TYPE submissionstatus ADD VALUE IF NOT EXISTS 'INTERVIEW_MANAGER' AFTER 'INTERVIEW'")
+    _rename_enum_values('submissionstatus', submissions, 'status', STATUS_RENAMES)
+    with op.batch_alter_table('submissions') as batch:
+        batch.add_column(sa.Column('resume_id', sa.Integer(), nullable=True))
+        batch.add_column(sa.Column('timeline_history', sa.JSON(), nullable=True))
+        batch.add_column(sa.Column('manager_notes', sa.Text(), nullable=True))
+        batch.add_column(sa.Column('applied_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True))
+        batch.add_column(sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+        batch.create_foreign_key('fk_submissions_resume_id_resumes', 'resumes', ['resume_id'], ['id'])
+        batch.alter_column('job_id', existing_type=sa.Integer(), nullable=True)
+        batch.alter_column('candidate_id', existing_type=sa.Integer(), nullable=True)
+        if bind.dialect.name != 'postgresql':
+            # A string column sized for the old labels
+            batch.alter_column('status', existing_type=sa.String(9), type_=submission_status)
+    op.execute(submissions.update().where(submissions.c.created_at.isnot(None)).values(applied_at=submissions.c.created_at))
+    with op.batch_alter_table('submissions') as batch:
+        # The old free-text resume reference has no resumes row to point at
+        batch.drop_column('resume_used')
+        batch.drop_column('created_at')
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+
+    with op.batch_alter_table('submissions') as batch:
+        batch.add_column(sa.Column('resume_used', sa.String(), nullable=True))
+        batch.add_column(sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True))
+    op.execute(submissions.update().values(created_at=submissions.c.applied_at))
+    # Postgres can't drop an enum label; the few INTERVIEW_MANAGER rows fall back to INTERVIEW
+    op.execute(submissions.update().where(submissions.c.status == 'INTERVIEW_MANAGER').values(status='INTERVIEW_TECH'))
+    _rename_enum_values('submissionstatus', submissions, 'status', STATUS_RENAMES, reverse=True)
+    with op.batch_alter_table('submissions') as batch:
+        batch.drop_constraint('fk_submissions_resume_id_resumes', type_='foreignkey')
+        for column in ('updated_at', 'applied_at', 'manager_notes', 'timeline_history', 'resume_id'):
+            batch.drop_column(column)
+        batch.alter_column('job_id', existing_type=sa.Integer(), nullable=False)
+        batch.alter_column('candidate_id', existing_type=sa.Integer(), nullable=False)
+        if bind.dialect.name != 'postgresql':
+            batch.alter_column('status', existing_type=submission_status, type_=sa.Enum(*OLD_STATUSES, name='submissionstatus'))
+
+    op.drop_index(op.f('ix_candidate_assignments_id'), table_name='candidate_assignments')
+    op.drop_table('candidate_assignments')
+    op.drop_index(op.f('ix_resumes_id'), table_name='resumes')
+    op.drop_table('resumes')
+
+    with op.batch_alter_table('jobs') as batch:
+        batch.add_column(sa.Column('manager_id', sa.Integer(), nullable=True))
+        batch.add_column(sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True))
+        batch.alter_column('created_at', existing_type=sa.DateTime(), type_=sa.DateTime(timezone=True), server_default=sa.func.now())
+    op.execute(jobs.update().values(manager_id=jobs.c.creator_id))
+    with op.batch_alter_table('jobs') as batch:
+        batch.drop_constraint('fk_jobs_creator_id_users', type_='foreignkey')
+        for column in ('creator_id', 'hiring_stages', 'experience_required', 'required_skills', 'salary_range',
+                       'employment_type', 'department', 'company_name'):
+            batch.drop_column(column)
+        batch.alter_column('manager_id', existing_type=sa.Integer(), nullable=False)
+        batch.create_foreign_key('fk_jobs_manager_id_users', 'users', ['manager_id'], ['id'])
+
+    with op.batch_alter_table('candidate_profiles') as batch:
+        batch.add_column(sa.Column('location', sa.String(), nullable=True))
+        batch.add_column(sa.Column('experience_years', sa.Integer(), nullable=True))
+        batch.add_column(sa.Column('skills', sa.String(), nullable=True))
+        batch.add_column(sa.Column('resume_1_url', sa.String(), nullable=True))
+        batch.add_column(sa.Column('resume_2_url', sa.String(), nullable=True))
+    op.execute(profiles.update().values(location=profiles.c.current_city, skills=profiles.c.primary_skills))
+    for level, low, _ in EXPERIENCE_LEVELS:
+        op.execute(profiles.update().where(profiles.c.experience_level == level).values(experience_years=low or 0))
+    with op.batch_alter_table('candidate_profiles') as batch:
+        for column in ('primary_skills', 'experience_level', 'visa_status', 'current_city'):
+            batch.drop_column(column)
+    experience_level.drop(bind, checkfirst=True)
+
+    with op.batch_alter_table('users') as batch:
+        batch.add_column(sa.Column('name', sa.String(), nullable=True))
+        batch.add_column(sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True))
+    op.execute(users.update().values(name=sa.func.coalesce(users.c.first_name, '')))
+    _rename_enum_values('userrole', users, 'role', ROLE_RENAMES, reverse=True)
+    with op.batch_alter_table('users') as batch:
+        for column in ('phone', 'last_name', 'first_name'):
+            batch.drop_column(column)
+        batch.alter_column('name', existing_type=sa.String(), nullable=False)
+        batch.alter_column('role', existing_type=sa.Enum('ADMIN', 'TALENT_MANAGER', 'CANDIDATE', name='userrole'), nullable=False)
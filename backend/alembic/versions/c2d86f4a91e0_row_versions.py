@@ -0,0 +1,28 @@
+"""Version columns for optimistic concurrency on jobs and submissions
+
+Revision ID: c2d86f4a91e0
+Revises: 5b7f0e2c8d13
+Create Date: 2026-10-19 21:12:08.304117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2d86f4a91e0'
+down_revision: Union[str, None] = '5b7f0e2c8d13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('submissions', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('submissions', 'version')
+    op.drop_column('jobs', 'version')
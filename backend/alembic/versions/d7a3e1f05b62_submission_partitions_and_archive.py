@@ -0,0 +1,144 @@
+"""Partition submissions by applied_at, add submissions_archive and jobs.closed_at
+
+Revision ID: d7a3e1f05b62
+Revises: c2d86f4a91e0
+Create Date: 2026-10-19 22:40:51.118204
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a3e1f05b62'
+down_revision: Union[str, None] = 'c2d86f4a91e0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Monthly partitions created beyond the current month; later ones come from
+# app.services.archival.ensure_submission_partitions
+MONTHS_AHEAD = 3
+
+
+def _add_months(day: date, months: int) -> date:
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def _partition_submissions() -> None:
+    """Rebuild `submissions` as a table range-partitioned by month of applied_at (Postgres)."""
+    bind = op.get_bind()
+    op.execute("ALTER TABLE submissions RENAME TO submissions_unpartitioned")
+    op.execute("ALTER TABLE submissions_unpartitioned RENAME CONSTRAINT submissions_pkey TO submissions_unpartitioned_pkey")
+    for index in ("ix_submissions_id", "ix_submissions_candidate_id", "ix_submissions_job_id"):
+        op.execute(f"ALTER INDEX {index} RENAME TO {index.replace('submissions', 'submissions_unpartitioned', 1)}")
+
+    op.execute("CREATE TABLE submissions (LIKE submissions_unpartitioned INCLUDING DEFAULTS) PARTITION BY RANGE (applied_at)")
+    # The partition key has to be part of the primary key
+    op.execute("ALTER TABLE submissions ADD CONSTRAINT submissions_pkey PRIMARY KEY (id, applied_at)")
+    op.execute("ALTER SEQUENCE submissions_id_seq OWNED BY submissions.id")
+    op.execute("ALTER TABLE submissions ADD FOREIGN KEY (candidate_id) REFERENCES users (id)")
+    op.execute("ALTER TABLE submissions ADD FOREIGN KEY (job_id) REFERENCES jobs (id)")
+    op.execute("ALTER TABLE submissions ADD FOREIGN KEY (resume_id) REFERENCES resumes (id)")
+    op.create_index('ix_submissions_id', 'submissions', ['id'], unique=False)
+    op.create_index('ix_submissions_candidate_id', 'submissions', ['candidate_id'], unique=False)
+    op.create_index('ix_submissions_job_id', 'submissions', ['job_id'], unique=False)
+
+    oldest = bind.execute(sa.text("SELECT min(applied_at) FROM submissions_unpartitioned")).scalar()
+    month = (oldest.date() if oldest else date.today()).replace(day=1)
+    last = _add_months(date.today().replace(day=1), MONTHS_AHEAD)
+    while month <= last:
+        end = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE submissions_y{month.year}m{month.month:02d} PARTITION OF submissions "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        month = end
+    op.execute("CREATE TABLE submissions_default PARTITION OF submissions DEFAULT")
+
+    op.execute("INSERT INTO submissions SELECT * FROM submissions_unpartitioned")
+    op.execute("DROP TABLE submissions_unpartitioned")
+
+
+def _unpartition_submissions() -> None:
+    op.execute("ALTER TABLE submissions RENAME TO submissions_partitioned")
+    op.execute("ALTER TABLE submissions_partitioned RENAME CONSTRAINT submissions_pkey TO submissions_partitioned_pkey")
+    for index in ("ix_submissions_id", "ix_submissions_candidate_id", "ix_submissions_job_id"):
+        op.execute(f"ALTER INDEX {index} RENAME TO {index.replace('submissions', 'submissions_partitioned', 1)}")
+    op.execute("CREATE TABLE submissions (LIKE submissions_partitioned INCLUDING DEFAULTS)")
+    op.execute("ALTER TABLE submissions ADD CONSTRAINT submissions_pkey PRIMARY KEY (id)")
+    op.execute("ALTER SEQUENCE submissions_id_seq OWNED BY submissions.id")
+    op.execute("ALTER TABLE submissions ADD FOREIGN KEY (candidate_id) REFERENCES users (id)")
+    op.execute("ALTER TABLE submissions ADD FOREIGN KEY (job_id) REFERENCES jobs (id)")
+    op.execute("ALTER TABLE submissions ADD FOREIGN KEY (resume_id) REFERENCES resumes (id)")
+    op.create_index('ix_submissions_id', 'submissions', ['id'], unique=False)
+    op.create_index('ix_submissions_candidate_id', 'submissions', ['candidate_id'], unique=False)
+    op.create_index('ix_submissions_job_id', 'submissions', ['job_id'], unique=False)
+    op.execute("INSERT INTO submissions SELECT * FROM submissions_partitioned")
+    op.execute("DROP TABLE submissions_partitioned CASCADE")
+
+
+def upgrade() -> None:
+    postgres = op.get_bind().dialect.name == "postgresql"
+
+    op.add_column('jobs', sa.Column('closed_at', sa.DateTime(), nullable=True))
+    # The real close date of already-closed jobs is unknown; start their archival clock now
+    op.execute("UPDATE jobs SET closed_at = CURRENT_TIMESTAMP WHERE is_active = false")
+
+    op.execute("UPDATE submissions SET applied_at = CURRENT_TIMESTAMP WHERE applied_at IS NULL")
+    with op.batch_alter_table('submissions') as batch_op:
+        batch_op.alter_column('applied_at', existing_type=sa.DateTime(timezone=True), nullable=False)
+    op.create_index('ix_submissions_candidate_id', 'submissions', ['candidate_id'], unique=False)
+    op.create_index('ix_submissions_job_id', 'submissions', ['job_id'], unique=False)
+
+    # Reuse the live table's enum type on Postgres
+    status_type = postgresql.ENUM(name='submissionstatus', create_type=False) if postgres else sa.Enum(
+        'APPLIED', 'ASSESSMENT', 'INTERVIEW_TECH', 'INTERVIEW_MANAGER', 'OFFER', 'REJECTED', name='submissionstatus'
+    )
+    op.create_table('submissions_archive',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('candidate_id', sa.Integer(), nullable=True),
+    sa.Column('job_id', sa.Integer(), nullable=True),
+    sa.Column('resume_id', sa.Integer(), nullable=True),
+    sa.Column('status', status_type, nullable=True),
+    sa.Column('ats_score', sa.Float(), nullable=True),
+    sa.Column('timeline_history', sa.JSON(), nullable=True),
+    sa.Column('manager_notes', sa.Text(), nullable=True),
+    sa.Column('applied_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['candidate_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ),
+    sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_submissions_archive_id', 'submissions_archive', ['id'], unique=False)
+    op.create_index('ix_submissions_archive_candidate_id', 'submissions_archive', ['candidate_id'], unique=False)
+    op.create_index('ix_submissions_archive_job_id', 'submissions_archive', ['job_id'], unique=False)
+
+    if postgres:
+        _partition_submissions()
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        _unpartition_submissions()
+
+    # Archived rows go back to the live table
+    columns = "id, candidate_id, job_id, resume_id, status, ats_score, timeline_history, manager_notes, applied_at, updated_at, version"
+    op.execute(f"INSERT INTO submissions ({columns}) SELECT {columns} FROM submissions_archive")
+    op.drop_index('ix_submissions_archive_job_id', table_name='submissions_archive')
+    op.drop_index('ix_submissions_archive_candidate_id', table_name='submissions_archive')
+    op.drop_index('ix_submissions_archive_id', table_name='submissions_archive')
+    op.drop_table('submissions_archive')
+
+    op.drop_index('ix_submissions_job_id', table_name='submissions')
+    op.drop_index('ix_submissions_candidate_id', table_name='submissions')
+    with op.batch_alter_table('submissions') as batch_op:
+        batch_op.alter_column('applied_at', existing_type=sa.DateTime(timezone=True), nullable=True)
+    op.drop_column('jobs', 'closed_at')
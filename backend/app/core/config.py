@@ -1,4 +1,5 @@
 import os
+from typing import Dict
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -9,8 +10,87 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # Connections opened per worker at startup so the first requests skip connect()
+    DB_POOL_WARMUP: int = 2
+    # Local development only; deployed databases are managed by `alembic upgrade head`
+    AUTO_CREATE_TABLES: bool = False
+    # Comma-separated read replica URLs used by get_read_db; empty means everything hits the primary
+    DATABASE_REPLICA_URLS: str = ""
+    # How often each replica is probed; a failed replica stays out of rotation until its next probe
+    REPLICA_HEALTH_CHECK_SECONDS: float = 10.0
+    # After a user writes, their reads stay on the primary for this long
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    RATE_LIMIT_ENABLED: bool = True
+    # "memory" (per worker) or "sqlite:///<path>" (shared by the workers on one host)
+    RATE_LIMIT_BACKEND: str = "memory"
+    # Merged over app.core.rate_limit.DEFAULT_RATE_LIMITS, e.g. {"login": "20/60", "apply:CANDIDATE": "5/60"}
+    RATE_LIMIT_OVERRIDES: Dict[str, str] = {}
+    # Only enable behind a proxy that overwrites X-Forwarded-For
+    RATE_LIMIT_TRUST_PROXY: bool = False
+
+    # Background tasks (see worker.py)
+    TASK_POLL_INTERVAL: float = 1.0
+    TASK_VISIBILITY_TIMEOUT: int = 300
+    TASK_MAX_ATTEMPTS: int = 5
+    TASK_RETRY_BASE_SECONDS: float = 5.0
+    TASK_RETRY_MAX_SECONDS: float = 600.0
+
+    # "local" (single worker), "postgres" (LISTEN/NOTIFY across workers) or
+    # "file:/path/to/log" (an appended file tailed by every process on the host)
+    PUBSUB_BACKEND: str = "local"
+    SSE_HEARTBEAT_SECONDS: float = 15.0
+    # Events buffered per SSE client; a client further behind is disconnected and replays on reconnect
+    SSE_QUEUE_SIZE: int = 256
+
+    # Size of each candidate's precomputed "jobs for you" list
+    RECOMMENDATIONS_PER_CANDIDATE: int = 20
+
+    # Duplicate candidate detection (app.services.dedup)
+    DEDUP_THRESHOLD: float = 0.8
+    DEDUP_SCAN_PROCESSES: int = 4
+
+    # Full reload interval for the in-process assignment index, in case an invalidation was missed
+    ASSIGNMENT_INDEX_MAX_AGE_SECONDS: float = 300.0
+
+    # Stack sampling period of POST /api/admin/profile and the X-Profile request header
+    PROFILE_SAMPLE_INTERVAL_MS: float = 5.0
+    # Longest whole-worker profile an admin can request
+    PROFILE_MAX_SECONDS: float = 60.0
+
+    # Response compression (app.core.compression); brotli is used when the package is installed
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    # Unfiltered job board pages are served from a per-worker cache of precompressed bodies
+    JOB_BOARD_CACHE_SECONDS: float = 30.0
+    JOB_BOARD_CACHE_ENTRIES: int = 256
+    # GET /api/jobs/{id}, cached per job; concurrent misses for one job share a single query
+    JOB_DETAIL_CACHE_SECONDS: float = 5.0
+    JOB_DETAIL_CACHE_ENTRIES: int = 2048
+
+    # POST /api/batch: sub-requests per call, and how many run at once (each lane has its own session)
+    BATCH_MAX_REQUESTS: int = 20
+    BATCH_MAX_CONCURRENCY: int = 4
+
+    # Submissions of jobs closed longer than this move to submissions_archive (app.services.archival)
+    SUBMISSION_ARCHIVE_AFTER_DAYS: int = 90
+    # Monthly `submissions` partitions kept created ahead of time (Postgres)
+    SUBMISSION_PARTITION_MONTHS_AHEAD: int = 3
+
+    # Days a submission may sit in a stage before it shows in the "needs attention" feed;
+    # jobs override these through their stage_sla_days
+    SUBMISSION_STAGE_SLA_DAYS: Dict[str, int] = {
+        "Applied": 7, "Online Assessment": 7, "Technical Interview": 14, "Manager Round": 14,
+    }
+    # Periodic tasks enqueued by the worker's scheduler (app.services.scheduler), in seconds
+    SCHEDULER_TICK_SECONDS: float = 30.0
+    STALLED_SUBMISSION_SCAN_SECONDS: float = 900.0
+    SUBMISSION_ARCHIVE_SECONDS: float = 86400.0
 
     class Config:
         env_file = ".env"
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
@@ -0,0 +1,148 @@
+import typing
+from typing import Dict, List, Optional, Set, Type
+
+from fastapi import HTTPException, Query, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only, selectinload
+
+# Response fields backed by a model property rather than a column of the same name
+PROPERTY_COLUMNS = {
+    ("Submission", "current_status"): ("status",),
+    ("ArchivedSubmission", "current_status"): ("status",),
+}
+
+_adapters: Dict[tuple, TypeAdapter] = {}
+
+
+def _nested_schema(annotation) -> Optional[Type[BaseModel]]:
+    """The response model embedded by a field annotated X, Optional[X] or List[X], if any."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in typing.get_args(annotation):
+        nested = _nested_schema(arg)
+        if nested is not None:
+            return nested
+    return None
+
+
+def _adapter(schema: Type[BaseModel], name: str) -> TypeAdapter:
+    key = (schema, name)
+    if key not in _adapters:
+        _adapters[key] = TypeAdapter(schema.model_fields[name].annotation)
+    return _adapters[key]
+
+
+class FieldSelection:
+    """
+    Which fields of a response model to return and which embedded objects to expand.
+    `fields` None means every scalar field; `expand` maps relationship fields to the
+    selection applied inside them.
+    """
+
+    def __init__(self, schema: Type[BaseModel], fields: Optional[Set[str]], expand: Dict[str, "FieldSelection"]):
+        self.schema = schema
+        self.fields = fields
+        self.expand = expand
+
+    @classmethod
+    def parse(cls, schema: Type[BaseModel], field_paths: Optional[List[List[str]]], expand_paths: Optional[List[List[str]]]) -> "FieldSelection":
+        relations = {name: _nested_schema(f.annotation) for name, f in schema.model_fields.items()}
+        relations = {name: nested for name, nested in relations.items() if nested is not None}
+        for path in field_paths or []:
+            if path[0] not in schema.model_fields or (len(path) > 1 and path[0] not in relations):
+                raise ValueError(".".join(path))
+        for path in expand_paths or []:
+            if path[0] not in relations:
+                raise ValueError(".".join(path))
+
+        fields = None
+        if field_paths is not None:
+            fields = {p[0] for p in field_paths if len(p) == 1 and p[0] not in relations}
+            if "id" in schema.model_fields:
+                fields.add("id")
+
+        if field_paths is None and expand_paths is None:
+            expanded = set(relations)
+        else:
+            # Relationships named in `fields` (bare or dotted) are expanded implicitly
+            expanded = {p[0] for p in (field_paths or []) + (expand_paths or []) if p[0] in relations}
+
+        expand = {}
+        for name in expanded:
+            nested_fields = [p[1:] for p in field_paths or [] if p[0] == name and len(p) > 1] or None
+            nested_expand = [p[1:] for p in expand_paths or [] if p[0] == name and len(p) > 1] or None
+            expand[name] = cls.parse(relations[name], nested_fields, nested_expand)
+        return cls(schema, fields, expand)
+
+    def _columns(self, model) -> list:
+        mapper = inspect(model)
+        # Deferred columns (e.g. Job.search_vector) stay deferred unless asked for by name
+        names = {attr.key for attr in mapper.column_attrs if not attr.deferred} if self.fields is None else set()
+        for name in self.fields or ():
+            names.update(PROPERTY_COLUMNS.get((model.__name__, name), (name,)))
+        # Keys needed to load the expanded relationships
+        names.update(column.key for column in mapper.primary_key)
+        for name in self.expand:
+            names.update(column.key for column in mapper.relationships[name].local_columns)
+        return [getattr(model, name) for name in names if name in mapper.column_attrs]
+
+    def _relation_options(self, model) -> list:
+        mapper = inspect(model)
+        options = []
+        for name, nested in self.expand.items():
+            target = mapper.relationships[name].mapper.class_
+            loader = selectinload(getattr(model, name))
+            options.append(loader.options(load_only(*nested._columns(target)), *nested._relation_options(target)))
+        return options
+
+    def load_options(self, model) -> list:
+        """Query options loading only the selected columns and relationships of `model`."""
+        return [load_only(*self._columns(model)), *self._relation_options(model)]
+
+    def dump(self, obj) -> Optional[dict]:
+        if obj is None:
+            return None
+        data = {}
+        for name in self.schema.model_fields:
+            if name in self.expand:
+                value = getattr(obj, name)
+                nested = self.expand[name]
+                data[name] = [nested.dump(v) for v in value] if isinstance(value, list) else nested.dump(value)
+            elif _nested_schema(self.schema.model_fields[name].annotation) is None:
+                if self.fields is None or name in self.fields:
+                    adapter = _adapter(self.schema, name)
+                    data[name] = adapter.dump_python(adapter.validate_python(getattr(obj, name)), mode="json")
+        return data
+
+    def response(self, objs) -> JSONResponse:
+        if isinstance(objs, list):
+            return JSONResponse([self.dump(obj) for obj in objs])
+        return JSONResponse(self.dump(objs))
+
+
+def _split(value: Optional[str]) -> Optional[List[List[str]]]:
+    if value is None:
+        return None
+    return [part.strip().split(".") for part in value.split(",") if part.strip()]
+
+
+def field_selection(schema: Type[BaseModel]):
+    """
+    Dependency parsing `?fields=` and `?expand=` for endpoints returning `schema`.
+    Returns None when neither is given, so the endpoint keeps its full response.
+    """
+
+    def dependency(
+        fields: Optional[str] = Query(None, description="Comma-separated fields to return; dotted paths select nested fields, e.g. job.title"),
+        expand: Optional[str] = Query(None, description="Comma-separated embedded objects to include, e.g. job,candidate.profile; empty for none"),
+    ) -> Optional[FieldSelection]:
+        if fields is None and expand is None:
+            return None
+        try:
+            return FieldSelection.parse(schema, _split(fields), _split(expand))
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown field: {e}")
+
+    return dependency
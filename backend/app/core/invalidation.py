@@ -0,0 +1,102 @@
+import logging
+import threading
+import uuid
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+from sqlalchemy.orm import Session
+
+from app.core.pubsub import broker, INVALIDATIONS
+from app.db.session import SessionLocal, run_after_commit
+
+logger = logging.getLogger(__name__)
+
+# Keys per message, to stay well under the 8000-byte NOTIFY payload limit
+KEYS_PER_MESSAGE = 200
+
+Handler = Callable[[Session, int], None]
+
+
+class InvalidationBus:
+    """
+    Tells the other workers which cached entities a committed write changed, as typed keys
+    such as "job:42", "user:7" or "assignment:3". The writing worker updates its own caches
+    after commit as before; every other worker runs the handlers registered for the key's
+    kind, which re-read that one entity from the database.
+
+    Each message carries the sending worker's id and a generation counter that increases
+    by one per message. A receiver that sees a gap in a sender's generations, or whose
+    transport reconnected, has missed messages and reloads every cache in full (`resync`).
+    """
+
+    def __init__(self):
+        self.origin = uuid.uuid4().hex
+        self.handlers: Dict[str, List[Handler]] = defaultdict(list)
+        self.resync_hooks: List[Callable[[], None]] = []
+        self._generation = 0
+        self._seen: Dict[str, int] = {}
+        self._publish_lock = threading.Lock()
+        self._receive_lock = threading.Lock()
+
+    def handler(self, kind: str):
+        """Register `func(db, id)` to refresh the caches behind "<kind>:<id>" keys."""
+        def decorator(func: Handler):
+            self.handlers[kind].append(func)
+            return func
+        return decorator
+
+    def on_resync(self, func: Callable[[], None]):
+        """Register a full cache reload, run when invalidations may have been missed."""
+        self.resync_hooks.append(func)
+        return func
+
+    def publish(self, db: Session, *keys: str):
+        """Broadcast `keys` once the caller commits."""
+        run_after_commit(db, lambda: self.send(list(dict.fromkeys(keys))))
+
+    def send(self, keys: List[str]):
+        for start in range(0, len(keys), KEYS_PER_MESSAGE):
+            # Generations go out in the order they are taken
+            with self._publish_lock:
+                self._generation += 1
+                data = {"origin": self.origin, "generation": self._generation, "keys": keys[start:start + KEYS_PER_MESSAGE]}
+                try:
+                    broker.publish(INVALIDATIONS, data)
+                except Exception as e:
+                    # Receivers will see the skipped generation and resync
+                    logger.error(f"Failed to publish invalidations {data['keys']}: {e}")
+
+    def receive(self, data: dict):
+        origin, generation = data["origin"], data["generation"]
+        if origin == self.origin:
+            return
+        with self._receive_lock:
+            last = self._seen.get(origin)
+            self._seen[origin] = generation
+            if last is not None and generation != last + 1:
+                logger.warning(f"Missed invalidations {last + 1}..{generation - 1} from worker {origin}, resyncing")
+                self.resync()
+                return
+            db = SessionLocal()
+            try:
+                for key in data["keys"]:
+                    kind, _, ident = key.partition(":")
+                    for handle in self.handlers.get(kind, ()):
+                        try:
+                            handle(db, int(ident))
+                        except Exception as e:
+                            logger.error(f"Invalidation handler {handle.__name__} failed for {key}: {e}")
+            finally:
+                db.close()
+
+    def resync(self):
+        for hook in self.resync_hooks:
+            try:
+                hook()
+            except Exception as e:
+                logger.error(f"Resync {hook.__name__} failed: {e}")
+
+
+invalidations = InvalidationBus()
+broker.listen(INVALIDATIONS, invalidations.receive)
+broker.on_reconnect(invalidations.resync)
@@ -0,0 +1,311 @@
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from fastapi.responses import Response
+from jose import JWTError, jwt
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import Headers
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.users import User, UserRole
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+FORMATS = ("speedscope", "collapsed")
+
+# (function, file, first line): one flamegraph node per function rather than per line
+Frame = Tuple[str, str, int]
+
+# Leaf functions of a thread that is waiting for work rather than doing any
+IDLE_LEAVES = {
+    ("wait", "threading.py"), ("select", "selectors.py"), ("get", "queue.py"), ("_worker", "thread.py"),
+}
+
+# Only one sampler per process: the interval timer and SIGALRM are process-wide
+_sampling = threading.Lock()
+
+
+def _frame_key(frame) -> Frame:
+    code = frame.f_code
+    return (code.co_qualname, code.co_filename, code.co_firstlineno)
+
+
+def _stack(frame) -> Tuple[Frame, ...]:
+    """Root-first stack ending at `frame`."""
+    stack = []
+    while frame is not None:
+        stack.append(_frame_key(frame))
+        frame = frame.f_back
+    return tuple(reversed(stack))
+
+
+def _is_idle(stack: Tuple[Frame, ...]) -> bool:
+    name, filename, _ = stack[-1]
+    return (name.rsplit(".", 1)[-1], os.path.basename(filename)) in IDLE_LEAVES
+
+
+class Profile:
+    """Aggregated stack samples, exportable as collapsed stacks or a speedscope file."""
+
+    def __init__(self, name: str, interval: float):
+        self.name = name
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.started_at = time.perf_counter()
+        self.duration = 0.0
+        self.sql_seconds = 0.0
+        self.sql_statements = 0
+
+    def add(self, track, stack: Tuple[Frame, ...]):
+        self.samples[(track, stack)] += 1
+
+    def name_tracks(self, names: Dict[int, str]):
+        """Replace the thread ids samples were recorded under with thread names."""
+        named: Counter = Counter()
+        for (track, stack), count in self.samples.items():
+            named[(names.get(track, str(track)), stack)] += count
+        self.samples = named
+
+    def collapsed(self) -> str:
+        lines = []
+        for (track, stack), count in self.samples.most_common():
+            names = [track] + [f"{name} ({os.path.basename(filename)}:{line})" for name, filename, line in stack]
+            lines.append(f"{';'.join(names)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self) -> dict:
+        """https://www.speedscope.app file with one sampled profile per thread or task."""
+        frames: List[dict] = []
+        index: Dict[Frame, int] = {}
+        tracks: Dict[str, dict] = {}
+        for (track, stack), count in self.samples.items():
+            for frame in stack:
+                if frame not in index:
+                    index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+            profile = tracks.setdefault(track, {
+                "type": "sampled", "name": track, "unit": "seconds",
+                "startValue": 0, "endValue": 0, "samples": [], "weights": [],
+            })
+            profile["samples"].append([index[frame] for frame in stack])
+            profile["weights"].append(count * self.interval)
+            profile["endValue"] += count * self.interval
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": self.name,
+            "exporter": settings.PROJECT_NAME,
+            "shared": {"frames": frames},
+            "profiles": sorted(tracks.values(), key=lambda p: -p["endValue"]),
+        }
+
+    def response(self, format: str = "speedscope", headers: Optional[dict] = None) -> Response:
+        headers = {
+            "X-Profile-Samples": str(sum(self.samples.values())),
+            "X-Profile-Seconds": f"{self.duration:.3f}",
+            "X-Profile-SQL-Seconds": f"{self.sql_seconds:.3f}",
+            "X-Profile-SQL-Statements": str(self.sql_statements),
+            **(headers or {}),
+        }
+        if format == "collapsed":
+            return Response(self.collapsed(), media_type="text/plain", headers=headers)
+        headers["Content-Disposition"] = f'attachment; filename="{self.name}.speedscope.json"'
+        return Response(json.dumps(self.speedscope()), media_type="application/json", headers=headers)
+
+
+class StackSampler:
+    """
+    Samples the stacks of every thread of this worker every `interval` seconds of wall
+    time, plus the awaiting stacks of the event loop's tasks. From the main thread it runs
+    on SIGALRM via setitimer, so nothing extra runs between samples; elsewhere (e.g. under
+    a test client) it falls back to a daemon thread. Threads waiting for work are skipped.
+    The handler may interrupt the main thread while it holds threading's own locks, so
+    samples only record thread ids; names are looked up when sampling starts and stops.
+
+    With `task` given, only that task is followed on the event loop thread: samples
+    where another task is running are dropped. Threadpool threads are still sampled
+    whole, so a busy worker's concurrent requests show up alongside it.
+    """
+
+    def __init__(self, name: str, interval: float, task: Optional[asyncio.Task] = None):
+        self.profile = Profile(name, interval)
+        self.interval = interval
+        self.task = task
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread = threading.get_ident()
+        self._signal_based = False
+        self._previous_handler = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._thread_names: Dict[int, str] = {}
+
+    def _note_thread_names(self):
+        self._thread_names.update((thread.ident, thread.name) for thread in threading.enumerate())
+
+    def start(self) -> bool:
+        """Start sampling; False if another profile is already running in this process."""
+        if not _sampling.acquire(blocking=False):
+            return False
+        self._note_thread_names()
+        self.profile.started_at = time.perf_counter()
+        if hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread():
+            self._signal_based = True
+            self._previous_handler = signal.signal(signal.SIGALRM, self._on_signal)
+            signal.setitimer(signal.ITIMER_REAL, self.interval, self.interval)
+        else:
+            self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+            self._thread.start()
+        return True
+
+    def stop(self) -> Profile:
+        if self._signal_based:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self._previous_handler or signal.SIG_DFL)
+        else:
+            self._stopping.set()
+            self._thread.join()
+        self.profile.duration = time.perf_counter() - self.profile.started_at
+        self._note_thread_names()
+        self.profile.name_tracks(self._thread_names)
+        _sampling.release()
+        return self.profile
+
+    def _on_signal(self, signum, frame):
+        self._sample({threading.get_ident(): frame})
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stopping.wait(self.interval):
+            self._sample({me: None})
+
+    def _sample(self, overrides: Dict[int, object]):
+        """
+        `overrides` replaces the current frame of some threads (None drops the thread).
+        Runs inside the signal handler, so it must not take any lock.
+        """
+        frames = {**sys._current_frames(), **overrides}
+        running = asyncio.current_task(self.loop) if self.loop.is_running() else None
+        for thread_id, frame in frames.items():
+            if frame is None:
+                continue
+            if thread_id == self.loop_thread and self.task is not None and running is not self.task:
+                continue
+            stack = _stack(frame)
+            if stack and not _is_idle(stack):
+                self.profile.add(thread_id, stack)
+
+        for task in ([self.task] if self.task is not None else asyncio.all_tasks(self.loop)):
+            if task is running or task.done():
+                continue
+            # Coroutine frames from the outermost await down to where the task is suspended
+            stack = tuple(_frame_key(frame) for frame in task.get_stack())
+            if stack:
+                self.profile.add(f"task {task.get_name()} (awaiting)", stack)
+
+
+async def profile_for(seconds: float, interval: float) -> Optional[Profile]:
+    """Sample the whole worker for `seconds`; None if a profile is already running."""
+    sampler = StackSampler(f"worker-{os.getpid()}", interval)
+    if not sampler.start():
+        return None
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profile = sampler.stop()
+    return profile
+
+
+# The request being profiled, for attributing SQL time; copied into threadpool calls with the context
+_current_profile: contextvars.ContextVar[Optional[Profile]] = contextvars.ContextVar("current_profile", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault("profile_query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    started = conn.info.get("profile_query_started")
+    if profile is not None and started:
+        profile.sql_seconds += time.perf_counter() - started.pop()
+        profile.sql_statements += 1
+
+
+def _is_admin(authorization: Optional[str]) -> bool:
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        user_id = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]).get("sub")
+    except JWTError:
+        return False
+    if user_id is None:
+        return False
+    db = SessionLocal()
+    try:
+        user = db.query(User.role, User.is_active).filter(User.id == int(user_id)).first()
+    finally:
+        db.close()
+    return user is not None and user.is_active and user.role == UserRole.ADMIN
+
+
+class ProfilingMiddleware:
+    """
+    `X-Profile: speedscope` (or `collapsed`) on a request from an admin profiles that
+    request end to end and returns the profile instead of its body; the original status
+    is kept in X-Profiled-Status. SQL time and statement counts come from engine events.
+    Any other caller's header is ignored.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or PROFILE_HEADER not in Headers(scope=scope):
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        format = headers[PROFILE_HEADER].strip().lower()
+        if format not in FORMATS or not await asyncio.to_thread(_is_admin, headers.get("authorization")):
+            await self.app(scope, receive, send)
+            return
+
+        name = f"{scope['method']} {scope['path']}".replace("/", "_").replace(" ", "")
+        sampler = StackSampler(name, settings.PROFILE_SAMPLE_INTERVAL_MS / 1000, task=asyncio.current_task())
+        if not sampler.start():
+            response = Response(
+                json.dumps({"detail": "Another profile is running in this worker"}),
+                status_code=409, media_type="application/json",
+            )
+            await response(scope, receive, send)
+            return
+
+        status_code = 500
+        token = _current_profile.set(sampler.profile)
+
+        async def discard(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            _current_profile.reset(token)
+            profile = sampler.stop()
+        response = profile.response(format, {"X-Profiled-Status": str(status_code)})
+        await response(scope, receive, send)
@@ -0,0 +1,285 @@
+import asyncio
+import json
+import logging
+import os
+import select
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Callable, Deque, Dict, List, Optional, Set
+
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Deliver = Callable[[str, str], None]
+Reconnected = Callable[[], None]
+
+
+class LocalTransport:
+    """Delivers messages within this process only (single worker, development)."""
+
+    # Whether messages reach the other worker processes
+    cross_process = False
+
+    def __init__(self):
+        self._deliver: Optional[Deliver] = None
+
+    def start(self, deliver: Deliver, channels: List[str], reconnected: Optional[Reconnected] = None):
+        self._deliver = deliver
+
+    def publish(self, channel: str, message: str):
+        if self._deliver is not None:
+            self._deliver(channel, message)
+
+    def stop(self):
+        self._deliver = None
+
+
+class PostgresTransport:
+    """
+    Fans messages out to every worker with LISTEN/NOTIFY. Our own NOTIFYs come back
+    through LISTEN as well, so local subscribers are served by the listener thread.
+    """
+
+    cross_process = True
+
+    def __init__(self, database_url: str):
+        self.dsn = make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self._publish_conn = None
+        self._publish_lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def _connect(self):
+        import psycopg2
+
+        conn = psycopg2.connect(self.dsn)
+        conn.autocommit = True
+        return conn
+
+    def start(self, deliver: Deliver, channels: List[str], reconnected: Optional[Reconnected] = None):
+        self._stopping.clear()
+        self._listener = threading.Thread(
+            target=self._listen, args=(deliver, channels, reconnected), name="pubsub-listener", daemon=True
+        )
+        self._listener.start()
+
+    def _listen(self, deliver: Deliver, channels: List[str], reconnected: Optional[Reconnected]):
+        connected_before = False
+        while not self._stopping.is_set():
+            try:
+                conn = self._connect()
+                with conn.cursor() as cur:
+                    for channel in channels:
+                        cur.execute(f'LISTEN "{channel}"')
+                # NOTIFYs sent while we were disconnected are lost
+                if connected_before and reconnected is not None:
+                    reconnected()
+                connected_before = True
+                while not self._stopping.is_set():
+                    if select.select([conn], [], [], 1.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        deliver(notify.channel, notify.payload)
+                conn.close()
+            except Exception as e:
+                logger.error(f"Pub/sub listener error, reconnecting: {e}")
+                time.sleep(1)
+
+    def publish(self, channel: str, message: str):
+        with self._publish_lock:
+            try:
+                if self._publish_conn is None or self._publish_conn.closed:
+                    self._publish_conn = self._connect()
+                with self._publish_conn.cursor() as cur:
+                    cur.execute("SELECT pg_notify(%s, %s)", (channel, message))
+            except Exception:
+                self._publish_conn = None
+                raise
+
+    def stop(self):
+        self._stopping.set()
+
+
+class FileTransport:
+    """
+    Fans messages out to every process on one host through an append-only file of JSON
+    lines that each process tails from the end. A stand-in for LISTEN/NOTIFY in tests and
+    multi-worker setups without Postgres; like it, our own messages come back through the tail.
+    """
+
+    cross_process = True
+
+    def __init__(self, path: str, poll_interval: float = 0.05):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._listener: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def start(self, deliver: Deliver, channels: List[str], reconnected: Optional[Reconnected] = None):
+        self._stopping.clear()
+        # Open before returning so nothing published after start() is missed
+        stream = open(self.path, "a+")
+        stream.seek(0, os.SEEK_END)
+        self._listener = threading.Thread(
+            target=self._tail, args=(stream, deliver, set(channels)), name="pubsub-listener", daemon=True
+        )
+        self._listener.start()
+
+    def _tail(self, stream, deliver: Deliver, channels: Set[str]):
+        pending = ""
+        with stream:
+            while not self._stopping.is_set():
+                pending += stream.readline()
+                if not pending.endswith("\n"):
+                    time.sleep(self.poll_interval)
+                    continue
+                line, pending = pending, ""
+                try:
+                    entry = json.loads(line)
+                    if entry["channel"] in channels:
+                        deliver(entry["channel"], entry["message"])
+                except Exception as e:
+                    logger.error(f"Pub/sub file listener error: {e}")
+
+    def publish(self, channel: str, message: str):
+        line = json.dumps({"channel": channel, "message": message}) + "\n"
+        # A single O_APPEND write, so lines from concurrent processes never interleave
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode())
+        finally:
+            os.close(fd)
+
+    def stop(self):
+        self._stopping.set()
+
+
+def create_transport(backend: str):
+    if backend == "local":
+        return LocalTransport()
+    if backend == "postgres":
+        return PostgresTransport(settings.DATABASE_URL)
+    if backend.startswith("file:"):
+        return FileTransport(backend[len("file:"):])
+    raise ValueError(f"Unsupported PUBSUB_BACKEND: {backend}")
+
+
+class Subscription(asyncio.Queue):
+    """
+    One subscriber's bounded event queue. A subscriber that falls `maxsize` events behind
+    is unsubscribed and marked `overflowed`; it should drain what it has and disconnect,
+    so the client reconnects with its Last-Event-ID and replays from history.
+    """
+
+    def __init__(self, maxsize: int):
+        super().__init__(maxsize)
+        self.overflowed = False
+
+
+class Broker:
+    """
+    In-process pub/sub for async subscribers (e.g. SSE streams).
+
+    `publish` may be called from any thread. Every event gets an increasing integer id,
+    and the last `history_size` events per channel are kept so a reconnecting client can
+    resume from its Last-Event-ID.
+    """
+
+    def __init__(self, transport, channels: List[str], history_size: int = 1000):
+        self.transport = transport
+        self.channels = channels
+        self.history: Dict[str, Deque[dict]] = defaultdict(lambda: deque(maxlen=history_size))
+        self.subscribers: Dict[str, Set[Subscription]] = defaultdict(set)
+        self.listeners: Dict[str, List[Callable[[dict], None]]] = defaultdict(list)
+        self.reconnect_callbacks: List[Reconnected] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self._last_id = 0
+
+    def _next_id(self) -> int:
+        # Microsecond timestamps keep ids roughly ordered across workers
+        with self._lock:
+            self._last_id = max(self._last_id + 1, time.time_ns() // 1000)
+            return self._last_id
+
+    def publish(self, channel: str, data: dict) -> int:
+        event_id = self._next_id()
+        self.transport.publish(channel, json.dumps({"id": event_id, "data": data}, default=str))
+        return event_id
+
+    def _deliver(self, channel: str, message: str):
+        event = json.loads(message)
+        with self._lock:
+            self._last_id = max(self._last_id, event["id"])
+            self.history[channel].append(event)
+            queues = list(self.subscribers[channel])
+            listeners = list(self.listeners[channel])
+        for listener in listeners:
+            try:
+                listener(event["data"])
+            except Exception as e:
+                logger.error(f"Pub/sub listener on {channel} failed: {e}")
+        if self._loop is not None:
+            for queue in queues:
+                self._loop.call_soon_threadsafe(self._offer, channel, queue, event)
+
+    def _offer(self, channel: str, queue: Subscription, event: dict):
+        """Queue `event` for one subscriber, on the event loop; a full queue drops the subscriber."""
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            if not queue.overflowed:
+                logger.warning(f"Subscriber to {channel} fell {queue.maxsize} events behind, dropping it")
+            queue.overflowed = True
+            self.unsubscribe(channel, queue)
+
+    def start(self):
+        """Start receiving messages; called once per API worker at startup."""
+        self.transport.start(self._deliver, self.channels, self._reconnected)
+
+    def _reconnected(self):
+        for callback in list(self.reconnect_callbacks):
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Pub/sub reconnect callback failed: {e}")
+
+    def on_reconnect(self, callback: Reconnected):
+        """Call `callback()` after the transport reconnects, since messages sent in between are lost."""
+        self.reconnect_callbacks.append(callback)
+
+    def listen(self, channel: str, callback: Callable[[dict], None]):
+        """Call `callback(data)` synchronously, on the delivering thread, for every event on `channel`."""
+        with self._lock:
+            self.listeners[channel].append(callback)
+
+    def subscribe(self, channel: str) -> Subscription:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.get_running_loop()
+            queue = Subscription(settings.SSE_QUEUE_SIZE)
+            self.subscribers[channel].add(queue)
+        return queue
+
+    def unsubscribe(self, channel: str, queue: Subscription):
+        with self._lock:
+            self.subscribers[channel].discard(queue)
+
+    def replay(self, channel: str, after_id: int) -> List[dict]:
+        with self._lock:
+            return [event for event in self.history[channel] if event["id"] > after_id]
+
+    def stop(self):
+        self.transport.stop()
+
+
+SUBMISSION_EVENTS = "submission_events"
+INVALIDATIONS = "invalidations"
+
+broker = Broker(create_transport(settings.PUBSUB_BACKEND), channels=[SUBMISSION_EVENTS, INVALIDATIONS])
@@ -0,0 +1,170 @@
+import math
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class Limit:
+    capacity: float
+    refill_per_second: float
+
+    @classmethod
+    def parse(cls, spec: str) -> Optional["Limit"]:
+        """Parse "<requests>/<seconds>" (e.g. "5/60"). "unlimited" disables the limit."""
+        if spec.strip().lower() == "unlimited":
+            return None
+        requests, seconds = spec.split("/")
+        return cls(capacity=float(requests), refill_per_second=float(requests) / float(seconds))
+
+
+# Keys are "<route>" for the default and "<route>:<ROLE>" for per-role overrides.
+DEFAULT_RATE_LIMITS: Dict[str, str] = {
+    "login": "10/60",
+    "login_account": "5/300",
+    "register": "5/3600",
+    "apply": "20/60",
+    "apply:ADMIN": "unlimited",
+}
+
+
+class InMemoryBackend:
+    """Token buckets in a plain dict; per-worker, and cheap enough for every request."""
+
+    # Drop buckets idle for an hour (refilled long ago) once the dict grows past this size
+    MAX_KEYS = 100_000
+
+    def __init__(self):
+        self._buckets: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def take(self, key: str, limit: Limit, now: float) -> float:
+        """Consume one token. Returns 0 when allowed, otherwise seconds until a token is available."""
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                tokens = limit.capacity
+            else:
+                tokens = min(limit.capacity, bucket[0] + (now - bucket[1]) * limit.refill_per_second)
+
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                return 0.0
+
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.MAX_KEYS:
+                self._evict(now)
+            return (1 - tokens) / limit.refill_per_second
+
+    def _evict(self, now: float, idle_seconds: float = 3600):
+        self._buckets = {k: v for k, v in self._buckets.items() if now - v[1] < idle_seconds}
+
+
+class SQLiteBackend:
+    """
+    Buckets shared by every worker on the host through a SQLite file.
+    Stands in for a networked store (e.g. Redis) behind the same `take` interface.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def take(self, key: str, limit: Limit, now: float) -> float:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated_at FROM buckets WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                tokens = limit.capacity
+            else:
+                tokens = min(limit.capacity, row[0] + max(0.0, now - row[1]) * limit.refill_per_second)
+
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            conn.execute(
+                "INSERT INTO buckets (key, tokens, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at",
+                (key, tokens, now),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return 0.0 if allowed else (1 - tokens) / limit.refill_per_second
+
+
+def create_backend(url: str):
+    if url == "memory":
+        return InMemoryBackend()
+    if url.startswith("sqlite:///"):
+        return SQLiteBackend(url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported RATE_LIMIT_BACKEND: {url}")
+
+
+class RateLimiter:
+    def __init__(self, backend, limits: Dict[str, str]):
+        self.backend = backend
+        self.limits: Dict[str, Optional[Limit]] = {name: Limit.parse(spec) for name, spec in limits.items()}
+
+    def get_limit(self, route: str, role: Optional[str] = None) -> Optional[Limit]:
+        if role is not None and f"{route}:{role}" in self.limits:
+            return self.limits[f"{route}:{role}"]
+        return self.limits.get(route)
+
+    def check(self, route: str, key: str, role: Optional[str] = None):
+        """Raise 429 with Retry-After when `key` has exhausted its bucket for `route`."""
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        limit = self.get_limit(route, role)
+        if limit is None:
+            return
+
+        # Wall-clock time so buckets stay comparable across worker processes
+        retry_after = self.backend.take(f"{route}:{key}", limit, time.time())
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests. Please try again later.",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+
+rate_limiter = RateLimiter(
+    create_backend(settings.RATE_LIMIT_BACKEND),
+    {**DEFAULT_RATE_LIMITS, **settings.RATE_LIMIT_OVERRIDES},
+)
+
+
+def get_client_ip(request: Request) -> str:
+    if settings.RATE_LIMIT_TRUST_PROXY:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def limit_by_ip(route: str):
+    """Dependency factory: throttle anonymous endpoints per client IP."""
+    def dependency(request: Request):
+        rate_limiter.check(route, f"ip:{get_client_ip(request)}")
+    return dependency
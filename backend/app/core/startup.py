@@ -0,0 +1,54 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """Collects per-phase timings (in ms) while a worker boots."""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+
+    def record(self, name: str, started_at: float):
+        self.phases[name] = (time.perf_counter() - started_at) * 1000
+
+    @contextmanager
+    def phase(self, name: str):
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started_at)
+
+    def log_summary(self):
+        total = sum(self.phases.values())
+        details = ", ".join(f"{name}={ms:.1f}ms" for name, ms in self.phases.items())
+        logger.info(f"Startup finished in {total:.1f}ms ({details})")
+
+
+startup_timer = StartupTimer()
+
+_warmup_hooks: List[Tuple[str, Callable[[], None]]] = []
+
+
+def on_warmup(name: str):
+    """
+    Register a function to run once per worker at startup, e.g. to load an
+    in-process cache before the first request instead of on it.
+    """
+    def decorator(func: Callable[[], None]):
+        _warmup_hooks.append((name, func))
+        return func
+    return decorator
+
+
+def run_warmup_hooks():
+    for name, hook in _warmup_hooks:
+        with startup_timer.phase(f"warmup:{name}"):
+            try:
+                hook()
+            except Exception as e:
+                logger.error(f"Warm-up '{name}' failed: {e}")
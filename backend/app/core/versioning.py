@@ -0,0 +1,48 @@
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+
+def etag(obj) -> str:
+    """ETag of a versioned row (Job, Submission)."""
+    return f'"{obj.version}"'
+
+
+def check_if_match(if_match: Optional[str], obj):
+    """409 unless the If-Match header (when sent) names the row's current version."""
+    if if_match is None:
+        return
+    tags = {tag.strip().removeprefix("W/") for tag in if_match.split(",")}
+    if "*" not in tags and etag(obj) not in tags:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Resource was modified since it was read; reload it and retry",
+            headers={"ETag": etag(obj)},
+        )
+
+
+def _version_conflict() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Resource was modified by another request; reload it and retry",
+    )
+
+
+def flush_versioned(db: Session):
+    """Flush, turning a lost version race (the conditional UPDATE matched no row) into a 409."""
+    try:
+        db.flush()
+    except StaleDataError:
+        db.rollback()
+        raise _version_conflict()
+
+
+def commit_versioned(db: Session):
+    """Commit, turning a lost version race into a 409 like `flush_versioned`."""
+    try:
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        raise _version_conflict()
@@ -0,0 +1,79 @@
+import logging
+import os
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _script_directory():
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    return ScriptDirectory.from_config(config)
+
+
+def get_head_revision() -> Optional[str]:
+    """Latest Alembic revision shipped with this build (read from disk, no DB access)."""
+    return _script_directory().get_current_head()
+
+
+def get_current_revision(engine: Engine) -> Optional[str]:
+    with engine.connect() as conn:
+        try:
+            return conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+        except DBAPIError:
+            return None
+
+
+def stamp_head_if_unversioned(engine: Engine) -> bool:
+    """
+    Record the head revision on a database that has none, i.e. one just built by
+    `create_all` (AUTO_CREATE_TABLES), so later `alembic upgrade` runs start from it.
+    """
+    if get_current_revision(engine) is not None:
+        return False
+    from alembic.runtime.migration import MigrationContext
+
+    with engine.begin() as conn:
+        MigrationContext.configure(conn).stamp(_script_directory(), "head")
+    return True
+
+
+def check_schema_revision(engine: Engine) -> bool:
+    """
+    Compare the database's Alembic revision with the head revision using a single
+    query. Migrations are applied by `alembic upgrade head`, never by the workers.
+    """
+    current = get_current_revision(engine)
+    head = get_head_revision()
+
+    if current is None:
+        logger.warning("No alembic_version found; run `alembic upgrade head` before serving traffic")
+        return False
+    if current != head:
+        logger.warning(f"Database schema is at revision {current}, expected {head}")
+        return False
+
+    logger.info(f"Database schema at revision {current}")
+    return True
+
+
+def warm_up_pool(engine: Engine, connections: int):
+    """Open `connections` pooled connections up front so the first requests don't pay for connect()."""
+    opened = []
+    try:
+        for _ in range(connections):
+            conn = engine.connect()
+            conn.execute(text("SELECT 1"))
+            opened.append(conn)
+    finally:
+        for conn in opened:
+            conn.close()
@@ -1,13 +1,206 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from fastapi import Depends, Request
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
+from app.core.security import get_token_subject
+from app.core.versioning import commit_versioned
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+logger = logging.getLogger(__name__)
+
+def _engine_options(url: str) -> dict:
+    options = {"pool_pre_ping": True}
+    if not url.startswith("sqlite"):
+        options.update(pool_size=settings.DB_POOL_SIZE, max_overflow=settings.DB_MAX_OVERFLOW)
+    return options
+
+engine = create_engine(settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-def get_db():
+def run_after_commit(db: Session, callback: Callable[[], None]):
+    """Run `callback` once the session's current transaction commits; dropped on rollback."""
+    db.info.setdefault("after_commit", []).append(callback)
+
+@event.listens_for(SessionLocal, "after_commit")
+def _run_after_commit_callbacks(session: Session):
+    for callback in session.info.pop("after_commit", []):
+        try:
+            callback()
+        except Exception as e:
+            logger.error(f"After-commit callback failed: {e}")
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_after_commit_callbacks(session: Session):
+    session.info.pop("after_commit", None)
+
+# ASGI scope key under which POST /api/batch hands its sub-requests a shared session
+SHARED_SESSION_KEY = "shared_db"
+
+def get_db(request: Request):
+    """
+    The request's session. It checks out a connection on its first query only, and is
+    closed once the response has been sent; `commit_unit_of_work` commits it.
+    """
+    shared = request.scope.get(SHARED_SESSION_KEY)
+    if shared is not None:
+        # Owned and closed by the batch request
+        yield shared
+        return
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def commit_unit_of_work(request: Request, db: Session = Depends(get_db)):
+    """
+    App-wide dependency (scope="function") making each request one unit of work: endpoints
+    and repositories add and flush, and the session is committed once, after the endpoint
+    has returned and its response has been serialized but before it is sent, so a failed
+    commit (e.g. a version conflict, 409) still becomes the response. Nothing is committed
+    when the endpoint raises.
+    """
+    yield
+    if request.scope.get(SHARED_SESSION_KEY) is None and db.in_transaction():
+        commit_versioned(db)
+
+# --- Read replicas ---
+
+class ReplicaPool:
+    """
+    Round-robin over replica engines. A background thread probes each replica with
+    SELECT 1 every REPLICA_HEALTH_CHECK_SECONDS; `pick` only reads the probe results, so
+    requests never wait on a probe. A replica is out of rotation until its first
+    successful probe, and again from a failed probe or query until the next good probe.
+    """
+
+    def __init__(self, engines: List[Engine], check_interval: float):
+        self.engines = engines
+        self.check_interval = check_interval
+        self._healthy: Dict[Engine, bool] = {}
+        self._counter = itertools.count()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        for replica in engines:
+            event.listen(replica, "handle_error", self._on_error)
+
+    def _on_error(self, context):
+        # Disconnects, or failures to connect at all
+        if context.is_disconnect or context.connection is None:
+            self.mark_unhealthy(context.engine)
+
+    def mark_unhealthy(self, replica: Engine):
+        if self._healthy.get(replica, True):
+            logger.warning(f"Replica {replica.url.render_as_string()} taken out of rotation")
+        self._healthy[replica] = False
+
+    def probe(self, replica: Engine) -> bool:
+        try:
+            with replica.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        except Exception:
+            self.mark_unhealthy(replica)
+            return False
+        if not self._healthy.get(replica):
+            logger.info(f"Replica {replica.url.render_as_string()} in rotation")
+        self._healthy[replica] = True
+        return True
+
+    def probe_all(self):
+        for replica in self.engines:
+            self.probe(replica)
+
+    def start(self):
+        """Probe every replica now, then every check_interval on a daemon thread."""
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="replica-probe", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            self.probe_all()
+            if self._stopping.wait(self.check_interval):
+                return
+
+    def stop(self):
+        self._stopping.set()
+
+    def pick(self) -> Optional[Engine]:
+        for _ in range(len(self.engines)):
+            replica = self.engines[next(self._counter) % len(self.engines)]
+            if self._healthy.get(replica):
+                return replica
+        return None
+
+replica_urls = [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+replica_pool = ReplicaPool(
+    [create_engine(url, **_engine_options(url)) for url in replica_urls],
+    settings.REPLICA_HEALTH_CHECK_SECONDS,
+) if replica_urls else None
+
+# user_id -> monotonic time of that user's last committed write on the primary; entries
+# older than READ_YOUR_WRITES_SECONDS are pruned at most once per that period
+_last_write_at: Dict[int, float] = {}
+_last_write_lock = threading.Lock()
+_last_pruned_at = 0.0
+
+@event.listens_for(SessionLocal, "before_flush")
+def _check_session_writes(session: Session, flush_context, instances):
+    if not (session.new or session.dirty or session.deleted):
+        return
+    # Before anything is sent, so a replica session can't write even inside a transaction
+    if session.info.get("read_only"):
+        raise RuntimeError("Attempted to write through a read-only (replica) session")
+    session.info["wrote"] = True
+
+@event.listens_for(SessionLocal, "after_commit")
+def _record_user_write(session: Session):
+    global _last_pruned_at
+    user_id = session.info.get("user_id")
+    if session.info.pop("wrote", False) and user_id is not None:
+        now = time.monotonic()
+        with _last_write_lock:
+            _last_write_at[user_id] = now
+            if now - _last_pruned_at >= settings.READ_YOUR_WRITES_SECONDS:
+                for stale in [uid for uid, at in _last_write_at.items() if now - at >= settings.READ_YOUR_WRITES_SECONDS]:
+                    del _last_write_at[stale]
+                _last_pruned_at = now
+
+def wrote_recently(user_id: Optional[int]) -> bool:
+    if user_id is None:
+        return False
+    last_write = _last_write_at.get(user_id)
+    return last_write is not None and time.monotonic() - last_write < settings.READ_YOUR_WRITES_SECONDS
+
+def _request_user_id(request: Request) -> Optional[int]:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    subject = get_token_subject(token)
+    return int(subject) if subject and subject.isdigit() else None
+
+def get_read_db(request: Request, db: Session = Depends(get_db)):
+    """
+    Session for read-only endpoints. Uses a healthy replica when DATABASE_REPLICA_URLS is
+    set, except for users who wrote within READ_YOUR_WRITES_SECONDS; otherwise it is the
+    request's primary session.
+    """
+    replica = None
+    if replica_pool is not None and not wrote_recently(_request_user_id(request)):
+        replica = replica_pool.pick()
+
+    if replica is None:
+        yield db
+        return
+
+    read_db = SessionLocal(bind=replica)
+    read_db.info["read_only"] = True
+    try:
+        yield read_db
+    finally:
+        read_db.close()
@@ -1,18 +1,35 @@
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.rate_limit import rate_limiter
+from app.core.security import get_token_subject
 from app.db.session import get_db
 from app.models.users import User, UserRole
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+# Same scheme for endpoints anonymous callers may use too
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
+
+# ASGI scope key under which POST /api/batch passes its already authenticated user to sub-requests
+SHARED_USER_KEY = "shared_user"
 
 def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme), 
     db: Session = Depends(get_db)
 ) -> User:
+    shared = request.scope.get(SHARED_USER_KEY)
+    if shared is not None:
+        # Attach the batch's user to this session without querying it again
+        user = db.merge(shared, load=False)
+        db.info["user_id"] = user.id
+        return user
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -35,9 +52,31 @@ def get_current_user(
     
     if user is None:
         raise credentials_exception
+
+    # Lets the session layer route this user's reads to the primary right after they write
+    db.info["user_id"] = user.id
         
     return user
 
+def get_token_user_id(token: str = Depends(oauth2_scheme)) -> int:
+    """
+    Id of the bearer token's user, checked by signature only. For hot endpoints that
+    don't need the user row; deactivated users keep access until their token expires.
+    """
+    subject = get_token_subject(token)
+    if subject is None or not subject.isdigit():
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return int(subject)
+
+def get_optional_token_user_id(token: Optional[str] = Depends(optional_oauth2_scheme)) -> Optional[int]:
+    """Like `get_token_user_id`, but None for anonymous callers and invalid tokens."""
+    subject = get_token_subject(token) if token else None
+    return int(subject) if subject is not None and subject.isdigit() else None
+
 def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
@@ -60,4 +99,11 @@ def get_current_admin(current_user: User = Depends(get_current_active_user)) ->
             status_code=status.HTTP_403_FORBIDDEN, 
             detail="Not enough privileges. Admin access required."
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+def limit_by_user(route: str):
+    """Dependency factory: throttle authenticated endpoints per user, with per-role limits."""
+    def dependency(current_user: User = Depends(get_current_user)):
+        role = current_user.role.value if hasattr(current_user.role, "value") else current_user.role
+        rate_limiter.check(route, f"user:{current_user.id}", role=role)
+    return dependency
@@ -1,28 +1,34 @@
-from fastapi import FastAPI
+import time
+_imports_started = time.perf_counter()
+
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 
+from app.core.compression import CompressionMiddleware
+from app.core.config import settings
+from app.core.profiler import ProfilingMiddleware
+from app.core.pubsub import broker
+from app.core.startup import startup_timer, run_warmup_hooks
 from app.db.base import Base
-from app.db.session import engine
-from app.routers import auth, jobs, submissions, candidates, hiring, admin
+from app.db.schema import check_schema_revision, stamp_head_if_unversioned, warm_up_pool
+from app.db.session import engine, commit_unit_of_work, replica_pool
+from app.routers import auth, jobs, submissions, candidates, hiring, admin, batch, suggest
 
+startup_timer.record("imports", _imports_started)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-try:
-    Base.metadata.create_all(bind=engine)
-    logger.info("Database tables verified/created successfully")
-except Exception as e:
-    logger.error(f"Error creating database tables: {e}")
-
 app = FastAPI(
     title="Talentra API",  
     description="ATS Platform API",
     version="1.0.0",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
-    openapi_url="/api/openapi.json"
+    openapi_url="/api/openapi.json",
+    # One commit per request, after the endpoint; see commit_unit_of_work
+    dependencies=[Depends(commit_unit_of_work, scope="function")],
 )
 
 origins = [
@@ -38,14 +44,20 @@ app.add_middleware(
     allow_headers=["*"],
     expose_headers=["*"]
 )
+app.add_middleware(CompressionMiddleware)
+# Outermost, so a profiled request includes compression and the profile itself goes out as is
+app.add_middleware(ProfilingMiddleware)
 
 # --- Router Registration ---
-app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
-app.include_router(jobs.router, prefix="/api/jobs", tags=["Jobs"])
-app.include_router(submissions.router, prefix="/api/submissions", tags=["Submissions"])
-app.include_router(candidates.router, prefix="/api/candidates", tags=["Candidates"])
-app.include_router(hiring.router, prefix="/api/hiring", tags=["Hiring Pipeline"])
-app.include_router(admin.router, prefix="/api/admin", tags=["Administration"])
+with startup_timer.phase("routers"):
+    app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
+    app.include_router(jobs.router, prefix="/api/jobs", tags=["Jobs"])
+    app.include_router(submissions.router, prefix="/api/submissions", tags=["Submissions"])
+    app.include_router(candidates.router, prefix="/api/candidates", tags=["Candidates"])
+    app.include_router(hiring.router, prefix="/api/hiring", tags=["Hiring Pipeline"])
+    app.include_router(admin.router, prefix="/api/admin", tags=["Administration"])
+    app.include_router(batch.router, prefix="/api/batch", tags=["Batch"])
+    app.include_router(suggest.router, prefix="/api/suggest", tags=["Suggestions"])
 
 # --- Basic Endpoints ---
 @app.get("/")
@@ -62,9 +74,36 @@ def health_check():
 
 # --- Lifecycle Events ---
 @app.on_event("startup")
-async def startup_event():
+def startup_event():
     logger.info("Starting Talentra API Server")
 
+    with startup_timer.phase("db_check"):
+        try:
+            if settings.AUTO_CREATE_TABLES:
+                Base.metadata.create_all(bind=engine)
+                logger.info("Database tables verified/created (AUTO_CREATE_TABLES)")
+                if stamp_head_if_unversioned(engine):
+                    logger.info("New database stamped at the head revision")
+            else:
+                check_schema_revision(engine)
+        except Exception as e:
+            logger.error(f"Database check failed: {e}")
+
+    with startup_timer.phase("pool_warmup"):
+        try:
+            warm_up_pool(engine, settings.DB_POOL_WARMUP)
+        except Exception as e:
+            logger.error(f"Connection pool warm-up failed: {e}")
+
+    run_warmup_hooks()
+    broker.start()
+    if replica_pool is not None:
+        replica_pool.start()
+    startup_timer.log_summary()
+
 @app.on_event("shutdown")
 async def shutdown_event():
-    logger.info("Shutting down Talentra API Server")
\ No newline at end of file
+    logger.info("Shutting down Talentra API Server")
+    broker.stop()
+    if replica_pool is not None:
+        replica_pool.stop()
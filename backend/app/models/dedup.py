@@ -0,0 +1,23 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, SmallInteger, BigInteger, LargeBinary, DateTime, ForeignKey, Index
+from app.db.base import Base
+
+class CandidateSignature(Base):
+    """MinHash signature of a candidate's resumes and profile (see app.services.dedup)."""
+    __tablename__ = "candidate_signatures"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    signature = Column(LargeBinary, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class CandidateLSHBucket(Base):
+    """One row per LSH band: candidates sharing a (band, bucket) are likely duplicates."""
+    __tablename__ = "candidate_lsh_buckets"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    band = Column(SmallInteger, primary_key=True)
+    bucket = Column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        Index("ix_candidate_lsh_buckets_band_bucket", "band", "bucket"),
+    )
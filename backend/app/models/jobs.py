@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean, JSON 
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean, JSON, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from app.db.base import Base
 from datetime import datetime
 
@@ -17,12 +18,31 @@ class Job(Base):
     requirements = Column(Text, nullable=True)
     required_skills = Column(Text, nullable=True)
     experience_required = Column(String, nullable=True)
+    # Parsed from salary_range / experience_required by app.services.job_fields, for range filters
+    salary_min = Column(Integer, nullable=True, index=True)
+    salary_max = Column(Integer, nullable=True, index=True)
+    salary_currency = Column(String(3), nullable=True)
+    experience_min_years = Column(Integer, nullable=True, index=True)
     
     hiring_stages = Column(JSON, default=lambda: ["Applied", "Screening", "Interview", "Offer", "Rejected"])
+    # {"Technical Interview": 10, ...}: days a submission may stay in a stage, over SUBMISSION_STAGE_SLA_DAYS
+    stage_sla_days = Column(JSON, nullable=True)
 
     creator_id = Column(Integer, ForeignKey("users.id"))
     creator = relationship("User", back_populates="jobs")
     submissions = relationship("Submission", back_populates="job")
 
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    created_at = Column(DateTime, default=datetime.utcnow)
+    # Set when the job is closed; its submissions are archived SUBMISSION_ARCHIVE_AFTER_DAYS later
+    closed_at = Column(DateTime, nullable=True)
+    # Optimistic concurrency: every ORM update is `... WHERE version = :loaded` and bumps it
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    # Weighted full-text vector, maintained by app.services.job_search (Postgres only)
+    search_vector = deferred(Column(TSVECTOR().with_variant(Text(), "sqlite"), nullable=True))
+
+    __table_args__ = (
+        Index("ix_jobs_search_vector", "search_vector", postgresql_using="gin"),
+    )
+    __mapper_args__ = {"version_id_col": version}
\ No newline at end of file
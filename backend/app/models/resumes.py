@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base import Base
@@ -12,6 +12,10 @@ class Resume(Base):
     file_url = Column(String, nullable=False)
     is_primary = Column(Boolean, default=False)
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Filled in by the `parse_resume` background task
+    parsed_text = Column(Text, nullable=True)
 
     owner = relationship("User", back_populates="resumes")
-    submissions = relationship("Submission", back_populates="resume_used")
\ No newline at end of file
+    submissions = relationship("Submission", back_populates="resume_used")
+
+    __mapper_args__ = {"eager_defaults": True}
\ No newline at end of file
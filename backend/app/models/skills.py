@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy.orm import relationship
+from app.db.base import Base
+
+class Skill(Base):
+    __tablename__ = "skills"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    # Normalized spelling (see app.services.skills.normalize_skill)
+    key = Column(String, unique=True, index=True, nullable=False)
+
+    aliases = relationship("SkillAlias", back_populates="skill", cascade="all, delete-orphan")
+
+class SkillAlias(Base):
+    __tablename__ = "skill_aliases"
+
+    id = Column(Integer, primary_key=True, index=True)
+    alias = Column(String, unique=True, index=True, nullable=False)
+    skill_id = Column(Integer, ForeignKey("skills.id"), nullable=False)
+
+    skill = relationship("Skill", back_populates="aliases")
+
+class CandidateSkill(Base):
+    __tablename__ = "candidate_skills"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    skill_id = Column(Integer, ForeignKey("skills.id"), primary_key=True, index=True)
+
+class JobSkill(Base):
+    __tablename__ = "job_skills"
+
+    job_id = Column(Integer, ForeignKey("jobs.id"), primary_key=True)
+    skill_id = Column(Integer, ForeignKey("skills.id"), primary_key=True, index=True)
@@ -1,5 +1,5 @@
 import enum
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, Text, JSON, Float, Enum
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Text, JSON, Float, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base import Base
@@ -12,12 +12,12 @@ class SubmissionStatus(str, enum.Enum):
     OFFER = "Offer Letter"
     REJECTED = "Rejected"
 
-class Submission(Base):
-    __tablename__ = "submissions"
+class SubmissionColumns:
+    """Columns shared by `submissions` and `submissions_archive`."""
 
     id = Column(Integer, primary_key=True, index=True)
-    candidate_id = Column(Integer, ForeignKey("users.id"))
-    job_id = Column(Integer, ForeignKey("jobs.id"))
+    candidate_id = Column(Integer, ForeignKey("users.id"), index=True)
+    job_id = Column(Integer, ForeignKey("jobs.id"), index=True)
     resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=True)
     
     status = Column(Enum(SubmissionStatus), default=SubmissionStatus.APPLIED)
@@ -25,10 +25,61 @@ class Submission(Base):
     timeline_history = Column(JSON, default=list) 
     manager_notes = Column(Text, nullable=True)
     
-    applied_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Partition key of `submissions` on Postgres (monthly ranges, see migration d7a3e1f05b62)
+    applied_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # When `status` last changed; stalled-stage scans range over (status, stage_entered_at)
+    stage_entered_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Optimistic concurrency: every ORM update is `... WHERE version = :loaded` and bumps it
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    @property
+    def current_status(self):
+        """Stage label exposed by SubmissionResponse (e.g. "Technical Interview")."""
+        return self.status.value if self.status else None
+
+class Submission(SubmissionColumns, Base):
+    __tablename__ = "submissions"
+
+    archived = False
 
     # Relationships
     candidate = relationship("User", back_populates="submissions")
     job = relationship("Job", back_populates="submissions")
-    resume_used = relationship("Resume", back_populates="submissions")
\ No newline at end of file
+    resume_used = relationship("Resume", back_populates="submissions")
+
+    __table_args__ = (
+        Index("ix_submissions_status_stage_entered_at", "status", "stage_entered_at"),
+    )
+    # eager_defaults: applied_at and updated_at come back with RETURNING on flush
+    __mapper_args__ = {"version_id_col": SubmissionColumns.version, "eager_defaults": True}
+
+class ArchivedSubmission(SubmissionColumns, Base):
+    """Submissions of long-closed jobs, moved out of the hot table by the `archive_submissions` task. Read-only."""
+    __tablename__ = "submissions_archive"
+
+    archived = True
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    candidate = relationship("User", viewonly=True)
+    job = relationship("Job", viewonly=True)
+    resume_used = relationship("Resume", viewonly=True)
+
+
+class SubmissionAlert(Base):
+    """
+    "Needs attention" feed: live submissions that have sat in their stage longer than their
+    job allows, rebuilt by the `scan_stalled_submissions` task (app.services.stage_sla).
+    No foreign key to `submissions`, whose primary key includes applied_at on Postgres.
+    """
+    __tablename__ = "submission_alerts"
+
+    submission_id = Column(Integer, primary_key=True)
+    candidate_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False, index=True)
+    status = Column(Enum(SubmissionStatus), nullable=False)
+    stage_entered_at = Column(DateTime(timezone=True), nullable=False)
+    threshold_days = Column(Integer, nullable=False)
+    first_seen_at = Column(DateTime, nullable=False)
+    # Alerts not seen by the latest scan are deleted at its end
+    last_seen_at = Column(DateTime, nullable=False)
@@ -0,0 +1,31 @@
+import enum
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Enum, Index
+from app.db.base import Base
+
+class TaskStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+class Task(Base):
+    __tablename__ = "tasks"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    payload = Column(JSON, default=dict)
+    status = Column(Enum(TaskStatus), default=TaskStatus.QUEUED, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=5, nullable=False)
+    last_error = Column(Text, nullable=True)
+
+    # Naive UTC timestamps, compared against datetime.utcnow() by the worker
+    run_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    locked_until = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_tasks_status_run_at", "status", "run_at"),
+    )
@@ -38,6 +38,9 @@ class User(Base):
     jobs = relationship("Job", back_populates="creator")
     submissions = relationship("Submission", back_populates="candidate")
 
+    # Fetch server-side defaults with RETURNING on flush instead of a later SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
 class CandidateProfile(Base):
     __tablename__ = "candidate_profiles"
 
@@ -60,4 +63,6 @@ class CandidateAssignment(Base):
     assigned_at = Column(DateTime(timezone=True), server_default=func.now())
 
     manager = relationship("User", foreign_keys=[manager_id], back_populates="assigned_candidates")
-    candidate = relationship("User", foreign_keys=[candidate_id], back_populates="assigned_manager")
\ No newline at end of file
+    candidate = relationship("User", foreign_keys=[candidate_id], back_populates="assigned_manager")
+
+    __mapper_args__ = {"eager_defaults": True}
\ No newline at end of file
@@ -7,8 +7,7 @@ class JobRepository:
     def create(self, db: Session, job_in: JobCreate, manager_id: int):
         db_job = Job(**job_in.model_dump(), manager_id=manager_id)
         db.add(db_job)
-        db.commit()
-        db.refresh(db_job)
+        db.flush()
         return db_job
 
     def get_all(self, db: Session, skip: int = 0, limit: int = 100):
@@ -18,4 +17,6 @@ class JobRepository:
         return db.query(Job).filter(Job.manager_id == manager_id).all()
 
     def get_by_id(self, db: Session, job_id: int):
-        return db.query(Job).filter(Job.id == job_id).first()
\ No newline at end of file
+        return db.query(Job).filter(Job.id == job_id).first()
+
+job_repo = JobRepository()
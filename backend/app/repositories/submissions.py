@@ -1,9 +1,34 @@
+import heapq
+from itertools import islice
+from typing import Optional
+
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from app.models.submissions import Submission, SubmissionStatus
+from sqlalchemy import desc, func
+from app.core.fieldsets import FieldSelection
+from app.models.submissions import Submission, ArchivedSubmission, SubmissionStatus
 from app.schemas.submissions import SubmissionCreate
 
 class SubmissionRepository:
+    """
+    Reads cover both the live `submissions` table and `submissions_archive` (submissions
+    of long-closed jobs), merged in id order; pass include_archived=False for live rows only.
+    """
+
+    def _read(self, db: Session, criteria, skip: int = 0, limit: Optional[int] = None,
+              selection: Optional[FieldSelection] = None, include_archived: bool = True):
+        models = (Submission, ArchivedSubmission) if include_archived else (Submission,)
+        results = []
+        for model in models:
+            query = db.query(model).filter(*criteria(model)).order_by(model.id)
+            if selection is not None:
+                query = query.options(*selection.load_options(model))
+            if limit is not None:
+                # Each source can contribute at most skip + limit rows to the merged page
+                query = query.limit(skip + limit)
+            results.append(query.all())
+        merged = heapq.merge(*results, key=lambda submission: submission.id)
+        return list(islice(merged, skip, None if limit is None else skip + limit))
+
     def create(self, db: Session, sub_in: SubmissionCreate, candidate_id: int):
         existing = db.query(Submission).filter(
             Submission.job_id == sub_in.job_id,
@@ -19,33 +44,30 @@ class SubmissionRepository:
             status=SubmissionStatus.APPLIED
         )
         db.add(db_sub)
-        db.commit()
-        db.refresh(db_sub)
+        db.flush()
         return db_sub
 
-    def get_by_candidate(self, db: Session, candidate_id: int):
-        return db.query(Submission).filter(Submission.candidate_id == candidate_id).all()
+    def get_by_candidate(self, db: Session, candidate_id: int, include_archived: bool = True):
+        return self._read(db, lambda model: [model.candidate_id == candidate_id], include_archived=include_archived)
     
-    def get_submissions_by_candidate(self, db: Session, candidate_id: int, skip: int = 0, limit: int = 100):
-        return (
-            db.query(Submission)
-            .filter(Submission.candidate_id == candidate_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
+    def get_submissions_by_candidate(self, db: Session, candidate_id: int, skip: int = 0, limit: int = 100,
+                                     selection: Optional[FieldSelection] = None, include_archived: bool = True):
+        return self._read(
+            db, lambda model: [model.candidate_id == candidate_id], skip, limit, selection, include_archived
         )
 
-    def get_by_job(self, db: Session, job_id: int):
-        return db.query(Submission).filter(Submission.job_id == job_id).all()
+    def get_by_job(self, db: Session, job_id: int, include_archived: bool = True):
+        return self._read(db, lambda model: [model.job_id == job_id], include_archived=include_archived)
         
     def update_status(self, db: Session, submission_id: int, status: SubmissionStatus, ats_score: float = None):
         submission = db.query(Submission).filter(Submission.id == submission_id).first()
         if submission:
+            if status != submission.status:
+                submission.stage_entered_at = func.now()
             submission.status = status
             if ats_score is not None:
                 submission.ats_score = ats_score
-            db.commit()
-            db.refresh(submission)
+            db.flush()
         return submission
 
 submission_repo = SubmissionRepository()
\ No newline at end of file
@@ -19,15 +19,10 @@ class UserRepository:
             role=user_in.role,
             is_active=user_in.is_active
         )
-        db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
-        
         if user_in.role == UserRole.CANDIDATE:
-            profile = CandidateProfile(user_id=db_user.id)
-            db.add(profile)
-            db.commit()
-            
+            db_user.profile = CandidateProfile()
+        db.add(db_user)
+        db.flush()
         return db_user
 
     def update_candidate_profile(self, db: Session, user_id: int, profile_in: CandidateProfileUpdate):
@@ -39,9 +34,8 @@ class UserRepository:
         update_data = profile_in.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(profile, field, value)
-            
-        db.commit()
-        db.refresh(profile)
+
+        db.flush()
         return profile
     
     def get_candidate_profile(self, db: Session, user_id: int):
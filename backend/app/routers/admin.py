@@ -1,18 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import os
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from app.db.session import get_db
+from app.core.fieldsets import FieldSelection, field_selection
+from app.core.profiler import FORMATS, profile_for
+from app.db.session import get_db, get_read_db
 from app.dependencies import get_current_admin
 from app.models.users import User, UserRole, CandidateAssignment
-from app.schemas.users import UserResponse, AssignmentCreate, AssignmentResponse
+from app.schemas.users import (
+    UserResponse, AssignmentCreate, AssignmentResponse, DuplicateGroup,
+    BulkAssignmentRequest, BulkAssignmentResponse,
+)
+from app.core.config import settings
+from app.services.dedup import find_duplicates
+from app.services.tasks import task_queue
+from app.services.response_cache import job_board_cache, job_detail_cache
+from app.services.assignments import record_assignment, upsert_assignments, balance_assignments
 
 router = APIRouter()
 
 @router.get("/users", response_model=List[UserResponse])
 def get_all_users(
     role: str = None, 
-    db: Session = Depends(get_db), 
+    selection: Optional[FieldSelection] = Depends(field_selection(UserResponse)),
+    db: Session = Depends(get_read_db), 
     _: User = Depends(get_current_admin)  
 ):
     """
@@ -22,6 +34,8 @@ def get_all_users(
     query = db.query(User)
     if role:
         query = query.filter(User.role == role)
+    if selection:
+        return selection.response(query.options(*selection.load_options(User)).all())
     return query.all()
 
 @router.post("/assign", response_model=AssignmentResponse)
@@ -51,12 +65,116 @@ def assign_candidate_to_manager(
     existing = db.query(CandidateAssignment).filter(CandidateAssignment.candidate_id == assignment.candidate_id).first()
     if existing:
         existing.manager_id = assignment.manager_id
-        db.commit()
-        db.refresh(existing)
+        record_assignment(db, assignment.candidate_id, assignment.manager_id)
+        db.flush()
         return existing
 
     new_assignment = CandidateAssignment(manager_id=assignment.manager_id, candidate_id=assignment.candidate_id)
     db.add(new_assignment)
-    db.commit()
-    db.refresh(new_assignment)
-    return new_assignment
\ No newline at end of file
+    record_assignment(db, assignment.candidate_id, assignment.manager_id)
+    db.flush()
+    return new_assignment
+
+@router.post("/assign/bulk", response_model=BulkAssignmentResponse)
+def bulk_assign_candidates(
+    request: BulkAssignmentRequest,
+    db: Session = Depends(get_db),
+    _: User = Depends(get_current_admin)
+):
+    """
+    Assign many candidates at once, either from explicit pairs or, with `auto_balance`,
+    by spreading unassigned candidates over the least loaded managers (optionally
+    preferring managers whose open jobs share the candidate's skills).
+    """
+    if request.auto_balance:
+        pairs = balance_assignments(
+            db, request.candidate_ids, request.manager_ids, request.match_skills, request.load_slack
+        )
+    else:
+        # A candidate listed twice keeps its last manager
+        pairs = list({a.candidate_id: a.manager_id for a in request.assignments}.items())
+        manager_ids = {m for _, m in pairs}
+        candidate_ids = {c for c, _ in pairs}
+        found = {
+            (user_id, role) for user_id, role in
+            db.query(User.id, User.role).filter(User.id.in_(manager_ids | candidate_ids))
+        }
+        missing_managers = sorted(m for m in manager_ids if (m, UserRole.HIRING_MANAGER) not in found)
+        if missing_managers:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Hiring Managers not found: {missing_managers}"
+            )
+        missing_candidates = sorted(c for c in candidate_ids if (c, UserRole.CANDIDATE) not in found)
+        if missing_candidates:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Candidates not found: {missing_candidates}"
+            )
+
+    if pairs:
+        upsert_assignments(db, pairs)
+    return {
+        "assigned": len(pairs),
+        "assignments": [{"candidate_id": c, "manager_id": m} for c, m in pairs],
+    }
+
+@router.get("/duplicates", response_model=List[DuplicateGroup])
+def get_duplicate_candidates(
+    threshold: float = Query(settings.DEDUP_THRESHOLD, gt=0, le=1),
+    user_id: Optional[int] = None,
+    db: Session = Depends(get_read_db),
+    _: User = Depends(get_current_admin)
+):
+    """
+    Groups of candidates whose resumes and name/phone are near-identical.
+    Pass `user_id` to check a single candidate.
+    """
+    groups = find_duplicates(db, threshold, user_id)
+    ids = [u for members, _ in groups for u in members]
+    users = {u.id: u for u in db.query(User).filter(User.id.in_(ids))} if ids else {}
+    return [
+        {"candidates": [users[u] for u in members if u in users], "similarity": value}
+        for members, value in groups
+    ]
+
+@router.post("/duplicates/scan")
+def scan_duplicate_candidates(
+    db: Session = Depends(get_db),
+    _: User = Depends(get_current_admin)
+):
+    """Queue a background rescan of every candidate's resumes and profile."""
+    task = task_queue.enqueue(db, "dedup_scan", {})
+    db.flush()
+    return {"message": "Duplicate scan queued", "task_id": task.id}
+
+@router.post("/submissions/archive")
+def archive_closed_job_submissions(
+    older_than_days: int = Query(settings.SUBMISSION_ARCHIVE_AFTER_DAYS, ge=0),
+    db: Session = Depends(get_db),
+    _: User = Depends(get_current_admin)
+):
+    """Queue moving the submissions of jobs closed more than `older_than_days` ago to the archive."""
+    task = task_queue.enqueue(db, "archive_submissions", {"older_than_days": older_than_days})
+    db.flush()
+    return {"message": "Submission archival queued", "task_id": task.id}
+
+@router.post("/profile")
+async def profile_worker(
+    seconds: float = Query(5.0, gt=0, le=settings.PROFILE_MAX_SECONDS),
+    format: str = Query("speedscope", pattern=f"^({'|'.join(FORMATS)})$"),
+    _: User = Depends(get_current_admin)
+):
+    """
+    Sample every thread and event loop task of the worker serving this request for
+    `seconds` and return a flamegraph file: speedscope JSON or collapsed stacks.
+    """
+    profile = await profile_for(seconds, settings.PROFILE_SAMPLE_INTERVAL_MS / 1000)
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Another profile is running in this worker")
+    return profile.response(format)
+
+@router.get("/cache-stats")
+def get_cache_stats(_: User = Depends(get_current_admin)):
+    """Hit, miss and coalesced-request counts of the response caches, for the worker serving this request."""
+    return {"worker_pid": os.getpid(), "job_board": job_board_cache.stats(), "job_detail": job_detail_cache.stats()}
@@ -1,25 +1,32 @@
 from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
 from app.core import security
 from app.core.config import settings
+from app.core.fieldsets import FieldSelection, field_selection
+from app.core.rate_limit import rate_limiter, limit_by_ip, get_client_ip
 from app.models.users import User
 from app.schemas.users import UserCreate, UserResponse, Token
 from app.dependencies import get_current_user 
 
 router = APIRouter()
 
-@router.post("/token") 
+@router.post("/token", dependencies=[Depends(limit_by_ip("login"))]) 
 def login_access_token(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
     """
     OAuth2 compatible token login, get an access token for future requests.
     """
+    # Per-(IP, account) bucket on top of the per-IP one, checked before spending bcrypt time.
+    # Keyed on the IP too, so nobody can lock an account out by failing logins for it.
+    rate_limiter.check("login_account", f"ip:{get_client_ip(request)}:{form_data.username.lower()}")
    
     user = db.query(User).filter(User.email == form_data.username).first()
     
@@ -45,7 +52,7 @@ def login_access_token(
         "user": user 
     }
 
-@router.post("/register", response_model=UserResponse)
+@router.post("/register", response_model=UserResponse, dependencies=[Depends(limit_by_ip("register"))])
 def register_user(user_in: UserCreate, db: Session = Depends(get_db)):
     """
     Create new user without the need to be logged in
@@ -66,10 +73,12 @@ def register_user(user_in: UserCreate, db: Session = Depends(get_db)):
         role=user_in.role
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    db.flush()
     return db_user
 
 @router.get("/me", response_model=UserResponse)
-def read_users_me(current_user: User = Depends(get_current_user)):
-    return current_user
\ No newline at end of file
+def read_users_me(
+    selection: Optional[FieldSelection] = Depends(field_selection(UserResponse)),
+    current_user: User = Depends(get_current_user)
+):
+    return selection.response(current_user) if selection else current_user
\ No newline at end of file
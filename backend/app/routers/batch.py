@@ -0,0 +1,128 @@
+import asyncio
+import json
+import logging
+import re
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal, SHARED_SESSION_KEY
+from app.dependencies import get_current_user, SHARED_USER_KEY
+from app.models.users import User
+from app.schemas.common import BatchRequest, BatchResponse, BatchSubRequest
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Streams never finish and exports are meant to be downloaded directly
+EXCLUDED_PATHS = re.compile(r"^/api/batch|/stream$|/export$")
+# Request headers passed through to sub-requests
+FORWARDED_HEADERS = {b"authorization", b"accept-language", b"user-agent", b"x-forwarded-for"}
+# Sub-response headers reported back to the client
+RETURNED_HEADERS = {"content-type", "etag", "last-modified", "cache-control", "retry-after"}
+
+
+async def _dispatch(request: Request, sub: BatchSubRequest, db: Session, user: User) -> dict:
+    """Run one GET sub-request through the app in-process and collect its response."""
+    path, _, query = sub.path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": request.scope.get("http_version", "1.1"),
+        "method": "GET",
+        "scheme": request.scope.get("scheme", "http"),
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": request.scope.get("root_path", ""),
+        "query_string": query.encode(),
+        "headers": [(k, v) for k, v in request.scope["headers"] if k in FORWARDED_HEADERS]
+        + [(b"accept", b"application/json")],
+        "client": request.scope.get("client"),
+        "server": request.scope.get("server"),
+        "state": dict(request.scope.get("state") or {}),
+        SHARED_SESSION_KEY: db,
+        SHARED_USER_KEY: user,
+    }
+    received = False
+    response = {"status": 500, "headers": {}, "body": bytearray()}
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # The sub-request never disconnects; wait until the response is complete
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {
+                k.decode("latin-1").lower(): v.decode("latin-1") for k, v in message.get("headers", [])
+            }
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+
+    try:
+        await request.app(scope, receive, send)
+    except Exception:
+        logger.exception(f"Batch sub-request GET {sub.path} failed")
+        # The lane's next sub-requests share this session; don't leave it in a failed transaction
+        await asyncio.to_thread(db.rollback)
+        return {"id": sub.id, "status": 500, "headers": {}, "body": {"detail": "Internal Server Error"}}
+
+    body = bytes(response["body"])
+    content_type = response["headers"].get("content-type", "")
+    if content_type.startswith("application/json") and body:
+        body = json.loads(body)
+    else:
+        body = body.decode("utf-8", errors="replace") or None
+    return {
+        "id": sub.id,
+        "status": response["status"],
+        "headers": {k: v for k, v in response["headers"].items() if k in RETURNED_HEADERS},
+        "body": body,
+    }
+
+
+@router.post("", response_model=BatchResponse)
+async def run_batch(
+    batch: BatchRequest,
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Run several GET requests in one round-trip, e.g. `/api/auth/me`, `/api/jobs/` and
+    `/api/submissions/my-applications` on page load. The caller is authenticated once and
+    the user is shared by every sub-request. Sub-requests run in up to
+    BATCH_MAX_CONCURRENCY concurrent lanes; a lane runs its share one after another on a
+    single DB session, since a session can't be used by two requests at once.
+    Responses come back in request order, each with its own status.
+    """
+    if not batch.requests or len(batch.requests) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch holds between 1 and {settings.BATCH_MAX_REQUESTS} requests"
+        )
+    for position, sub in enumerate(batch.requests):
+        if not sub.path.startswith("/api/") or EXCLUDED_PATHS.search(sub.path.partition("?")[0]):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Path not allowed in a batch: {sub.path}")
+        if sub.id is None:
+            sub.id = str(position)
+
+    lanes = min(len(batch.requests), settings.BATCH_MAX_CONCURRENCY)
+    results: List[Optional[dict]] = [None] * len(batch.requests)
+
+    async def run_lane(lane: int):
+        db = SessionLocal()
+        try:
+            for position in range(lane, len(batch.requests), lanes):
+                results[position] = await _dispatch(request, batch.requests[position], db, current_user)
+        finally:
+            db.close()
+
+    await asyncio.gather(*(run_lane(lane) for lane in range(lanes)))
+    return {"responses": results}
@@ -1,15 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Optional
 import shutil
 import os
 
-from app.db.session import get_db
-from app.dependencies import get_current_user
+from app.core.invalidation import invalidations
+from app.db.session import get_db, get_read_db, run_after_commit
+from app.dependencies import get_current_user, get_current_hiring_manager
 from app.models.users import User, UserRole, CandidateProfile
 from app.models.resumes import Resume
-from app.schemas.users import CandidateProfileUpdate, CandidateProfileResponse
+from app.models.jobs import Job
+from app.schemas.users import CandidateProfileUpdate, CandidateProfileResponse, CandidateSearchResponse
+from app.schemas.jobs import JobRecommendation
 from app.schemas.resumes import ResumeResponse
+from app.services.tasks import task_queue
+from app.services.candidate_index import candidate_index
+from app.services.skills import set_candidate_skills
+from app.services.assignments import assignment_index
+from app.services.recommendations import recommendations, track_candidate
+from app.services.suggest import track_candidate_suggestions
 
 router = APIRouter()
 
@@ -31,6 +40,8 @@ def update_candidate_profile(
         current_user.last_name = profile_data.last_name
     if profile_data.phone is not None:
         current_user.phone = profile_data.phone
+    if {"first_name", "last_name", "phone"} & profile_data.model_fields_set:
+        task_queue.enqueue(db, "dedup_candidate", {"user_id": current_user.id})
 
 
     profile = db.query(CandidateProfile).filter(CandidateProfile.user_id == current_user.id).first()
@@ -46,12 +57,67 @@ def update_candidate_profile(
     for key, value in data_dict.items():
         if key in profile_fields:
             setattr(profile, key, value)
-    
-    db.commit()
-    db.refresh(profile)
- 
+
+    skill_ids = None
+    if "primary_skills" in data_dict:
+        skill_ids = set_candidate_skills(db, current_user.id, profile.primary_skills)
+    track_candidate(db, current_user.id, profile, skill_ids)
+    track_candidate_suggestions(db, current_user.id, profile, skill_ids)
+
+    indexed = {field: getattr(profile, field) for field in profile_fields}
+    run_after_commit(db, lambda: candidate_index.upsert(current_user.id, **indexed))
+    invalidations.publish(db, f"user:{current_user.id}")
+
+    db.flush()
     return profile
 
+@router.get("/search", response_model=CandidateSearchResponse)
+def search_candidates(
+    current_city: Optional[List[str]] = Query(None),
+    visa_status: Optional[List[str]] = Query(None),
+    experience_level: Optional[List[str]] = Query(None),
+    skills: Optional[str] = Query(None, description="Comma-separated; every skill must match"),
+    skip: int = 0,
+    limit: int = Query(50, le=200),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_hiring_manager)
+):
+    """
+    Filter candidates by city, visa status, experience level and skills, with facet counts
+    per value. Repeat a parameter to accept several values. Hiring managers only search
+    the candidates assigned to them.
+    """
+    within = None
+    if current_user.role == UserRole.HIRING_MANAGER:
+        within = candidate_index.user_ids_to_bits(assignment_index.candidates_of(db, current_user.id))
+
+    user_ids, total, facets = candidate_index.search(
+        filters={"current_city": current_city, "visa_status": visa_status, "experience_level": experience_level},
+        skills=[s for s in (skills or "").split(",") if s.strip()],
+        within=within,
+        skip=skip,
+        limit=limit,
+    )
+
+    users = db.query(User).options(selectinload(User.profile)).filter(User.id.in_(user_ids)).all() if user_ids else []
+    by_id = {u.id: u for u in users}
+    return {"total": total, "items": [by_id[i] for i in user_ids if i in by_id], "facets": facets}
+
+@router.get("/recommendations", response_model=List[JobRecommendation])
+def get_recommendations(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Precomputed "jobs for you" list, best match first"""
+    if current_user.role != UserRole.CANDIDATE:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+
+    ranked = recommendations.recommendations(current_user.id)
+    if not ranked:
+        return []
+    jobs = {job.id: job for job in db.query(Job).filter(Job.id.in_([job_id for job_id, _ in ranked]))}
+    return [{"job": jobs[job_id], "score": value} for job_id, value in ranked if job_id in jobs]
+
 @router.post("/resumes", response_model=ResumeResponse)
 async def upload_resume(
     file: UploadFile = File(...),
@@ -87,13 +153,13 @@ async def upload_resume(
         is_primary=is_primary
     )
     db.add(new_resume)
-    db.commit()
-    db.refresh(new_resume)
+    db.flush()
+    task_queue.enqueue(db, "parse_resume", {"resume_id": new_resume.id})
     return new_resume
 
 @router.get("/resumes", response_model=List[ResumeResponse])
 def get_my_resumes(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     return db.query(Resume).filter(Resume.user_id == current_user.id).all()
@@ -120,6 +186,5 @@ def delete_resume(
             print(f"Error deleting file {resume.file_url}: {e}")
 
     db.delete(resume)
-    db.commit()
-    
+
     return {"message": "Resume deleted successfully"}
\ No newline at end of file
@@ -1,33 +1,80 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Header
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.core.fieldsets import FieldSelection, field_selection
+from app.db.session import get_read_db
+from app.models.submissions import SubmissionAlert, SubmissionStatus
 from app.models.users import User, UserRole, CandidateAssignment
+from app.schemas.submissions import SubmissionAlertResponse
 from app.schemas.users import UserResponse
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, get_current_hiring_manager
+from app.services.exports import export_response, submission_rows
+from app.services.assignments import assignment_index
+from app.services.stage_sla import utc_naive
 
 router = APIRouter()
 
 @router.get("/my-candidates", response_model=List[UserResponse])
 def get_assigned_candidates(
-    db: Session = Depends(get_db),
+    selection: Optional[FieldSelection] = Depends(field_selection(UserResponse)),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     # 1. Security: Ensure user is a Hiring Manager (or Admin)
     if current_user.role != UserRole.HIRING_MANAGER and current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    # 2. Query the assignment table for this manager's ID
-    assignments = db.query(CandidateAssignment).filter(
-        CandidateAssignment.manager_id == current_user.id
-    ).all()
+    # 2. Get this manager's Candidate IDs from the in-process assignment index
+    candidate_ids = list(assignment_index.candidates_of(db, current_user.id))
 
-    # 3. Get the list of Candidate IDs
-    candidate_ids = [a.candidate_id for a in assignments]
-
-    # 4. Fetch the actual Candidate User objects
+    # 3. Fetch the actual Candidate User objects
     if not candidate_ids:
         return []
 
-    candidates = db.query(User).filter(User.id.in_(candidate_ids)).all()
-    return candidates
\ No newline at end of file
+    query = db.query(User).filter(User.id.in_(candidate_ids))
+    if selection:
+        return selection.response(query.options(*selection.load_options(User)).all())
+    return query.all()
+
+@router.get("/submissions/export")
+def export_my_pipeline(
+    format: str = Query("csv", pattern="^(csv|xlsx)$"),
+    accept_encoding: str = Header(""),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_hiring_manager)
+):
+    """Stream the submissions of every candidate assigned to the manager (all submissions for admins)"""
+    manager_id = current_user.id if current_user.role == UserRole.HIRING_MANAGER else None
+    return export_response(submission_rows(db, candidate_manager_id=manager_id), format, accept_encoding, "pipeline-submissions")
+
+@router.get("/needs-attention", response_model=List[SubmissionAlertResponse])
+def get_needs_attention(
+    stage: Optional[str] = Query(None, description="Only this stage, e.g. \"Technical Interview\""),
+    skip: int = 0,
+    limit: int = Query(100, le=500),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_hiring_manager)
+):
+    """Submissions of the manager's candidates (everyone's for admins) stuck in a stage past their job's limit, longest first"""
+    query = db.query(SubmissionAlert)
+    if current_user.role == UserRole.HIRING_MANAGER:
+        query = query.join(CandidateAssignment, CandidateAssignment.candidate_id == SubmissionAlert.candidate_id).filter(
+            CandidateAssignment.manager_id == current_user.id
+        )
+    if stage:
+        try:
+            query = query.filter(SubmissionAlert.status == SubmissionStatus(stage))
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid stage. Expected one of: {', '.join(s.value for s in SubmissionStatus)}")
+
+    now = datetime.utcnow()
+    return [
+        {
+            "submission_id": alert.submission_id, "candidate_id": alert.candidate_id, "job_id": alert.job_id,
+            "current_status": alert.status.value, "stage_entered_at": alert.stage_entered_at,
+            "threshold_days": alert.threshold_days, "first_seen_at": alert.first_seen_at,
+            "days_in_stage": (now - utc_naive(alert.stage_entered_at)).days,
+        }
+        for alert in query.order_by(SubmissionAlert.stage_entered_at, SubmissionAlert.submission_id).offset(skip).limit(limit)
+    ]
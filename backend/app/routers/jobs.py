@@ -1,19 +1,101 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Header, Request, Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import datetime
 
-from app.db.session import get_db
-from app.dependencies import get_current_hiring_manager
+from app.core.invalidation import invalidations
+from app.core.versioning import etag, check_if_match, flush_versioned
+from app.db.session import get_db, get_read_db
+from app.dependencies import get_current_hiring_manager, get_optional_token_user_id
 from app.models.jobs import Job
 from app.models.users import User, UserRole
-from app.schemas.jobs import JobCreate, JobUpdate, JobResponse
+from app.repositories.jobs import job_repo
+from app.schemas.jobs import JobCreate, JobUpdate, JobResponse, CandidateMatch
+from app.services.job_fields import apply_parsed_fields
+from app.services.job_search import index_job, search_jobs
+from app.services.stage_sla import invalid_stage_names
+from app.services.skills import set_job_skills, skill_matcher
+from app.services.assignments import assignment_index
+from app.services.recommendations import track_job
+from app.services.suggest import track_job_suggestions
+from app.services.exports import export_response, submission_rows
+from app.services.response_cache import job_board_cache, job_detail_cache, invalidate_job_board
 
 router = APIRouter()
+job_list_adapter = TypeAdapter(List[JobResponse])
 
 @router.get("/", response_model=List[JobResponse])
-def read_jobs(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Retrieve all active jobs"""
-    return db.query(Job).filter(Job.is_active == True).offset(skip).limit(limit).all()
+def read_jobs(
+    request: Request,
+    q: Optional[str] = Query(None, description="Full-text search over title, description, requirements and skills"),
+    location: Optional[str] = None,
+    department: Optional[str] = None,
+    employment_type: Optional[str] = None,
+    salary_min: Optional[int] = Query(None, ge=0, description="Jobs paying at least this much per year"),
+    salary_max: Optional[int] = Query(None, ge=0, description="Jobs whose pay starts at or below this"),
+    salary_currency: Optional[str] = Query(None, min_length=3, max_length=3, description="ISO code, e.g. USD"),
+    experience_min: Optional[int] = Query(None, ge=0, description="Jobs asking for at least this many years"),
+    experience_max: Optional[int] = Query(None, ge=0, description="Jobs asking for at most this many years"),
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_read_db)
+):
+    """Retrieve active jobs, optionally filtered; ranked by relevance when `q` is given"""
+    if (salary_min is not None or salary_max is not None) and not salary_currency:
+        raise HTTPException(status_code=400, detail="salary_min and salary_max need a salary_currency")
+    filters = dict(
+        salary_min=salary_min, salary_max=salary_max, salary_currency=salary_currency,
+        experience_min=experience_min, experience_max=experience_max,
+    )
+    if q:
+        return search_jobs(db, q, location, department, employment_type, skip, limit, **filters)
+
+    # Job board pages: serialized and compressed once per cache entry, not per hit
+    def build() -> bytes:
+        jobs = search_jobs(db, None, location, department, employment_type, skip, limit, **filters)
+        return job_list_adapter.dump_json(job_list_adapter.validate_python(jobs, from_attributes=True))
+
+    key = (location, department, employment_type, skip, limit, *filters.values())
+    body = job_board_cache.get_or_build(key, build)
+    return body.response(request.headers.get("accept-encoding"))
+
+def check_stage_sla_days(stage_sla_days):
+    unknown = invalid_stage_names(stage_sla_days)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown stages in stage_sla_days: {', '.join(unknown)}")
+
+def _is_active_admin(db: Session, user_id: int) -> bool:
+    return db.query(User.id).filter(User.id == user_id, User.role == UserRole.ADMIN, User.is_active == True).first() is not None
+
+@router.get("/{id}", response_model=JobResponse)
+def read_job(
+    id: int,
+    request: Request,
+    db: Session = Depends(get_read_db),
+    user_id: Optional[int] = Depends(get_optional_token_user_id)
+):
+    """
+    Retrieve one job; concurrent requests for a job that isn't cached share one query.
+    Closed jobs are only shown to their creator and admins, and never cached.
+    """
+    def build() -> bytes:
+        job = job_repo.get_by_id(db, id)
+        if not job or not job.is_active:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return JobResponse.model_validate(job).model_dump_json().encode()
+
+    try:
+        body = job_detail_cache.get_or_build(id, build)
+    except HTTPException:
+        if user_id is None:
+            raise
+        job = job_repo.get_by_id(db, id)
+        if job is None or not (job.creator_id == user_id or _is_active_admin(db, user_id)):
+            raise
+        return job
+    return body.response(request.headers.get("accept-encoding"))
+
 
 @router.post("/", response_model=JobResponse)
 def create_job(
@@ -22,21 +104,30 @@ def create_job(
     current_user: User = Depends(get_current_hiring_manager)
 ):
     job_data = job_in.dict()
-    
+    check_stage_sla_days(job_in.stage_sla_days)
+
     db_job = Job(
         **job_data,
         creator_id=current_user.id
     )
     
+    apply_parsed_fields(db_job)
     db.add(db_job)
-    db.commit()
-    db.refresh(db_job)
+    index_job(db, db_job)
+    invalidate_job_board(db)
+    skill_ids = set_job_skills(db, db_job)
+    track_job(db, db_job, skill_ids)
+    track_job_suggestions(db, db_job, skill_ids)
+    invalidations.publish(db, f"job:{db_job.id}")
+    db.flush()
     return db_job
 
 @router.put("/{id}", response_model=JobResponse)
 def update_job(
     id: int,
     job_in: JobUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_hiring_manager)
 ):
@@ -47,13 +138,25 @@ def update_job(
     # Authorization: Admins or the Creator only
     if current_user.role != UserRole.ADMIN and job.creator_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
+    check_if_match(if_match, job)
 
     update_data = job_in.dict(exclude_unset=True)
+    check_stage_sla_days(update_data.get("stage_sla_days"))
     for key, value in update_data.items():
         setattr(job, key, value)
+    if "is_active" in update_data:
+        job.closed_at = None if job.is_active else (job.closed_at or datetime.utcnow())
+    if "salary_range" in update_data or "experience_required" in update_data:
+        apply_parsed_fields(job)
+    index_job(db, job)
+    invalidate_job_board(db, job.id)
+    skill_ids = set_job_skills(db, job) if "required_skills" in update_data else None
+    track_job(db, job, skill_ids)
+    track_job_suggestions(db, job, skill_ids)
+    invalidations.publish(db, f"job:{job.id}")
 
-    db.commit()
-    db.refresh(job)
+    flush_versioned(db)
+    response.headers["ETag"] = etag(job)
     return job
 
 @router.delete("/{id}")
@@ -70,5 +173,51 @@ def delete_job(
         raise HTTPException(status_code=403, detail="Not authorized")
 
     job.is_active = False # Soft delete
-    db.commit()
-    return {"message": "Job closed successfully"}
\ No newline at end of file
+    job.closed_at = job.closed_at or datetime.utcnow()
+    index_job(db, job)
+    invalidate_job_board(db, job.id)
+    track_job(db, job)
+    track_job_suggestions(db, job)
+    invalidations.publish(db, f"job:{job.id}")
+    return {"message": "Job closed successfully"}
+
+@router.get("/{id}/matching-candidates", response_model=List[CandidateMatch])
+def get_matching_candidates(
+    id: int,
+    min_coverage: float = Query(0.8, gt=0, le=1),
+    limit: int = Query(50, le=200),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_hiring_manager)
+):
+    """Candidates holding at least `min_coverage` of the job's required skills, best covered first"""
+    job = db.query(Job).filter(Job.id == id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    within = None
+    if current_user.role == UserRole.HIRING_MANAGER:
+        within = skill_matcher.user_ids_to_bits(assignment_index.candidates_of(db, current_user.id))
+
+    matches, required = skill_matcher.covering(id, min_coverage, within=within, limit=limit)
+    users = {u.id: u for u in db.query(User).filter(User.id.in_([m[0] for m in matches]))} if matches else {}
+    return [
+        {"candidate": users[user_id], "matched_skills": matched, "required_skills": required, "coverage": matched / required}
+        for user_id, matched in matches if user_id in users
+    ]
+
+@router.get("/{id}/submissions/export")
+def export_job_submissions(
+    id: int,
+    format: str = Query("csv", pattern="^(csv|xlsx)$"),
+    accept_encoding: str = Header(""),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_hiring_manager)
+):
+    """Stream every submission to this job as CSV (gzipped if accepted) or XLSX"""
+    job = db.query(Job).filter(Job.id == id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if current_user.role != UserRole.ADMIN and job.creator_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    return export_response(submission_rows(db, job_id=id), format, accept_encoding, f"job-{id}-submissions")
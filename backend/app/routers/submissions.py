@@ -1,14 +1,26 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Header
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from datetime import datetime
 
-from app.db.session import get_db
-from app.dependencies import get_current_user, get_current_hiring_manager
-from app.models.submissions import Submission
-from app.models.users import User, UserRole, CandidateAssignment
+from app.db.session import get_db, get_read_db
+from app.dependencies import get_current_user, get_current_hiring_manager, limit_by_user
+from app.core.config import settings
+from app.core.fieldsets import FieldSelection, field_selection
+from app.core.versioning import etag, check_if_match, flush_versioned
+from app.core.pubsub import broker, SUBMISSION_EVENTS
+from app.models.submissions import Submission, SubmissionStatus
+from app.models.users import User, UserRole
 from app.schemas.submissions import SubmissionCreate, SubmissionResponse, SubmissionUpdateStatus
 from app.repositories.submissions import submission_repo
+from app.services.tasks import task_queue
+from app.services.submission_events import publish_stage_change, can_see
+from app.services.assignments import assignment_index
+from app.services.stage_sla import clear_alert
 
 router = APIRouter()
 
@@ -16,20 +28,77 @@ router = APIRouter()
 def get_my_applications(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    selection: Optional[FieldSelection] = Depends(field_selection(SubmissionResponse)),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """
     Fetch all applications for the logged-in candidate.
+    `fields` and `expand` trim the response and the columns loaded for it.
     """
-    return submission_repo.get_submissions_by_candidate(
+    submissions = submission_repo.get_submissions_by_candidate(
         db=db, 
         candidate_id=current_user.id, 
         skip=skip, 
-        limit=limit
+        limit=limit,
+        selection=selection,
     )
+    return selection.response(submissions) if selection else submissions
+
+@router.get("/stream")
+async def stream_submission_updates(
+    request: Request,
+    last_event_id: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Server-Sent Events stream of stage changes on submissions visible to the caller.
+    Reconnecting clients send Last-Event-ID and receive the events they missed.
+    """
+    user_id, role = current_user.id, current_user.role
+    # Don't hold a pooled connection for the lifetime of the stream
+    db.close()
+
+    queue = broker.subscribe(SUBMISSION_EVENTS)
+
+    def format_event(event: dict) -> str:
+        return f"id: {event['id']}\nevent: submission.stage\ndata: {json.dumps(event['data'])}\n\n"
 
-@router.post("/apply", response_model=SubmissionResponse)
+    async def event_stream():
+        try:
+            yield "retry: 3000\n\n"
+            sent_up_to = 0
+            if last_event_id and last_event_id.isdigit():
+                sent_up_to = int(last_event_id)
+                for event in broker.replay(SUBMISSION_EVENTS, sent_up_to):
+                    # can_see may query candidate_assignments; keep that off the event loop
+                    if await asyncio.to_thread(can_see, user_id, role, event["data"]):
+                        yield format_event(event)
+                    sent_up_to = event["id"]
+
+            while not await request.is_disconnected():
+                if queue.overflowed and queue.empty():
+                    # Too slow to keep up: end the stream, the client resumes from Last-Event-ID
+                    break
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                if event["id"] <= sent_up_to or not await asyncio.to_thread(can_see, user_id, role, event["data"]):
+                    continue
+                yield format_event(event)
+        finally:
+            broker.unsubscribe(SUBMISSION_EVENTS, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.post("/apply", response_model=SubmissionResponse, dependencies=[Depends(limit_by_user("apply"))])
 def apply_to_job(
     submission: SubmissionCreate,
     db: Session = Depends(get_db),
@@ -44,21 +113,30 @@ def apply_to_job(
     new_submission = Submission(
         candidate_id=current_user.id,
         job_id=submission.job_id,
-        resume_used=getattr(submission, "resume_id", None) or getattr(submission, "resume_used", None),
-        timeline_history=[{"stage": "Applied", "date": str(datetime.now()), "notes": "Initial Application"}]
+        resume_id=submission.resume_id,
+        timeline_history=[{"stage": "Applied", "date": str(datetime.now()), "notes": "Initial Application"}],
+        # Known to be NULL, so serializing the response needs no SELECT for it
+        updated_at=None,
     )
     db.add(new_submission)
-    db.commit()
-    db.refresh(new_submission)
+    db.flush()
+    # Scored by the worker once this transaction commits
+    task_queue.enqueue(db, "score_submission", {"submission_id": new_submission.id})
     return new_submission
 
 @router.put("/{id}/stage", response_model=SubmissionResponse)
 def update_application_stage(
     id: int,
     status_update: SubmissionUpdateStatus,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_hiring_manager)
 ):
+    """
+    Move a submission to a new stage. Send the ETag (or `version`) you last read as
+    If-Match; a concurrent change returns 409 instead of being overwritten.
+    """
     submission = db.query(Submission).filter(Submission.id == id).first()
     if not submission:
         raise HTTPException(
@@ -67,18 +145,24 @@ def update_application_stage(
         )
 
     if current_user.role == UserRole.HIRING_MANAGER:
-        assignment = db.query(CandidateAssignment).filter(
-            CandidateAssignment.manager_id == current_user.id,
-            CandidateAssignment.candidate_id == submission.candidate_id
-        ).first()
-        
-        if not assignment:
+        if not assignment_index.is_assigned(db, current_user.id, submission.candidate_id):
              raise HTTPException(
                  status_code=status.HTTP_403_FORBIDDEN, 
                  detail="Not authorized to manage this candidate"
              )
+    check_if_match(if_match, submission)
 
-    submission.status = status_update.current_status
+    try:
+        new_status = SubmissionStatus(status_update.current_status)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid stage. Expected one of: {', '.join(s.value for s in SubmissionStatus)}"
+        )
+    if new_status != submission.status:
+        submission.status = new_status
+        submission.stage_entered_at = func.now()
+        clear_alert(db, submission.id)
     if status_update.notes:
         submission.manager_notes = status_update.notes
     
@@ -93,6 +177,7 @@ def update_application_stage(
     history.append(new_event)
     submission.timeline_history = history
 
-    db.commit()
-    db.refresh(submission)
+    publish_stage_change(db, submission, status_update.notes)
+    flush_versioned(db)
+    response.headers["ETag"] = etag(submission)
     return submission
\ No newline at end of file
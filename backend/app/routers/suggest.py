@@ -0,0 +1,22 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, Query
+
+from app.dependencies import get_token_user_id
+from app.schemas.common import Suggestion
+from app.services.suggest import FIELDS, suggest_index
+
+router = APIRouter()
+
+@router.get("", response_model=List[Suggestion])
+async def suggest_values(
+    field: str = Query(..., pattern=f"^({'|'.join(FIELDS)})$"),
+    prefix: str = Query("", max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    _: int = Depends(get_token_user_id)
+):
+    """
+    Typeahead for free-text job and profile fields: the most used existing values of
+    `field` starting with `prefix` (case-insensitive), served from memory.
+    """
+    return [{"value": value, "count": count} for value, count in suggest_index.suggest(field, prefix, limit)]
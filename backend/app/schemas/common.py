@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, TypeVar
+from typing import Any, Dict, List, Optional, TypeVar
 
 T = TypeVar('T')
 
@@ -9,4 +9,26 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     email: Optional[str] = None
-    role: Optional[str] = None
\ No newline at end of file
+    role: Optional[str] = None
+
+class BatchSubRequest(BaseModel):
+    # Echoed back so the client can match responses; defaults to the position in the list
+    id: Optional[str] = None
+    path: str
+
+class BatchRequest(BaseModel):
+    requests: List[BatchSubRequest]
+
+class BatchSubResponse(BaseModel):
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str] = {}
+    body: Any = None
+
+class BatchResponse(BaseModel):
+    responses: List[BatchSubResponse]
+
+class Suggestion(BaseModel):
+    value: str
+    # Active jobs or candidates using the value
+    count: int
@@ -1,6 +1,7 @@
-from typing import Optional, List
+from typing import Optional, List, Dict
 from pydantic import BaseModel
 from datetime import datetime
+from app.schemas.users import UserResponse
 
 class JobBase(BaseModel):
     title: str
@@ -14,6 +15,7 @@ class JobBase(BaseModel):
     required_skills: Optional[str] = None
     experience_required: Optional[str] = None
     hiring_stages: List[str] = ["Applied", "Screening", "Interview", "Offer", "Rejected"]
+    stage_sla_days: Optional[Dict[str, int]] = None
     is_active: bool = True
 
 class JobCreate(JobBase):
@@ -26,13 +28,33 @@ class JobUpdate(BaseModel):
     location: Optional[str] = None
     department: Optional[str] = None
     employment_type: Optional[str] = None
+    salary_range: Optional[str] = None
+    requirements: Optional[str] = None
+    required_skills: Optional[str] = None
+    experience_required: Optional[str] = None
     hiring_stages: Optional[List[str]] = None
+    stage_sla_days: Optional[Dict[str, int]] = None
     is_active: Optional[bool] = None
 
 class JobResponse(JobBase):
     id: int
     creator_id: int
     created_at: datetime
+    version: int
+    salary_min: Optional[int] = None
+    salary_max: Optional[int] = None
+    salary_currency: Optional[str] = None
+    experience_min_years: Optional[int] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class CandidateMatch(BaseModel):
+    candidate: UserResponse
+    matched_skills: int
+    required_skills: int
+    coverage: float
+
+class JobRecommendation(BaseModel):
+    job: JobResponse
+    score: float
@@ -30,7 +30,11 @@ class SubmissionResponse(BaseModel):
     manager_notes: Optional[str] = None
     timeline_history: List[Dict[str, Any]] = [] 
     applied_at: datetime
+    stage_entered_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    version: int
+    # Submissions of long-closed jobs are archived and read-only
+    archived: bool = False
     
     
     candidate: Optional[UserResponse] = None
@@ -38,4 +42,14 @@ class SubmissionResponse(BaseModel):
     resume_used: Optional[ResumeResponse] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class SubmissionAlertResponse(BaseModel):
+    submission_id: int
+    candidate_id: int
+    job_id: int
+    current_status: str
+    stage_entered_at: datetime
+    threshold_days: int
+    days_in_stage: int
+    first_seen_at: datetime
@@ -1,5 +1,5 @@
-from typing import Optional
-from pydantic import BaseModel, EmailStr
+from typing import Optional, List, Dict
+from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
 from enum import Enum
 
@@ -85,4 +85,31 @@ class AssignmentResponse(BaseModel):
     assigned_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class BulkAssignmentRequest(BaseModel):
+    # Explicit pairs; ignored when auto_balance is set
+    assignments: List[AssignmentCreate] = []
+    auto_balance: bool = False
+    # Auto-balance scope: defaults to every unassigned candidate and every active manager
+    candidate_ids: Optional[List[int]] = None
+    manager_ids: Optional[List[int]] = None
+    match_skills: bool = False
+    load_slack: int = Field(0, ge=0)
+
+class BulkAssignmentResponse(BaseModel):
+    assigned: int
+    assignments: List[AssignmentCreate]
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+class CandidateSearchResponse(BaseModel):
+    total: int
+    items: List[UserResponse]
+    facets: Dict[str, List[FacetCount]]
+
+class DuplicateGroup(BaseModel):
+    candidates: List[UserResponse]
+    similarity: float
@@ -0,0 +1,81 @@
+import logging
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.jobs import Job
+from app.models.submissions import Submission, ArchivedSubmission
+from app.services.scheduler import scheduler
+from app.services.tasks import task_queue
+
+logger = logging.getLogger(__name__)
+
+
+def _add_months(day: date, months: int) -> date:
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"submissions_y{month.year}m{month.month:02d}"
+
+
+def ensure_submission_partitions(db: Session, months_ahead: int = settings.SUBMISSION_PARTITION_MONTHS_AHEAD):
+    """
+    Create the monthly `submissions` partitions up to `months_ahead` months from now, so new
+    rows land in their own month rather than the default partition. No-op unless the table
+    is partitioned (Postgres, after migration d7a3e1f05b62).
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    partitioned = db.execute(text(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'submissions'::regclass"
+    )).first()
+    if not partitioned:
+        return
+    first = date.today().replace(day=1)
+    for offset in range(months_ahead + 1):
+        start, end = _add_months(first, offset), _add_months(first, offset + 1)
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {partition_name(start)} PARTITION OF submissions "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        ))
+    db.commit()
+
+
+@task_queue.task("archive_submissions")
+def archive_submissions(db: Session, payload: dict):
+    """
+    Move the submissions of jobs closed more than `older_than_days` ago into
+    submissions_archive, `batch_size` rows per transaction, then top up the partitions.
+    """
+    days = payload.get("older_than_days", settings.SUBMISSION_ARCHIVE_AFTER_DAYS)
+    batch_size = payload.get("batch_size", 1000)
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    closed_jobs = select(Job.id).where(Job.is_active == False, Job.closed_at < cutoff)
+
+    live = Submission.__table__
+    columns = [column.name for column in live.columns]
+    moved = 0
+    while True:
+        ids = [
+            submission_id for (submission_id,) in
+            db.query(Submission.id).filter(Submission.job_id.in_(closed_jobs)).order_by(Submission.id).limit(batch_size)
+        ]
+        if not ids:
+            break
+        db.execute(insert(ArchivedSubmission.__table__).from_select(
+            columns, select(*[live.c[name] for name in columns]).where(live.c.id.in_(ids))
+        ))
+        db.execute(delete(live).where(live.c.id.in_(ids)))
+        db.commit()
+        moved += len(ids)
+        logger.info(f"Archived {moved} submissions so far")
+
+    ensure_submission_partitions(db)
+    logger.info(f"Submission archival finished: {moved} moved")
+
+
+scheduler.every(settings.SUBMISSION_ARCHIVE_SECONDS, "archive_submissions")
@@ -0,0 +1,262 @@
+import heapq
+import logging
+import threading
+import time
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.invalidation import invalidations
+from app.core.pubsub import broker
+from app.core.startup import on_warmup
+from app.db.session import SessionLocal, run_after_commit
+from app.models.jobs import Job
+from app.models.skills import CandidateSkill, JobSkill
+from app.models.users import User, UserRole, CandidateAssignment
+
+logger = logging.getLogger(__name__)
+
+# Pairs per upsert statement
+UPSERT_BATCH_SIZE = 1000
+
+
+class AssignmentIndex:
+    """
+    In-process copy of candidate_assignments: manager_id -> candidate ids.
+
+    Every change made through `record_assignment` is applied here after commit and
+    published as "assignment:<manager_id>" invalidations, on which the other workers
+    reload that manager's rows. As a last safety net the whole index is reloaded in the
+    background once it is older than ASSIGNMENT_INDEX_MAX_AGE_SECONDS.
+
+    Reads are served from the index only when invalidations reach the other workers (a
+    cross-process PUBSUB_BACKEND). With the local transport, another worker's changes
+    would never arrive, so lookups query candidate_assignments instead, through the
+    caller's session.
+    """
+
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._candidates: Dict[int, Set[int]] = {}
+        self._manager_of: Dict[int, int] = {}
+        self._loaded_at: Optional[float] = None
+        self._reloading = False
+
+    def load(self, db: Session):
+        candidates: Dict[int, Set[int]] = {}
+        manager_of: Dict[int, int] = {}
+        for manager_id, candidate_id in db.query(CandidateAssignment.manager_id, CandidateAssignment.candidate_id):
+            candidates.setdefault(manager_id, set()).add(candidate_id)
+            manager_of[candidate_id] = manager_id
+        with self._lock:
+            self._candidates, self._manager_of = candidates, manager_of
+            self._loaded_at = time.monotonic()
+
+    def _reload(self):
+        db = SessionLocal()
+        try:
+            self.load(db)
+        except Exception as e:
+            logger.error(f"Assignment index reload failed: {e}")
+        finally:
+            db.close()
+            self._reloading = False
+
+    def _indexed(self) -> bool:
+        """Whether reads may use the index; starts a background reload once it is too old."""
+        if not broker.transport.cross_process or self._loaded_at is None:
+            return False
+        if time.monotonic() - self._loaded_at > self.max_age:
+            with self._lock:
+                start, self._reloading = not self._reloading, True
+            if start:
+                # Readers (some on the event loop, via SSE) keep the current copy meanwhile
+                threading.Thread(target=self._reload, name="assignment-index-reload", daemon=True).start()
+        return True
+
+    def apply(self, pairs: Iterable[Tuple[int, Optional[int]]]):
+        """Apply committed (candidate_id, manager_id or None) changes."""
+        with self._lock:
+            for candidate_id, manager_id in pairs:
+                previous = self._manager_of.pop(candidate_id, None)
+                if previous is not None:
+                    self._candidates.get(previous, set()).discard(candidate_id)
+                if manager_id is not None:
+                    self._manager_of[candidate_id] = manager_id
+                    self._candidates.setdefault(manager_id, set()).add(candidate_id)
+
+    def refresh_manager(self, db: Session, manager_id: int):
+        """Reload one manager's candidates, e.g. after another worker changed them."""
+        candidate_ids = {
+            candidate_id for (candidate_id,) in
+            db.query(CandidateAssignment.candidate_id).filter(CandidateAssignment.manager_id == manager_id)
+        }
+        with self._lock:
+            for candidate_id in self._candidates.get(manager_id, set()) - candidate_ids:
+                if self._manager_of.get(candidate_id) == manager_id:
+                    del self._manager_of[candidate_id]
+            for candidate_id in candidate_ids:
+                # Moved from another manager, whose own invalidation may not have arrived yet
+                previous = self._manager_of.get(candidate_id)
+                if previous is not None and previous != manager_id:
+                    self._candidates.get(previous, set()).discard(candidate_id)
+                self._manager_of[candidate_id] = manager_id
+            self._candidates[manager_id] = candidate_ids
+
+    def manager_of(self, db: Session, candidate_id: int) -> Optional[int]:
+        if self._indexed():
+            return self._manager_of.get(candidate_id)
+        return db.query(CandidateAssignment.manager_id).filter(CandidateAssignment.candidate_id == candidate_id).scalar()
+
+    def is_assigned(self, db: Session, manager_id: int, candidate_id: int) -> bool:
+        return self.manager_of(db, candidate_id) == manager_id
+
+    def candidates_of(self, db: Session, manager_id: int) -> FrozenSet[int]:
+        if self._indexed():
+            with self._lock:
+                return frozenset(self._candidates.get(manager_id, ()))
+        return frozenset(
+            candidate_id for (candidate_id,) in
+            db.query(CandidateAssignment.candidate_id).filter(CandidateAssignment.manager_id == manager_id)
+        )
+
+    def cached_managers(self, candidate_ids: Iterable[int]) -> Set[int]:
+        """Managers of the candidates according to this worker's copy, without querying."""
+        with self._lock:
+            return {self._manager_of[c] for c in candidate_ids if c in self._manager_of}
+
+    def authorized(self, db: Session, manager_id: int, candidate_ids: Iterable[int]) -> List[bool]:
+        """Batched check: whether each candidate (e.g. of a page of submissions) is assigned to the manager."""
+        candidate_ids = list(candidate_ids)
+        if self._indexed():
+            manager_of = self._manager_of
+            return [manager_of.get(candidate_id) == manager_id for candidate_id in candidate_ids]
+        assigned = {
+            candidate_id for (candidate_id,) in db.query(CandidateAssignment.candidate_id).filter(
+                CandidateAssignment.manager_id == manager_id, CandidateAssignment.candidate_id.in_(set(candidate_ids))
+            )
+        } if candidate_ids else set()
+        return [candidate_id in assigned for candidate_id in candidate_ids]
+
+
+assignment_index = AssignmentIndex(settings.ASSIGNMENT_INDEX_MAX_AGE_SECONDS)
+invalidations.handler("assignment")(assignment_index.refresh_manager)
+
+
+@invalidations.on_resync
+@on_warmup("assignment_index")
+def load_assignment_index():
+    db = SessionLocal()
+    try:
+        assignment_index.load(db)
+    finally:
+        db.close()
+
+
+def record_assignments(db: Session, pairs: List[Tuple[int, Optional[int]]]):
+    """Apply (candidate_id, new manager_id or None) pairs and invalidate them elsewhere once the caller commits."""
+    pairs = list(pairs)
+    run_after_commit(db, lambda: assignment_index.apply(pairs))
+    # Both sides of a move; a stale previous manager is still fixed by the new one's refresh
+    managers = {manager_id for _, manager_id in pairs} | assignment_index.cached_managers(c for c, _ in pairs)
+    invalidations.publish(db, *(f"assignment:{m}" for m in sorted(managers - {None})))
+
+
+def record_assignment(db: Session, candidate_id: int, manager_id: Optional[int]):
+    record_assignments(db, [(candidate_id, manager_id)])
+
+
+def upsert_assignments(db: Session, pairs: List[Tuple[int, int]]):
+    """Assign each candidate to its manager, replacing any current assignment, in set-based statements."""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    for start in range(0, len(pairs), UPSERT_BATCH_SIZE):
+        rows = [{"candidate_id": c, "manager_id": m} for c, m in pairs[start:start + UPSERT_BATCH_SIZE]]
+        statement = insert(CandidateAssignment).values(rows)
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[CandidateAssignment.candidate_id],
+            set_={"manager_id": statement.excluded.manager_id, "assigned_at": func.now()},
+        ))
+    record_assignments(db, pairs)
+
+
+def balance_assignments(
+    db: Session,
+    candidate_ids: Optional[List[int]] = None,
+    manager_ids: Optional[List[int]] = None,
+    match_skills: bool = False,
+    load_slack: int = 0,
+) -> List[Tuple[int, int]]:
+    """
+    Plan (candidate_id, manager_id) pairs placing unassigned candidates with the least
+    loaded managers, using a min-heap keyed on each manager's current assignment count.
+
+    With `match_skills`, every manager whose load is within `load_slack` of the lightest
+    is considered, and the candidate goes to the one whose open jobs share the most skills
+    with them (ties to the lighter load).
+    """
+    managers = db.query(User.id).filter(User.role == UserRole.HIRING_MANAGER, User.is_active == True)
+    if manager_ids is not None:
+        managers = managers.filter(User.id.in_(manager_ids))
+    manager_ids = [manager_id for (manager_id,) in managers]
+    if not manager_ids:
+        return []
+
+    unassigned = (
+        db.query(User.id)
+        .outerjoin(CandidateAssignment, CandidateAssignment.candidate_id == User.id)
+        .filter(User.role == UserRole.CANDIDATE, User.is_active == True, CandidateAssignment.id.is_(None))
+    )
+    if candidate_ids is not None:
+        unassigned = unassigned.filter(User.id.in_(candidate_ids))
+    candidates = [candidate_id for (candidate_id,) in unassigned.order_by(User.id)]
+    if not candidates:
+        return []
+
+    loads = dict(
+        db.query(CandidateAssignment.manager_id, func.count())
+        .filter(CandidateAssignment.manager_id.in_(manager_ids))
+        .group_by(CandidateAssignment.manager_id)
+    )
+    heap = [(loads.get(manager_id, 0), manager_id) for manager_id in manager_ids]
+    heapq.heapify(heap)
+
+    manager_skills: Dict[int, Set[int]] = {}
+    candidate_skills: Dict[int, Set[int]] = {}
+    if match_skills:
+        open_job_skills = (
+            db.query(Job.creator_id, JobSkill.skill_id)
+            .join(JobSkill, JobSkill.job_id == Job.id)
+            .filter(Job.is_active == True, Job.creator_id.in_(manager_ids))
+            .distinct()
+        )
+        for manager_id, skill_id in open_job_skills:
+            manager_skills.setdefault(manager_id, set()).add(skill_id)
+        subquery = unassigned.subquery()
+        for user_id, skill_id in db.query(CandidateSkill.user_id, CandidateSkill.skill_id).join(
+            subquery, subquery.c.id == CandidateSkill.user_id
+        ).yield_per(10000):
+            candidate_skills.setdefault(user_id, set()).add(skill_id)
+
+    pairs = []
+    for candidate_id in candidates:
+        skills = candidate_skills.get(candidate_id)
+        if not skills or not manager_skills:
+            load, manager_id = heapq.heappop(heap)
+            pairs.append((candidate_id, manager_id))
+            heapq.heappush(heap, (load + 1, manager_id))
+            continue
+        # Pop every manager within the slack of the lightest, pick the best overlap, push them back
+        eligible = [heapq.heappop(heap)]
+        while heap and heap[0][0] <= eligible[0][0] + load_slack:
+            eligible.append(heapq.heappop(heap))
+        best = max(eligible, key=lambda entry: (len(skills & manager_skills.get(entry[1], set())), -entry[0], -entry[1]))
+        pairs.append((candidate_id, best[1]))
+        for entry in eligible:
+            heapq.heappush(heap, (entry[0] + 1, entry[1]) if entry is best else entry)
+    return pairs
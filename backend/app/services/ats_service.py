@@ -1,4 +1,9 @@
 import random
+from sqlalchemy.orm import Session
+
+from app.models.submissions import Submission
+from app.models.resumes import Resume
+from app.services.tasks import task_queue, RetryLater
 
 class ATSService:
     @staticmethod
@@ -12,4 +17,26 @@ class ATSService:
         if resume_text and len(resume_text) > 50:
              score += random.uniform(5, 20)
              
-        return min(round(score, 1), 99.9)
\ No newline at end of file
+        return min(round(score, 1), 99.9)
+
+
+@task_queue.task("score_submission")
+def score_submission(db: Session, payload: dict):
+    submission = db.query(Submission).filter(Submission.id == payload["submission_id"]).first()
+    if not submission:
+        return
+
+    resume_text = ""
+    if submission.resume_id:
+        resume = db.query(Resume).filter(Resume.id == submission.resume_id).first()
+        if resume and resume.parsed_text is None:
+            raise RetryLater(f"Resume {resume.id} has not been parsed yet")
+        resume_text = resume.parsed_text if resume else ""
+
+    job = submission.job
+    job_text = " ".join(filter(None, [job.description, job.requirements, job.required_skills]))
+    score = ATSService.calculate_score(resume_text, job_text)
+    # Plain UPDATE: a background score doesn't bump the version managers' If-Match headers refer to
+    db.query(Submission).filter(Submission.id == submission.id).update(
+        {Submission.ats_score: score}, synchronize_session=False
+    )
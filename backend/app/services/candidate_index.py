@@ -0,0 +1,314 @@
+import heapq
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.invalidation import invalidations
+from app.core.startup import on_warmup
+from app.db.session import SessionLocal
+from app.models.users import User, CandidateProfile, UserRole
+
+FACET_FIELDS = ("current_city", "visa_status", "experience_level")
+SKILL_MATCH_THRESHOLD = 0.4
+# Shorter skill terms only match exactly or as a whole word; trigrams would pair "go" with "django"
+SKILL_FUZZY_MIN_LENGTH = 4
+MAX_FACET_VALUES = 20
+# Facets are counted over this many of each field's most common values only
+FACET_POOL_SIZE = 50
+# Below this many candidates in scope, facets are tallied from the matching profiles
+# instead of one popcount per value
+FACET_SCAN_LIMIT = 20_000
+
+
+def split_skills(raw: Optional[str]) -> Set[str]:
+    return {s.strip().lower() for s in re.split(r"[,;/|\n]", raw or "") if s.strip()}
+
+
+def skill_tokens(skill: str) -> Set[str]:
+    """Words of a skill, keeping the symbols in names like c++, c# and node.js."""
+    return {token for token in re.split(r"[^a-z0-9+#.]+", skill) if token.strip(".")}
+
+
+def trigrams(term: str) -> Set[str]:
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bits_to_slots(bits: int, skip: int = 0, limit: Optional[int] = None) -> List[int]:
+    """Positions of the set bits, lowest first."""
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    slots = []
+    # The regex skips zero bytes in C, so sparse bitsets decode in time proportional to their hits
+    for match in re.finditer(rb"[^\x00]", data, re.S):
+        byte, base = data[match.start()], match.start() * 8
+        for offset in range(8):
+            if byte >> offset & 1:
+                slots.append(base + offset)
+        if limit is not None and len(slots) >= skip + limit:
+            break
+    return slots[skip:] if limit is None else slots[skip:skip + limit]
+
+
+def slots_to_bits(slots: Iterable[int]) -> int:
+    slots = list(slots)
+    if not slots:
+        return 0
+    buffer = bytearray(max(slots) // 8 + 1)
+    for slot in slots:
+        buffer[slot >> 3] |= 1 << (slot & 7)
+    return int.from_bytes(buffer, "little")
+
+
+class CandidateIndex:
+    """
+    In-memory inverted index over candidate profiles for filtered, faceted search.
+
+    Each candidate gets a dense slot number. Each (field, value) posting list is a
+    Python int used as a bitset over those slots, so filters are big-int AND/OR and
+    facet counts are popcounts (int.bit_count). These stay in the millisecond range
+    for a million profiles, at a memory cost of about n/8 bytes per distinct value.
+    The index is loaded at startup and updated on profile writes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.slot_of: Dict[int, int] = {}
+        self.user_ids: List[Optional[int]] = []
+        self._free_slots: List[int] = []
+        # slot -> (city key, visa key, experience key, skills) currently indexed for that slot
+        self._docs: Dict[int, Tuple[Optional[str], Optional[str], Optional[str], frozenset]] = {}
+        self.postings: Dict[str, Dict[str, int]] = {field: {} for field in FACET_FIELDS + ("skill",)}
+        # Number of candidates per value, and its original spelling for facet output
+        self.counts: Dict[str, Dict[str, int]] = {field: {} for field in FACET_FIELDS + ("skill",)}
+        self.labels: Dict[str, Dict[str, str]] = {field: {} for field in FACET_FIELDS + ("skill",)}
+        self.skill_trigrams: Dict[str, Set[str]] = {}
+        self.all_bits = 0
+
+    @staticmethod
+    def _key(value) -> Optional[str]:
+        if value is None:
+            return None
+        value = value.value if hasattr(value, "value") else str(value)
+        return value.strip().lower() or None
+
+    def _add_posting(self, field: str, key: Optional[str], label: str, bit: int):
+        if key is None:
+            return
+        if field == "skill" and key not in self.postings["skill"]:
+            for gram in trigrams(key):
+                self.skill_trigrams.setdefault(gram, set()).add(key)
+        self.postings[field][key] = self.postings[field].get(key, 0) | bit
+        self.counts[field][key] = self.counts[field].get(key, 0) + 1
+        self.labels[field].setdefault(key, label)
+
+    def _remove_posting(self, field: str, key: Optional[str], bit: int):
+        if key is None or key not in self.postings[field]:
+            return
+        remaining = self.postings[field][key] & ~bit
+        if remaining:
+            self.postings[field][key] = remaining
+            self.counts[field][key] -= 1
+        else:
+            del self.postings[field][key]
+            del self.counts[field][key]
+            if field == "skill":
+                for gram in trigrams(key):
+                    self.skill_trigrams[gram].discard(key)
+
+    def _unindex(self, slot: int):
+        bit = 1 << slot
+        city, visa, experience, skills = self._docs.pop(slot)
+        for field, key in zip(FACET_FIELDS, (city, visa, experience)):
+            self._remove_posting(field, key, bit)
+        for skill in skills:
+            self._remove_posting("skill", skill, bit)
+
+    def upsert(self, user_id: int, current_city=None, visa_status=None, experience_level=None, primary_skills=None):
+        with self._lock:
+            slot = self.slot_of.get(user_id)
+            if slot is None:
+                slot = self._free_slots.pop() if self._free_slots else len(self.user_ids)
+                if slot == len(self.user_ids):
+                    self.user_ids.append(user_id)
+                else:
+                    self.user_ids[slot] = user_id
+                self.slot_of[user_id] = slot
+                self.all_bits |= 1 << slot
+            else:
+                self._unindex(slot)
+
+            bit = 1 << slot
+            values = (current_city, visa_status, experience_level)
+            keys = tuple(self._key(v) for v in values)
+            for field, key, value in zip(FACET_FIELDS, keys, values):
+                self._add_posting(field, key, getattr(value, "value", value), bit)
+            skills = frozenset(split_skills(primary_skills))
+            for skill in skills:
+                self._add_posting("skill", skill, skill, bit)
+            self._docs[slot] = keys + (skills,)
+
+    def remove(self, user_id: int):
+        with self._lock:
+            slot = self.slot_of.pop(user_id, None)
+            if slot is None:
+                return
+            self._unindex(slot)
+            self.user_ids[slot] = None
+            self.all_bits &= ~(1 << slot)
+            self._free_slots.append(slot)
+
+    def load(self, db: Session):
+        """
+        Rebuild from the database. Slots are collected per value first and each bitset is
+        built once, since OR-ing bits into a growing int one row at a time is quadratic.
+        """
+        fresh = CandidateIndex()
+        slots: Dict[str, Dict[str, List[int]]] = {field: {} for field in fresh.postings}
+        rows = (
+            db.query(CandidateProfile)
+            .join(User, User.id == CandidateProfile.user_id)
+            .filter(User.role == UserRole.CANDIDATE, User.is_active == True)
+            .yield_per(5000)
+        )
+        for slot, profile in enumerate(rows):
+            fresh.user_ids.append(profile.user_id)
+            fresh.slot_of[profile.user_id] = slot
+            values = (profile.current_city, profile.visa_status, profile.experience_level)
+            keys = tuple(self._key(v) for v in values)
+            skills = frozenset(split_skills(profile.primary_skills))
+            fresh._docs[slot] = keys + (skills,)
+            for field, key, value in zip(FACET_FIELDS + ("skill",) * len(skills), keys + tuple(skills), values + tuple(skills)):
+                if key is not None:
+                    slots[field].setdefault(key, []).append(slot)
+                    fresh.labels[field].setdefault(key, getattr(value, "value", value))
+
+        for field, by_key in slots.items():
+            for key, key_slots in by_key.items():
+                fresh.postings[field][key] = slots_to_bits(key_slots)
+                fresh.counts[field][key] = len(key_slots)
+        for skill in fresh.postings["skill"]:
+            for gram in trigrams(skill):
+                fresh.skill_trigrams.setdefault(gram, set()).add(skill)
+        fresh.all_bits = slots_to_bits(range(len(fresh.user_ids)))
+
+        with self._lock:
+            self.__dict__.update({k: v for k, v in fresh.__dict__.items() if k != "_lock"})
+
+    def matching_skills(self, term: str) -> Set[str]:
+        """
+        Indexed skills equal to `term`, having it as a whole word ("react" matches
+        "react native"), or, for terms of SKILL_FUZZY_MIN_LENGTH or more, trigram-similar
+        to it, which tolerates typos without letting "java" match "javascript".
+        """
+        term = term.strip().lower()
+        if not term:
+            return set()
+        grams = trigrams(term)
+        candidates: Set[str] = set()
+        for gram in grams:
+            candidates |= self.skill_trigrams.get(gram, set())
+        matches = {term} & self.postings["skill"].keys()
+        fuzzy = len(term) >= SKILL_FUZZY_MIN_LENGTH
+        for skill in candidates:
+            if term in skill_tokens(skill):
+                matches.add(skill)
+                continue
+            if fuzzy:
+                skill_grams = trigrams(skill)
+                if len(grams & skill_grams) / len(grams | skill_grams) >= SKILL_MATCH_THRESHOLD:
+                    matches.add(skill)
+        return matches
+
+    def user_ids_to_bits(self, user_ids: Iterable[int]) -> int:
+        return slots_to_bits(self.slot_of[u] for u in user_ids if u in self.slot_of)
+
+    def search(
+        self,
+        filters: Dict[str, List[str]],
+        skills: List[str],
+        within: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 50,
+    ) -> Tuple[List[int], int, Dict[str, List[dict]]]:
+        """
+        `filters` maps a facet field to accepted values (OR within a field, AND across fields).
+        Every skill term must match. `within` restricts the search to a bitset of candidates.
+        Returns (page of user ids, total matches, facet counts).
+        """
+        with self._lock:
+            base = self.all_bits if within is None else self.all_bits & within
+            field_bits: Dict[str, int] = {}
+            for field, values in filters.items():
+                if values:
+                    bits = 0
+                    for value in values:
+                        bits |= self.postings[field].get(self._key(value), 0)
+                    field_bits[field] = bits
+            for term in skills:
+                bits = 0
+                for skill in self.matching_skills(term):
+                    bits |= self.postings["skill"].get(skill, 0)
+                base &= bits
+
+            result = base
+            for bits in field_bits.values():
+                result &= bits
+
+            # Disjunctive facets: each field is counted with every filter applied except its own
+            facets: Dict[str, List[dict]] = {}
+            for position, field in enumerate(FACET_FIELDS):
+                scope = base
+                for other, bits in field_bits.items():
+                    if other != field:
+                        scope &= bits
+                facets[field] = self._facet_counts(field, scope, position)
+            facets["primary_skills"] = self._facet_counts("skill", result, len(FACET_FIELDS))
+
+            slots = bits_to_slots(result, skip, limit)
+            return [self.user_ids[s] for s in slots], result.bit_count(), facets
+
+    def _facet_counts(self, field: str, scope: int, position: int) -> List[dict]:
+        if scope.bit_count() <= FACET_SCAN_LIMIT:
+            tally: Dict[str, int] = {}
+            for slot in bits_to_slots(scope):
+                values = self._docs[slot][position]
+                for key in (values if field == "skill" else (values,)):
+                    if key is not None:
+                        tally[key] = tally.get(key, 0) + 1
+        else:
+            pool = heapq.nlargest(FACET_POOL_SIZE, self.counts[field], key=self.counts[field].get)
+            tally = {key: (scope & self.postings[field][key]).bit_count() for key in pool}
+
+        top = heapq.nlargest(MAX_FACET_VALUES, ((count, key) for key, count in tally.items() if count))
+        return [{"value": self.labels[field][key], "count": count} for count, key in top]
+
+
+candidate_index = CandidateIndex()
+
+
+@invalidations.on_resync
+@on_warmup("candidate_index")
+def load_candidate_index():
+    db = SessionLocal()
+    try:
+        candidate_index.load(db)
+    finally:
+        db.close()
+
+
+@invalidations.handler("user")
+def reindex_candidate(db: Session, user_id: int):
+    profile = (
+        db.query(CandidateProfile)
+        .join(User, User.id == CandidateProfile.user_id)
+        .filter(CandidateProfile.user_id == user_id, User.role == UserRole.CANDIDATE, User.is_active == True)
+        .first()
+    )
+    if profile is None:
+        candidate_index.remove(user_id)
+        return
+    candidate_index.upsert(
+        user_id, profile.current_city, profile.visa_status, profile.experience_level, profile.primary_skills
+    )
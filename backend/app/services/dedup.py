@@ -0,0 +1,209 @@
+import hashlib
+import logging
+import random
+import re
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import settings
+from app.models.dedup import CandidateSignature, CandidateLSHBucket
+from app.models.resumes import Resume
+from app.models.users import User, UserRole, CandidateProfile
+from app.services.tasks import task_queue
+
+logger = logging.getLogger(__name__)
+
+# 16 bands of 8 rows: pairs above ~0.7 Jaccard similarity almost always share a bucket
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240613)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+# Buckets with more members than this are boilerplate (templates), not duplicates
+MAX_BUCKET_SIZE = 50
+
+
+def shingles(text: Optional[str], size: int = 3) -> Set[str]:
+    words = re.findall(r"[a-z0-9]+", (text or "").lower())
+    return {" ".join(words[i:i + size]) for i in range(max(len(words) - size + 1, 0))}
+
+
+def profile_tokens(first_name: Optional[str], last_name: Optional[str], phone: Optional[str]) -> Set[str]:
+    tokens = set()
+    name = sorted(re.findall(r"[a-z]+", f"{first_name or ''} {last_name or ''}".lower()))
+    if name:
+        tokens.add("name:" + " ".join(name))
+    digits = re.sub(r"\D", "", phone or "")
+    if len(digits) >= 7:
+        tokens.add("phone:" + digits[-10:])
+    return tokens
+
+
+def _hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+
+
+def minhash(tokens: Iterable[str]) -> Optional[Tuple[int, ...]]:
+    hashes = [_hash(t) for t in tokens]
+    if not hashes:
+        return None
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def compute_signature(document: Tuple[str, Optional[str], Optional[str], Optional[str]]) -> Optional[Tuple[int, ...]]:
+    """(resume text, first name, last name, phone) -> signature; runs in scan worker processes."""
+    text, first_name, last_name, phone = document
+    return minhash(shingles(text) | profile_tokens(first_name, last_name, phone))
+
+
+def band_buckets(signature: Tuple[int, ...]) -> List[int]:
+    buckets = []
+    for band in range(BANDS):
+        rows = struct.pack(f"<{ROWS}Q", *signature[band * ROWS:(band + 1) * ROWS])
+        buckets.append(int.from_bytes(hashlib.blake2b(rows, digest_size=8).digest(), "little", signed=True))
+    return buckets
+
+
+def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of the two token sets."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def _pack(signature: Tuple[int, ...]) -> bytes:
+    return struct.pack(f"<{NUM_PERM}Q", *signature)
+
+
+def _unpack(data: bytes) -> Tuple[int, ...]:
+    return struct.unpack(f"<{NUM_PERM}Q", data)
+
+
+def load_documents(db: Session, user_ids: List[int]) -> Dict[int, Tuple[str, Optional[str], Optional[str], Optional[str]]]:
+    texts: Dict[int, List[str]] = {}
+    resumes = db.query(Resume.user_id, Resume.parsed_text).filter(
+        Resume.user_id.in_(user_ids), Resume.parsed_text.isnot(None)
+    )
+    for user_id, text in resumes:
+        texts.setdefault(user_id, []).append(text)
+    people = (
+        db.query(User.id, User.first_name, User.last_name, func.coalesce(CandidateProfile.phone, User.phone))
+        .outerjoin(CandidateProfile, CandidateProfile.user_id == User.id)
+        .filter(User.id.in_(user_ids))
+    )
+    return {
+        user_id: ("\n".join(texts.get(user_id, [])), first_name, last_name, phone)
+        for user_id, first_name, last_name, phone in people
+    }
+
+
+def store_signatures(db: Session, signatures: Dict[int, Optional[Tuple[int, ...]]]):
+    """Replace the stored signature and LSH buckets of each user; None clears them."""
+    user_ids = list(signatures)
+    db.query(CandidateLSHBucket).filter(CandidateLSHBucket.user_id.in_(user_ids)).delete(synchronize_session=False)
+    db.query(CandidateSignature).filter(CandidateSignature.user_id.in_(user_ids)).delete(synchronize_session=False)
+    db.bulk_insert_mappings(CandidateSignature, [
+        {"user_id": user_id, "signature": _pack(signature)}
+        for user_id, signature in signatures.items() if signature is not None
+    ])
+    db.bulk_insert_mappings(CandidateLSHBucket, [
+        {"user_id": user_id, "band": band, "bucket": bucket}
+        for user_id, signature in signatures.items() if signature is not None
+        for band, bucket in enumerate(band_buckets(signature))
+    ])
+
+
+@task_queue.task("dedup_candidate")
+def dedup_candidate(db: Session, payload: dict):
+    user_id = payload["user_id"]
+    document = load_documents(db, [user_id]).get(user_id)
+    store_signatures(db, {user_id: compute_signature(document) if document else None})
+
+
+@task_queue.task("dedup_scan")
+def dedup_scan(db: Session, payload: dict):
+    """Recompute every candidate's signature, hashing in DEDUP_SCAN_PROCESSES processes."""
+    batch_size = payload.get("batch_size", 1000)
+    last_id = 0
+    with ProcessPoolExecutor(max_workers=settings.DEDUP_SCAN_PROCESSES) as pool:
+        while True:
+            user_ids = [
+                user_id for (user_id,) in db.query(User.id)
+                .filter(User.role == UserRole.CANDIDATE, User.id > last_id)
+                .order_by(User.id)
+                .limit(batch_size)
+            ]
+            if not user_ids:
+                break
+            documents = load_documents(db, user_ids)
+            signatures = pool.map(compute_signature, documents.values(), chunksize=50)
+            store_signatures(db, dict(zip(documents, signatures)))
+            db.commit()
+            last_id = user_ids[-1]
+            logger.info(f"Duplicate scan: signatures stored up to user {last_id}")
+
+
+def _candidate_pairs(db: Session, user_id: Optional[int] = None) -> Set[Tuple[int, int]]:
+    a, b = aliased(CandidateLSHBucket), aliased(CandidateLSHBucket)
+    query = db.query(a.user_id, b.user_id).join(
+        b, and_(a.band == b.band, a.bucket == b.bucket, a.user_id != b.user_id)
+    )
+    if user_id is not None:
+        # Served by the (band, bucket) index: 16 lookups instead of a scan
+        query = query.filter(a.user_id == user_id)
+    else:
+        populated = (
+            db.query(CandidateLSHBucket.band, CandidateLSHBucket.bucket)
+            .group_by(CandidateLSHBucket.band, CandidateLSHBucket.bucket)
+            .having(func.count() > 1)
+            .having(func.count() <= MAX_BUCKET_SIZE)
+            .subquery()
+        )
+        query = query.join(populated, and_(a.band == populated.c.band, a.bucket == populated.c.bucket)).filter(
+            a.user_id < b.user_id
+        )
+    return {(x, y) for x, y in query.distinct()}
+
+
+def find_duplicates(db: Session, threshold: float, user_id: Optional[int] = None) -> List[Tuple[List[int], float]]:
+    """
+    Groups of likely duplicate candidates, as (user ids, lowest confirmed similarity).
+    LSH buckets propose pairs; each pair is confirmed on the full signatures.
+    """
+    pairs = _candidate_pairs(db, user_id)
+    involved = {u for pair in pairs for u in pair}
+    signatures = {}
+    ids = list(involved)
+    for start in range(0, len(ids), 1000):
+        rows = db.query(CandidateSignature).filter(CandidateSignature.user_id.in_(ids[start:start + 1000]))
+        signatures.update({row.user_id: _unpack(row.signature) for row in rows})
+
+    parent: Dict[int, int] = {}
+
+    def root(u: int) -> int:
+        while parent.setdefault(u, u) != u:
+            parent[u] = parent[parent[u]]
+            u = parent[u]
+        return u
+
+    confirmed: Dict[Tuple[int, int], float] = {}
+    for x, y in pairs:
+        if x in signatures and y in signatures:
+            value = similarity(signatures[x], signatures[y])
+            if value >= threshold:
+                parent[root(x)] = root(y)
+                confirmed[(x, y)] = value
+
+    groups: Dict[int, List[int]] = {}
+    for u in parent:
+        groups.setdefault(root(u), []).append(u)
+    lowest: Dict[int, float] = {}
+    for (x, _), value in confirmed.items():
+        lowest[root(x)] = min(lowest.get(root(x), 1.0), value)
+    return sorted(
+        ((sorted(members), lowest[r]) for r, members in groups.items() if len(members) > 1),
+        key=lambda g: (-g[1], g[0]),
+    )
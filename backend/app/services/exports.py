@@ -0,0 +1,204 @@
+import csv
+import heapq
+import io
+import re
+import zipfile
+import zlib
+from typing import Iterable, Iterator, List, Optional
+from xml.sax.saxutils import escape
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.models.jobs import Job
+from app.models.submissions import Submission, ArchivedSubmission
+from app.models.users import User, CandidateProfile, CandidateAssignment
+
+EXPORT_COLUMNS = [
+    "submission_id", "job_id", "job_title", "candidate_id", "email", "first_name", "last_name",
+    "phone", "current_city", "visa_status", "experience_level", "primary_skills", "stage",
+    "ats_score", "applied_at", "last_event_stage", "last_event_date", "last_event_notes",
+]
+# Rows per chunk handed to the client; memory stays bounded by this, not by the export size
+ROWS_PER_CHUNK = 500
+
+
+def _submission_query(db: Session, model, job_id: Optional[int], candidate_manager_id: Optional[int]):
+    query = (
+        db.query(
+            model.id, model.job_id, Job.title, model.candidate_id, User.email,
+            User.first_name, User.last_name, CandidateProfile.phone, CandidateProfile.current_city,
+            CandidateProfile.visa_status, CandidateProfile.experience_level, CandidateProfile.primary_skills,
+            model.status, model.ats_score, model.applied_at, model.timeline_history,
+        )
+        .join(Job, Job.id == model.job_id)
+        .join(User, User.id == model.candidate_id)
+        .outerjoin(CandidateProfile, CandidateProfile.user_id == User.id)
+    )
+    if job_id is not None:
+        query = query.filter(model.job_id == job_id)
+    if candidate_manager_id is not None:
+        query = query.join(CandidateAssignment, CandidateAssignment.candidate_id == model.candidate_id).filter(
+            CandidateAssignment.manager_id == candidate_manager_id
+        )
+    return query.order_by(model.id).execution_options(stream_results=True, yield_per=ROWS_PER_CHUNK)
+
+
+def submission_rows(db: Session, job_id: Optional[int] = None, candidate_manager_id: Optional[int] = None) -> Iterator[list]:
+    """
+    Export rows for one job's submissions or for the candidates assigned to a manager,
+    live and archived, in id order. Each table is read through a server-side cursor
+    (stream_results) in batches of ROWS_PER_CHUNK and the two streams are merged.
+    """
+    streams = [_submission_query(db, model, job_id, candidate_manager_id) for model in (Submission, ArchivedSubmission)]
+    for row in heapq.merge(*streams, key=lambda row: row[0]):
+        *fields, history = row
+        last = history[-1] if history else {}
+        # Enum columns (stage, experience level) export their labels
+        yield [getattr(value, "value", value) for value in fields] + [last.get("stage"), last.get("date"), last.get("notes")]
+
+
+def _csv_safe(value):
+    # Keep spreadsheet apps from evaluating cells as formulas
+    if isinstance(value, str) and value[:1] in ("=", "+", "-", "@"):
+        return "'" + value
+    return value
+
+
+def stream_csv(rows: Iterable[list], compress: bool = False) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # wbits=31 writes a gzip header and trailer around the deflate stream
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+
+    def drain() -> bytes:
+        data = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+        # Sync-flush each chunk so the client receives it now rather than when zlib's buffer fills
+        return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH) if compressor else data
+
+    writer.writerow(EXPORT_COLUMNS)
+    yield drain()
+    for count, row in enumerate(rows, 1):
+        writer.writerow([_csv_safe(value) for value in row])
+        if count % ROWS_PER_CHUNK == 0:
+            chunk = drain()
+            if chunk:
+                yield chunk
+    chunk = drain()
+    if compressor:
+        chunk += compressor.flush()
+    if chunk:
+        yield chunk
+
+
+class _ChunkSink(io.RawIOBase):
+    """Unseekable file object collecting what zipfile writes, so it can be yielded in pieces."""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+_XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Submissions" sheetId="1" r:id="rId1"/></sheets></workbook>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+_XML_ILLEGAL = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _xlsx_row(values: list) -> str:
+    cells = []
+    for value in values:
+        if value is None:
+            cells.append("<c/>")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            cells.append(f"<c><v>{value}</v></c>")
+        else:
+            text = escape(_XML_ILLEGAL.sub("", str(value)))
+            cells.append(f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+    return f"<row>{''.join(cells)}</row>"
+
+
+def stream_xlsx(rows: Iterable[list]) -> Iterator[bytes]:
+    """
+    Minimal single-sheet workbook written row by row. Inline strings avoid a shared-strings
+    table (which would need every row up front), and zipfile writes to the unseekable sink
+    using data descriptors, so each chunk can be sent as soon as it is compressed.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as workbook:
+        for name, content in _XLSX_PARTS.items():
+            workbook.writestr(name, content)
+        yield sink.take()
+
+        with workbook.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            sheet.write(_xlsx_row(EXPORT_COLUMNS).encode("utf-8"))
+            pending = []
+            for count, row in enumerate(rows, 1):
+                pending.append(_xlsx_row(row))
+                if count % ROWS_PER_CHUNK == 0:
+                    sheet.write("".join(pending).encode("utf-8"))
+                    pending.clear()
+                    chunk = sink.take()
+                    if chunk:
+                        yield chunk
+            sheet.write("".join(pending).encode("utf-8") + b"</sheetData></worksheet>")
+    yield sink.take()
+
+
+def export_response(rows: Iterable[list], format: str, accept_encoding: str, filename: str) -> StreamingResponse:
+    """StreamingResponse for `format` ("csv" or "xlsx"); CSV is gzipped when the client accepts it."""
+    if format == "xlsx":
+        return StreamingResponse(
+            stream_xlsx(rows),
+            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.xlsx"'},
+        )
+
+    compress = "gzip" in (accept_encoding or "").lower()
+    headers = {"Content-Disposition": f'attachment; filename="{filename}.csv"', "Vary": "Accept-Encoding"}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(stream_csv(rows, compress), media_type="text/csv; charset=utf-8", headers=headers)
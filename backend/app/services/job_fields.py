@@ -0,0 +1,97 @@
+import re
+from typing import NamedTuple, Optional
+
+from app.models.jobs import Job
+
+CURRENCY_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP", "₹": "INR"}
+CURRENCY_CODES = ("USD", "EUR", "GBP", "INR", "CAD", "AUD", "SGD")
+MULTIPLIERS = {"k": 1_000, "m": 1_000_000, "l": 100_000, "lakh": 100_000, "lakhs": 100_000,
+               "lpa": 100_000, "cr": 10_000_000, "crore": 10_000_000, "crores": 10_000_000}
+# Pay quoted per hour or month is stored per year
+PERIODS = ((re.compile(r"/\s*h(ou)?r|per\s+hour|hourly", re.I), 2080), (re.compile(r"/\s*mo(nth)?|per\s+month|monthly", re.I), 12))
+
+# A number with its multiplier, unless it is a percentage ("15% bonus") or a "401k match"
+_AMOUNT = re.compile(r"(?>(\d+(?:[.,]\d+)*))\s*(?>(k|m|lakhs?|lpa|l|crores?|cr)\b)?(?!\s*(?:%|match\b))", re.I)
+# What may sit between the two ends of a range: "120k-150k", "€50.000 - €60.000", "12 to 15 LPA"
+_RANGE_GAP = re.compile(rf"\s*(?:-|–|—|to)\s*(?:[{''.join(CURRENCY_SYMBOLS)}]|(?:{'|'.join(CURRENCY_CODES)})\b)?\s*", re.I)
+_CURRENCY_AFTER = re.compile(rf"\s*({'|'.join(CURRENCY_CODES)})\b", re.I)
+_INR_MULTIPLIERS = {"l", "lakh", "lakhs", "lpa", "cr", "crore", "crores"}
+_YEARS = re.compile(r"(\d+(?:\.\d+)?)\s*\+?\s*(?:-\s*\d+(?:\.\d+)?\s*)?(years?|yrs?|months?|mos?)?", re.I)
+_ENTRY_LEVEL = re.compile(r"fresher|entry|graduate|intern|no experience", re.I)
+
+
+class Salary(NamedTuple):
+    min: Optional[int]
+    max: Optional[int]
+    currency: Optional[str]
+
+
+def _number(text: str) -> float:
+    # "120,000" and "1.5", but "50.000" and "1.200.000" are European thousands
+    if "," in text or re.fullmatch(r"\d{1,3}(?:\.\d{3})+", text):
+        return float(re.sub(r"[.,]", "", text))
+    return float(text)
+
+
+def _currency(text: str) -> Optional[str]:
+    currency = next((code for symbol, code in CURRENCY_SYMBOLS.items() if symbol in text), None)
+    return currency or next((code for code in CURRENCY_CODES if re.search(rf"\b{code}\b", text, re.I)), None)
+
+
+def parse_salary(text: Optional[str]) -> Salary:
+    """
+    "$120k-150k" -> (120000, 150000, "USD"); "100k+" -> (100000, None, None);
+    "up to €60,000" -> (None, 60000, "EUR"); "12-15 LPA" -> (1200000, 1500000, "INR").
+    Only the first amount or range counts: "$95k + 15% bonus" -> (95000, None, "USD").
+    """
+    if not text:
+        return Salary(None, None, None)
+    matches = list(_AMOUNT.finditer(text))
+    if not matches:
+        return Salary(None, None, _currency(text))
+    salary = matches[:1]
+    if len(matches) > 1 and _RANGE_GAP.fullmatch(text, matches[0].end(), matches[1].start()):
+        salary.append(matches[1])
+    start, end = salary[0].start(), salary[-1].end()
+
+    after = _CURRENCY_AFTER.match(text, end)
+    currency = _currency(text[:end]) or (after.group(1).upper() if after else None)
+    amounts = [(_number(match.group(1)), (match.group(2) or "").lower()) for match in salary]
+    if currency is None and any(suffix in _INR_MULTIPLIERS for _, suffix in amounts):
+        currency = "INR"
+
+    # "120-150k": a trailing multiplier applies to the bare number before it
+    last_multiplier = MULTIPLIERS.get(amounts[-1][1], 1)
+    values = [value * MULTIPLIERS.get(suffix, last_multiplier if value < 1000 else 1) for value, suffix in amounts]
+    for pattern, factor in PERIODS:
+        if pattern.search(text):
+            values = [value * factor for value in values]
+            break
+    values = [int(round(value)) for value in values]
+
+    if len(values) == 1:
+        if re.match(r"\s*\+", text[end:]) or re.search(r"\bfrom\b|\bat least\b|\bmin", text[:start], re.I):
+            return Salary(values[0], None, currency)
+        if re.search(r"\bup to\b|\bupto\b|\bmax", text[:start], re.I):
+            return Salary(None, values[0], currency)
+        return Salary(values[0], values[0], currency)
+    return Salary(min(values), max(values), currency)
+
+
+def parse_experience_years(text: Optional[str]) -> Optional[int]:
+    """Minimum whole years asked for: "3-5 Years" -> 3, "5+ yrs" -> 5, "Fresher" -> 0, "6 months" -> 0."""
+    if not text:
+        return None
+    match = _YEARS.search(text)
+    if match is None:
+        return 0 if _ENTRY_LEVEL.search(text) else None
+    value = float(match.group(1))
+    if (match.group(2) or "").lower().startswith("mo"):
+        value /= 12
+    return int(value)
+
+
+def apply_parsed_fields(job: Job):
+    """Refresh the numeric salary and experience columns from `job`'s free-text ones."""
+    job.salary_min, job.salary_max, job.salary_currency = parse_salary(job.salary_range)
+    job.experience_min_years = parse_experience_years(job.experience_required)
@@ -0,0 +1,224 @@
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, func, literal_column, or_
+from sqlalchemy.orm import Session
+
+from app.core.invalidation import invalidations
+from app.core.startup import on_warmup
+from app.db.session import SessionLocal, engine, run_after_commit
+from app.models.jobs import Job
+
+# Field -> Postgres weight label, and the matching ts_rank default weight used by the fallback
+SEARCH_FIELDS = {
+    "title": ("A", 1.0),
+    "required_skills": ("B", 0.4),
+    "requirements": ("C", 0.2),
+    "description": ("D", 0.1),
+}
+STOPWORDS = frozenset("a an and are as at be by for from in is it of on or the to with".split())
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    # Keeps "c++", "c#" and ".net"-style tokens intact
+    return [t for t in re.findall(r"[a-z0-9.+#]*[a-z0-9+#]", (text or "").lower()) if t not in STOPWORDS]
+
+
+def uses_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def search_vector_expression(job: Job):
+    """
+    Weighted tsvector for `job`, built from its current attribute values. Bound values
+    rather than column references, since an UPDATE's SET clause would see the old row.
+    """
+    vector = None
+    for field, (weight, _) in SEARCH_FIELDS.items():
+        # Inline the weight: setweight() takes a "char", which a VARCHAR parameter won't cast to
+        part = func.setweight(func.to_tsvector("english", getattr(job, field) or ""), literal_column(f"'{weight}'"))
+        vector = part if vector is None else vector.op("||")(part)
+    return vector
+
+
+class JobSearchIndex:
+    """
+    In-process BM25 index over active jobs; the fallback for databases without full-text
+    search (SQLite in development). Term frequencies are weighted per field like ts_rank.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.postings: Dict[str, Dict[int, float]] = {}
+        self.lengths: Dict[int, float] = {}
+        self._terms: Dict[int, List[str]] = {}
+        self.total_length = 0.0
+
+    def upsert(self, job_id: int, fields: Dict[str, Optional[str]]):
+        weighted: Counter = Counter()
+        for field, (_, weight) in SEARCH_FIELDS.items():
+            for term in tokenize(fields.get(field)):
+                weighted[term] += weight
+        with self._lock:
+            self._remove(job_id)
+            for term, tf in weighted.items():
+                self.postings.setdefault(term, {})[job_id] = tf
+            self._terms[job_id] = list(weighted)
+            self.lengths[job_id] = sum(weighted.values())
+            self.total_length += self.lengths[job_id]
+
+    def remove(self, job_id: int):
+        with self._lock:
+            self._remove(job_id)
+
+    def _remove(self, job_id: int):
+        for term in self._terms.pop(job_id, []):
+            docs = self.postings[term]
+            del docs[job_id]
+            if not docs:
+                del self.postings[term]
+        self.total_length -= self.lengths.pop(job_id, 0.0)
+
+    def load(self, db: Session):
+        fresh = JobSearchIndex()
+        columns = [getattr(Job, field) for field in SEARCH_FIELDS]
+        for row in db.query(Job.id, *columns).filter(Job.is_active == True).yield_per(1000):
+            fresh.upsert(row.id, {field: getattr(row, field) for field in SEARCH_FIELDS})
+        with self._lock:
+            self.__dict__.update({k: v for k, v in fresh.__dict__.items() if k != "_lock"})
+
+    def search(self, q: str) -> List[int]:
+        """Ids of the jobs containing every term of `q`, best match first."""
+        terms = set(tokenize(q))
+        with self._lock:
+            if not terms or not self.lengths:
+                return []
+            postings = sorted((self.postings.get(t, {}) for t in terms), key=len)
+            if not postings[0]:
+                return []
+
+            n = len(self.lengths)
+            average_length = self.total_length / n or 1.0
+            scores = {}
+            # Intersect starting from the rarest term
+            for job_id in postings[0]:
+                if all(job_id in docs for docs in postings[1:]):
+                    norm = self.K1 * (1 - self.B + self.B * self.lengths[job_id] / average_length)
+                    scores[job_id] = sum(
+                        math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+                        * docs[job_id] * (self.K1 + 1) / (docs[job_id] + norm)
+                        for docs in postings
+                    )
+        return sorted(scores, key=lambda job_id: (-scores[job_id], -job_id))
+
+
+job_search_index = JobSearchIndex()
+
+
+@invalidations.on_resync
+@on_warmup("job_search_index")
+def load_job_search_index():
+    if engine.dialect.name == "postgresql":
+        return
+    db = SessionLocal()
+    try:
+        job_search_index.load(db)
+    finally:
+        db.close()
+
+
+@invalidations.handler("job")
+def reindex_job(db: Session, job_id: int):
+    """Refresh a job changed by another worker. Postgres keeps search_vector on the row instead."""
+    if uses_postgres(db):
+        return
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if job is None or not job.is_active:
+        job_search_index.remove(job_id)
+    else:
+        job_search_index.upsert(job_id, {field: getattr(job, field) for field in SEARCH_FIELDS})
+
+
+def index_job(db: Session, job: Job):
+    """Refresh `job`'s search entry as part of the caller's transaction. Call before commit."""
+    if uses_postgres(db):
+        job.search_vector = search_vector_expression(job)
+        return
+    if job.id is None:
+        db.flush()
+    job_id, is_active = job.id, job.is_active
+    fields = {field: getattr(job, field) for field in SEARCH_FIELDS}
+    if is_active is False:
+        run_after_commit(db, lambda: job_search_index.remove(job_id))
+    else:
+        run_after_commit(db, lambda: job_search_index.upsert(job_id, fields))
+
+
+def search_jobs(
+    db: Session,
+    q: Optional[str] = None,
+    location: Optional[str] = None,
+    department: Optional[str] = None,
+    employment_type: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    salary_min: Optional[int] = None,
+    salary_max: Optional[int] = None,
+    salary_currency: Optional[str] = None,
+    experience_min: Optional[int] = None,
+    experience_max: Optional[int] = None,
+) -> List[Job]:
+    """
+    Active jobs matching the filters; ranked by relevance when `q` is given. `salary_min`
+    keeps jobs that can pay at least that much and `salary_max` those starting at most
+    that; the experience bounds apply to the years a job asks for. Jobs whose salary or
+    experience could not be parsed are left out by the matching filters. Salary bounds
+    are only comparable within one currency, so they need `salary_currency`.
+    """
+    if (salary_min is not None or salary_max is not None) and not salary_currency:
+        raise ValueError("salary_min and salary_max need a salary_currency")
+    query = db.query(Job).filter(Job.is_active == True)
+    if location:
+        query = query.filter(Job.location.ilike(f"%{location}%"))
+    if department:
+        query = query.filter(func.lower(Job.department) == department.lower())
+    if employment_type:
+        query = query.filter(func.lower(Job.employment_type) == employment_type.lower())
+    # Each side of the ORs is a range scan of one index
+    if salary_min is not None:
+        query = query.filter(or_(Job.salary_max >= salary_min, and_(Job.salary_max.is_(None), Job.salary_min >= salary_min)))
+    if salary_max is not None:
+        query = query.filter(or_(Job.salary_min <= salary_max, and_(Job.salary_min.is_(None), Job.salary_max <= salary_max)))
+    if salary_currency:
+        query = query.filter(Job.salary_currency == salary_currency.upper())
+    if experience_min is not None:
+        query = query.filter(Job.experience_min_years >= experience_min)
+    if experience_max is not None:
+        query = query.filter(Job.experience_min_years <= experience_max)
+
+    if not q or not q.strip():
+        return query.offset(skip).limit(limit).all()
+
+    if uses_postgres(db):
+        ts_query = func.websearch_to_tsquery("english", q)
+        return (
+            query.filter(Job.search_vector.op("@@")(ts_query))
+            .order_by(func.ts_rank_cd(Job.search_vector, ts_query).desc(), Job.id.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+    ranked = job_search_index.search(q)
+    if not ranked:
+        return []
+    allowed = {job_id for (job_id,) in query.filter(Job.id.in_(ranked)).with_entities(Job.id)}
+    page = [job_id for job_id in ranked if job_id in allowed][skip:skip + limit]
+    jobs = {job.id: job for job in db.query(Job).filter(Job.id.in_(page))} if page else {}
+    return [jobs[job_id] for job_id in page]
@@ -0,0 +1,268 @@
+import heapq
+import re
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.invalidation import invalidations
+from app.core.startup import on_warmup
+from app.db.session import SessionLocal, run_after_commit
+from app.models.jobs import Job
+from app.models.skills import CandidateSkill, JobSkill
+from app.models.users import User, UserRole, CandidateProfile
+
+SKILL_WEIGHT = 0.6
+CITY_WEIGHT = 0.25
+EXPERIENCE_WEIGHT = 0.15
+
+# Years of experience covered by each ExperienceLevel value
+EXPERIENCE_YEARS = {"fresher": (0, 1), "1-3 years": (1, 3), "3-5 years": (3, 5), "5+ years": (5, 99)}
+
+
+class Features(NamedTuple):
+    skills: frozenset
+    city: Optional[str]
+    # (min, max) years for candidates; (min, min) for jobs, None when unknown
+    years: Optional[Tuple[int, int]]
+
+
+def city_key(location: Optional[str]) -> Optional[str]:
+    """"Boston, MA" and "boston" both map to "boston"."""
+    city = (location or "").split(",")[0].strip().lower()
+    return city or None
+
+
+def candidate_features(skill_ids: Iterable[int], current_city: Optional[str], experience_level) -> Features:
+    level = getattr(experience_level, "value", experience_level)
+    return Features(frozenset(skill_ids), city_key(current_city), EXPERIENCE_YEARS.get((level or "").lower()))
+
+
+def job_features(skill_ids: Iterable[int], location: Optional[str], experience_required: Optional[str]) -> Features:
+    years = re.search(r"\d+", experience_required or "")
+    return Features(frozenset(skill_ids), city_key(location), (int(years.group()),) * 2 if years else None)
+
+
+def score(candidate: Features, job: Features) -> float:
+    """Share of the job's skills the candidate has, same city, enough experience. 0 = unrelated."""
+    skill = len(candidate.skills & job.skills) / len(job.skills) if job.skills else 0.0
+    city = 1.0 if job.city is not None and candidate.city == job.city else 0.0
+    if not skill and not city:
+        return 0.0
+    experience = 1.0 if job.years is None or (candidate.years and candidate.years[1] >= job.years[0]) else 0.0
+    return round(SKILL_WEIGHT * skill + CITY_WEIGHT * city + EXPERIENCE_WEIGHT * experience, 4)
+
+
+class RecommendationEngine:
+    """
+    Keeps each candidate's top-K active jobs in a bounded min-heap, so reads are a dict lookup.
+
+    Jobs and candidates are indexed by skill and city. A candidate's heap is built on
+    their first read by scoring only the jobs sharing a skill or the city with them, and
+    is then maintained: a new job is offered to the related candidates that have a heap
+    and replaces the weakest entry when it scores higher; a closed job is dropped from
+    the heaps holding it, and those candidates (like one whose profile changed) are
+    rescored against their related jobs, never the full job list.
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self._lock = threading.Lock()
+        self.jobs: Dict[int, Features] = {}
+        self.candidates: Dict[int, Features] = {}
+        self.jobs_by_skill: Dict[int, Set[int]] = {}
+        self.jobs_by_city: Dict[str, Set[int]] = {}
+        self.candidates_by_skill: Dict[int, Set[int]] = {}
+        self.candidates_by_city: Dict[str, Set[int]] = {}
+        self.heaps: Dict[int, List[Tuple[float, int]]] = {}
+        # Heap contents sorted best first, rebuilt on every change to that heap
+        self.ranked: Dict[int, Tuple[Tuple[int, float], ...]] = {}
+        # job id -> candidates whose heap currently holds it
+        self.holders: Dict[int, Set[int]] = {}
+
+    @staticmethod
+    def _index(by_skill: Dict[int, Set[int]], by_city: Dict[str, Set[int]], key: int, features: Features, add: bool):
+        for skill_id in features.skills:
+            (by_skill.setdefault(skill_id, set()).add if add else by_skill.get(skill_id, set()).discard)(key)
+        if features.city is not None:
+            (by_city.setdefault(features.city, set()).add if add else by_city.get(features.city, set()).discard)(key)
+
+    @staticmethod
+    def _related(by_skill: Dict[int, Set[int]], by_city: Dict[str, Set[int]], features: Features) -> Set[int]:
+        related = set(by_city.get(features.city, ())) if features.city is not None else set()
+        for skill_id in features.skills:
+            related |= by_skill.get(skill_id, set())
+        return related
+
+    def _rank(self, user_id: int):
+        self.ranked[user_id] = tuple((job_id, s) for s, job_id in sorted(self.heaps[user_id], reverse=True))
+
+    def _offer(self, user_id: int, job_id: int):
+        if user_id not in self.heaps:
+            return
+        value = score(self.candidates[user_id], self.jobs[job_id])
+        if value <= 0:
+            return
+        heap = self.heaps.setdefault(user_id, [])
+        if len(heap) < self.k:
+            heapq.heappush(heap, (value, job_id))
+        elif (value, job_id) > heap[0]:
+            _, dropped = heapq.heapreplace(heap, (value, job_id))
+            self.holders[dropped].discard(user_id)
+        else:
+            return
+        self.holders.setdefault(job_id, set()).add(user_id)
+        self._rank(user_id)
+
+    def _recompute(self, user_id: int):
+        for _, job_id in self.heaps.get(user_id, []):
+            self.holders[job_id].discard(user_id)
+        candidate = self.candidates.get(user_id)
+        if candidate is None:
+            self.heaps.pop(user_id, None)
+            self.ranked.pop(user_id, None)
+            return
+        scored = []
+        for job_id in self._related(self.jobs_by_skill, self.jobs_by_city, candidate):
+            value = score(candidate, self.jobs[job_id])
+            if value > 0:
+                scored.append((value, job_id))
+        heap = heapq.nlargest(self.k, scored)
+        heapq.heapify(heap)
+        self.heaps[user_id] = heap
+        for _, job_id in heap:
+            self.holders.setdefault(job_id, set()).add(user_id)
+        self._rank(user_id)
+
+    def _drop_job(self, job_id: int) -> Set[int]:
+        features = self.jobs.pop(job_id, None)
+        if features is not None:
+            self._index(self.jobs_by_skill, self.jobs_by_city, job_id, features, add=False)
+        holders = self.holders.pop(job_id, set())
+        for user_id in holders:
+            heap = [entry for entry in self.heaps[user_id] if entry[1] != job_id]
+            heapq.heapify(heap)
+            self.heaps[user_id] = heap
+        return holders
+
+    def upsert_job(self, job_id: int, skill_ids: Optional[Iterable[int]], location: Optional[str], experience_required: Optional[str]):
+        """`skill_ids=None` keeps the skills already known for the job."""
+        with self._lock:
+            if skill_ids is None:
+                skill_ids = self.jobs[job_id].skills if job_id in self.jobs else ()
+            lost = self._drop_job(job_id)
+            features = job_features(skill_ids, location, experience_required)
+            self.jobs[job_id] = features
+            self._index(self.jobs_by_skill, self.jobs_by_city, job_id, features, add=True)
+            for user_id in self._related(self.candidates_by_skill, self.candidates_by_city, features):
+                self._offer(user_id, job_id)
+            # The job may now rank below jobs these candidates previously cut, so rescore them fully
+            for user_id in lost:
+                self._recompute(user_id)
+
+    def remove_job(self, job_id: int):
+        with self._lock:
+            for user_id in self._drop_job(job_id):
+                self._recompute(user_id)
+
+    def upsert_candidate(self, user_id: int, features: Features):
+        with self._lock:
+            previous = self.candidates.get(user_id)
+            if previous is not None:
+                self._index(self.candidates_by_skill, self.candidates_by_city, user_id, previous, add=False)
+            self.candidates[user_id] = features
+            self._index(self.candidates_by_skill, self.candidates_by_city, user_id, features, add=True)
+            if user_id in self.heaps:
+                self._recompute(user_id)
+
+    def recommendations(self, user_id: int) -> Tuple[Tuple[int, float], ...]:
+        """(job_id, score) pairs, best first."""
+        ranked = self.ranked.get(user_id)
+        if ranked is None:
+            with self._lock:
+                if user_id not in self.heaps:
+                    self._recompute(user_id)
+                ranked = self.ranked.get(user_id, ())
+        return ranked
+
+    def load(self, db: Session):
+        fresh = RecommendationEngine(self.k)
+
+        job_skills: Dict[int, Set[int]] = {}
+        for job_id, skill_id in db.query(JobSkill.job_id, JobSkill.skill_id).yield_per(10000):
+            job_skills.setdefault(job_id, set()).add(skill_id)
+        jobs = db.query(Job.id, Job.location, Job.experience_required).filter(Job.is_active == True)
+        for job_id, location, experience_required in jobs.yield_per(1000):
+            features = job_features(job_skills.get(job_id, ()), location, experience_required)
+            fresh.jobs[job_id] = features
+            fresh._index(fresh.jobs_by_skill, fresh.jobs_by_city, job_id, features, add=True)
+
+        candidate_skills: Dict[int, Set[int]] = {}
+        for user_id, skill_id in db.query(CandidateSkill.user_id, CandidateSkill.skill_id).yield_per(10000):
+            candidate_skills.setdefault(user_id, set()).add(skill_id)
+        profiles = (
+            db.query(CandidateProfile.user_id, CandidateProfile.current_city, CandidateProfile.experience_level)
+            .join(User, User.id == CandidateProfile.user_id)
+            .filter(User.role == UserRole.CANDIDATE, User.is_active == True)
+        )
+        for user_id, current_city, experience_level in profiles.yield_per(5000):
+            features = candidate_features(candidate_skills.get(user_id, ()), current_city, experience_level)
+            fresh.candidates[user_id] = features
+            fresh._index(fresh.candidates_by_skill, fresh.candidates_by_city, user_id, features, add=True)
+
+        with self._lock:
+            self.__dict__.update({k: v for k, v in fresh.__dict__.items() if k != "_lock"})
+
+
+recommendations = RecommendationEngine(settings.RECOMMENDATIONS_PER_CANDIDATE)
+
+
+@invalidations.on_resync
+@on_warmup("recommendations")
+def load_recommendations():
+    db = SessionLocal()
+    try:
+        recommendations.load(db)
+    finally:
+        db.close()
+
+
+def track_job(db: Session, job: Job, skill_ids: Optional[List[int]] = None):
+    """Update recommendations for `job` once the caller commits."""
+    job_id, is_active = job.id, job.is_active
+    location, experience_required = job.location, job.experience_required
+    if is_active is False:
+        run_after_commit(db, lambda: recommendations.remove_job(job_id))
+    else:
+        run_after_commit(db, lambda: recommendations.upsert_job(job_id, skill_ids, location, experience_required))
+
+
+def track_candidate(db: Session, user_id: int, profile: CandidateProfile, skill_ids: Optional[List[int]] = None):
+    """Update `user_id`'s recommendations once the caller commits."""
+    if skill_ids is None:
+        previous = recommendations.candidates.get(user_id)
+        skill_ids = previous.skills if previous is not None else ()
+    features = candidate_features(skill_ids, profile.current_city, profile.experience_level)
+    run_after_commit(db, lambda: recommendations.upsert_candidate(user_id, features))
+
+
+@invalidations.handler("job")
+def reload_job(db: Session, job_id: int):
+    job = db.query(Job.is_active, Job.location, Job.experience_required).filter(Job.id == job_id).first()
+    if job is None or not job.is_active:
+        recommendations.remove_job(job_id)
+        return
+    skill_ids = [s for (s,) in db.query(JobSkill.skill_id).filter(JobSkill.job_id == job_id)]
+    recommendations.upsert_job(job_id, skill_ids, job.location, job.experience_required)
+
+
+@invalidations.handler("user")
+def reload_candidate(db: Session, user_id: int):
+    profile = db.query(CandidateProfile.current_city, CandidateProfile.experience_level).filter(
+        CandidateProfile.user_id == user_id
+    ).first()
+    if profile is None:
+        return
+    skill_ids = [s for (s,) in db.query(CandidateSkill.skill_id).filter(CandidateSkill.user_id == user_id)]
+    recommendations.upsert_candidate(user_id, candidate_features(skill_ids, profile.current_city, profile.experience_level))
@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.compression import CompressedBody
+from app.core.config import settings
+from app.core.invalidation import invalidations
+from app.db.session import run_after_commit
+
+
+class _Flight:
+    """One in-progress build; requests missing the same key meanwhile wait for its result."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.body: Optional[CompressedBody] = None
+        self.error: Optional[BaseException] = None
+
+
+class ResponseCache:
+    """
+    Per-worker LRU of serialized response bodies with their compressed variants, so a hot
+    page is serialized and compressed once per `ttl` rather than on every hit. Writes in
+    this worker clear it after commit; other workers clear it on the write's invalidation.
+
+    Misses are single-flight: while one request builds a key, the others missing it wait
+    and share that build (or its exception) instead of running the same query. A build
+    that overlapped a clear, or a discard of its own key, is returned to its waiters but
+    not stored.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, CompressedBody]]" = OrderedDict()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._generation = 0
+        # Discards of keys being built, so only that key's build is dropped; cleared as it ends
+        self._key_generations: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get_or_build(self, key: Hashable, build: Callable[[], bytes]) -> CompressedBody:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                generation = (self._generation, self._key_generations.get(key, 0))
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.body
+
+        try:
+            flight.body = CompressedBody(build())
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                current = (self._generation, self._key_generations.pop(key, 0))
+                if flight.error is None and generation == current:
+                    self._entries[key] = (time.monotonic() + self.ttl, flight.body)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            flight.done.set()
+        return flight.body
+
+    def discard(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+            if key in self._flights:
+                self._key_generations[key] = self._key_generations.get(key, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                "coalesced": self.coalesced, "in_flight": len(self._flights),
+            }
+
+
+job_board_cache = ResponseCache(settings.JOB_BOARD_CACHE_SECONDS, settings.JOB_BOARD_CACHE_ENTRIES)
+job_detail_cache = ResponseCache(settings.JOB_DETAIL_CACHE_SECONDS, settings.JOB_DETAIL_CACHE_ENTRIES)
+invalidations.on_resync(job_board_cache.clear)
+invalidations.on_resync(job_detail_cache.clear)
+
+
+@invalidations.handler("job")
+def clear_job_board(db: Session, job_id: int):
+    job_board_cache.clear()
+    job_detail_cache.discard(job_id)
+
+
+def invalidate_job_board(db: Session, job_id: Optional[int] = None):
+    """Drop cached job board pages, and `job_id`'s cached detail, once the caller commits."""
+    def invalidate():
+        job_board_cache.clear()
+        if job_id is not None:
+            job_detail_cache.discard(job_id)
+    run_after_commit(db, invalidate)
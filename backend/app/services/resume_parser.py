@@ -0,0 +1,51 @@
+import os
+import re
+import zipfile
+import zlib
+from sqlalchemy.orm import Session
+
+from app.models.resumes import Resume
+from app.services.tasks import task_queue
+
+
+def _pdf_text(data: bytes) -> str:
+    """Best-effort text from PDF content streams (string operands of Tj/TJ)."""
+    chunks = []
+    for match in re.finditer(rb"stream\r?\n(.*?)\r?\nendstream", data, re.S):
+        raw = match.group(1)
+        try:
+            raw = zlib.decompress(raw)
+        except zlib.error:
+            pass
+        chunks.extend(re.findall(rb"\((.*?)(?<!\\)\)", raw))
+    return b" ".join(chunks).decode("latin-1", errors="ignore")
+
+
+def _docx_text(path: str) -> str:
+    with zipfile.ZipFile(path) as docx:
+        xml = docx.read("word/document.xml").decode("utf-8", errors="ignore")
+    xml = re.sub(r"</w:p>", "\n", xml)
+    return re.sub(r"<[^>]+>", "", xml)
+
+
+def extract_text(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".docx":
+        text = _docx_text(path)
+    else:
+        with open(path, "rb") as f:
+            data = f.read()
+        if extension == ".pdf":
+            text = _pdf_text(data)
+        else:
+            text = data.decode("utf-8", errors="ignore")
+    return re.sub(r"[ \t\r\f\v]+", " ", text).strip()
+
+
+@task_queue.task("parse_resume")
+def parse_resume(db: Session, payload: dict):
+    resume = db.query(Resume).filter(Resume.id == payload["resume_id"]).first()
+    if not resume:
+        return
+    resume.parsed_text = extract_text(resume.file_url)
+    task_queue.enqueue(db, "dedup_candidate", {"user_id": resume.user_id})
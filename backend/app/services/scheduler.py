@@ -0,0 +1,65 @@
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.tasks import Task, TaskStatus
+from app.services.tasks import task_queue
+
+logger = logging.getLogger(__name__)
+
+
+class Scheduler:
+    """
+    Enqueues registered tasks on the task queue at fixed intervals, so periodic work gets
+    the queue's leases and retries. Runs inside `worker.py`; start it in one worker per
+    deployment (the others pass --no-scheduler). A task still queued or running from its
+    previous slot is not enqueued again, and intervals restart when the worker does.
+    """
+
+    def __init__(self):
+        self.entries: Dict[str, Tuple[float, dict]] = {}
+        self._next_run: Dict[str, float] = {}
+
+    def every(self, seconds: float, name: str, payload: Optional[dict] = None):
+        self.entries[name] = (seconds, payload or {})
+
+    def run_pending(self) -> List[str]:
+        """Enqueue the tasks whose interval has elapsed; returns their names."""
+        now = time.monotonic()
+        due = [name for name in self.entries if self._next_run.get(name, 0) <= now]
+        if not due:
+            return []
+        db = SessionLocal()
+        try:
+            pending = {
+                name for (name,) in db.query(Task.name)
+                .filter(Task.name.in_(due), Task.status.in_([TaskStatus.QUEUED, TaskStatus.RUNNING]))
+                .distinct()
+            }
+            enqueued = []
+            for name in due:
+                seconds, payload = self.entries[name]
+                self._next_run[name] = now + seconds
+                if name in pending:
+                    logger.info(f"Skipping scheduled task {name}: previous run still pending")
+                    continue
+                task_queue.enqueue(db, name, payload)
+                enqueued.append(name)
+            db.commit()
+            return enqueued
+        finally:
+            db.close()
+
+    def run(self, should_stop: Callable[[], bool] = lambda: False):
+        logger.info(f"Scheduler started: {', '.join(f'{name} every {s:g}s' for name, (s, _) in sorted(self.entries.items()))}")
+        while not should_stop():
+            try:
+                self.run_pending()
+            except Exception as e:
+                logger.error(f"Scheduler tick failed: {e}")
+            time.sleep(settings.SCHEDULER_TICK_SECONDS)
+
+
+scheduler = Scheduler()
@@ -0,0 +1,302 @@
+import math
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.invalidation import invalidations
+from app.core.startup import on_warmup
+from app.db.session import SessionLocal, run_after_commit
+from app.models.jobs import Job
+from app.models.skills import Skill, SkillAlias, CandidateSkill, JobSkill
+from app.models.users import User, UserRole, CandidateProfile
+from app.services.candidate_index import split_skills, bits_to_slots, slots_to_bits
+
+# Canonical name -> common alternative spellings, seeded by the skills migration
+SEED_SKILLS: Dict[str, List[str]] = {
+    "JavaScript": ["js", "ecmascript", "es6"],
+    "TypeScript": ["ts"],
+    "Python": ["py", "python3"],
+    "Go": ["golang"],
+    "Node.js": ["node", "nodejs", "node js"],
+    "React": ["reactjs", "react.js"],
+    "Vue.js": ["vue", "vuejs"],
+    "Angular": ["angularjs", "angular.js"],
+    "PostgreSQL": ["postgres", "psql"],
+    "Kubernetes": ["k8s"],
+    "Amazon Web Services": ["aws"],
+    "Google Cloud Platform": ["gcp"],
+    "Machine Learning": ["ml"],
+    "C#": ["csharp", "c sharp"],
+    "C++": ["cpp"],
+    ".NET": ["dotnet", "dot net"],
+}
+
+
+def normalize_skill(name: str) -> str:
+    return re.sub(r"\s+", " ", name.strip().lower())
+
+
+class SkillResolver:
+    """
+    Maps free-text skill names to `skills.id`, creating unknown skills on the fly.
+    Lookups are cached per worker; entries are cached only once the row is committed.
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._ids.clear()
+
+    def _cache(self, entries: Dict[str, int]):
+        with self._lock:
+            self._ids.update(entries)
+
+    def _lookup(self, db: Session, key: str) -> Optional[int]:
+        alias = db.query(SkillAlias.skill_id).filter(SkillAlias.alias == key).first()
+        if alias:
+            return alias.skill_id
+        skill = db.query(Skill.id).filter(Skill.key == key).first()
+        return skill.id if skill else None
+
+    def get_or_create(self, db: Session, name: str) -> int:
+        key = normalize_skill(name)
+        skill_id = self._lookup(db, key)
+        if skill_id is not None:
+            return skill_id
+        try:
+            # Savepoint, so losing a race with another worker doesn't abort the caller's transaction
+            with db.begin_nested():
+                skill = Skill(name=name.strip(), key=key)
+                db.add(skill)
+            return skill.id
+        except IntegrityError:
+            return self._lookup(db, key)
+
+    def resolve(self, db: Session, raw: Optional[str]) -> List[int]:
+        """Skill ids for a comma/semicolon separated string, deduplicated."""
+        ids: List[int] = []
+        resolved: Dict[str, int] = {}
+        for name in split_skills(raw):
+            key = normalize_skill(name)
+            skill_id = self._ids.get(key) or resolved.get(key) or self.get_or_create(db, name)
+            resolved[key] = skill_id
+            if skill_id not in ids:
+                ids.append(skill_id)
+        run_after_commit(db, lambda: self._cache(resolved))
+        return ids
+
+
+skill_resolver = SkillResolver()
+invalidations.on_resync(skill_resolver.clear)
+
+
+class SkillMatcher:
+    """
+    Candidate skills as bitsets for coverage queries. Every candidate gets a slot; each
+    skill's posting list is an int bitset over slots. "Candidates with at least m of the
+    job's k skills" adds the k postings with a bit-sliced counter (one int per counter
+    bit, carry-save addition), then compares every counter against m at once, so the
+    cost is O(k log k) big-int operations regardless of how many candidates match.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.slot_of: Dict[int, int] = {}
+        self.user_ids: List[int] = []
+        self.postings: Dict[int, int] = {}
+        self.candidate_skills: Dict[int, frozenset] = {}
+        self.job_skills: Dict[int, frozenset] = {}
+        self.all_bits = 0
+
+    def set_candidate(self, user_id: int, skill_ids: Iterable[int]):
+        skill_ids = frozenset(skill_ids)
+        with self._lock:
+            slot = self.slot_of.get(user_id)
+            if slot is None:
+                slot = len(self.user_ids)
+                self.user_ids.append(user_id)
+                self.slot_of[user_id] = slot
+                self.all_bits |= 1 << slot
+            bit = 1 << slot
+            previous = self.candidate_skills.get(user_id, frozenset())
+            for skill_id in previous - skill_ids:
+                self.postings[skill_id] &= ~bit
+            for skill_id in skill_ids - previous:
+                self.postings[skill_id] = self.postings.get(skill_id, 0) | bit
+            self.candidate_skills[user_id] = skill_ids
+
+    def set_job(self, job_id: int, skill_ids: Iterable[int]):
+        with self._lock:
+            self.job_skills[job_id] = frozenset(skill_ids)
+
+    def load(self, db: Session):
+        fresh = SkillMatcher()
+        by_user: Dict[int, Set[int]] = {}
+        rows = (
+            db.query(CandidateSkill.user_id, CandidateSkill.skill_id)
+            .join(User, User.id == CandidateSkill.user_id)
+            .filter(User.role == UserRole.CANDIDATE, User.is_active == True)
+            .yield_per(10000)
+        )
+        for user_id, skill_id in rows:
+            by_user.setdefault(user_id, set()).add(skill_id)
+
+        slots: Dict[int, List[int]] = {}
+        for slot, (user_id, skill_ids) in enumerate(by_user.items()):
+            fresh.user_ids.append(user_id)
+            fresh.slot_of[user_id] = slot
+            fresh.candidate_skills[user_id] = frozenset(skill_ids)
+            for skill_id in skill_ids:
+                slots.setdefault(skill_id, []).append(slot)
+        fresh.postings = {skill_id: slots_to_bits(s) for skill_id, s in slots.items()}
+        fresh.all_bits = slots_to_bits(range(len(fresh.user_ids)))
+
+        for job_id, skill_id in db.query(JobSkill.job_id, JobSkill.skill_id).yield_per(10000):
+            fresh.job_skills[job_id] = fresh.job_skills.get(job_id, frozenset()) | {skill_id}
+
+        with self._lock:
+            self.__dict__.update({k: v for k, v in fresh.__dict__.items() if k != "_lock"})
+
+    def user_ids_to_bits(self, user_ids: Iterable[int]) -> int:
+        return slots_to_bits(self.slot_of[u] for u in user_ids if u in self.slot_of)
+
+    def _at_least(self, postings: List[int], minimum: int, scope: int) -> int:
+        # counters[i] holds bit i of every candidate's match count
+        counters: List[int] = []
+        for bits in postings:
+            carry = bits & scope
+            for i in range(len(counters)):
+                if not carry:
+                    break
+                counters[i], carry = counters[i] ^ carry, counters[i] & carry
+            if carry:
+                counters.append(carry)
+
+        # Compare counts against `minimum` from the most significant bit down
+        greater, equal = 0, scope
+        for i in reversed(range(max(len(counters), minimum.bit_length()))):
+            counter = counters[i] if i < len(counters) else 0
+            if minimum >> i & 1:
+                equal &= counter
+            else:
+                greater |= equal & counter
+                equal &= ~counter
+        return greater | equal
+
+    def covering(
+        self, job_id: int, min_coverage: float, within: Optional[int] = None, limit: int = 50
+    ) -> Tuple[List[Tuple[int, int]], int]:
+        """
+        Candidates holding at least `min_coverage` of the job's skills, as (user_id, matched)
+        pairs, most matched first, plus the job's skill count.
+        """
+        with self._lock:
+            required = self.job_skills.get(job_id, frozenset())
+            if not required:
+                return [], 0
+            minimum = max(1, math.ceil(min_coverage * len(required) - 1e-9))
+            scope = self.all_bits if within is None else self.all_bits & within
+            bits = self._at_least([self.postings.get(s, 0) for s in required], minimum, scope)
+            matches = [
+                (self.user_ids[slot], len(self.candidate_skills[self.user_ids[slot]] & required))
+                for slot in bits_to_slots(bits)
+            ]
+        matches.sort(key=lambda m: -m[1])
+        return matches[:limit], len(required)
+
+
+skill_matcher = SkillMatcher()
+
+
+def seed_skills(db: Session):
+    """Insert the SEED_SKILLS names and aliases that are missing."""
+    for name, aliases in SEED_SKILLS.items():
+        skill_id = skill_resolver.get_or_create(db, name)
+        existing = {a for (a,) in db.query(SkillAlias.alias).filter(SkillAlias.skill_id == skill_id)}
+        for alias in aliases:
+            key = normalize_skill(alias)
+            if key not in existing and not db.query(SkillAlias.id).filter(SkillAlias.alias == key).first():
+                db.add(SkillAlias(alias=key, skill_id=skill_id))
+        db.flush()
+
+
+def backfill_skills(db: Session, batch_size: int = 1000):
+    """Parse every profile's and job's free-text skills into the junction tables."""
+    ids: Dict[str, int] = {}
+
+    def resolve(raw: Optional[str]) -> Set[int]:
+        skill_ids = set()
+        for name in split_skills(raw):
+            key = normalize_skill(name)
+            if key not in ids:
+                ids[key] = skill_resolver.get_or_create(db, name)
+            skill_ids.add(ids[key])
+        return skill_ids
+
+    profiles = db.query(CandidateProfile.user_id, CandidateProfile.primary_skills).filter(
+        CandidateProfile.primary_skills.isnot(None)
+    )
+    jobs = db.query(Job.id, Job.required_skills).filter(Job.required_skills.isnot(None))
+    for model, rows in ((CandidateSkill, profiles.all()), (JobSkill, jobs.all())):
+        owner = "user_id" if model is CandidateSkill else "job_id"
+        for start in range(0, len(rows), batch_size):
+            db.bulk_insert_mappings(model, [
+                {owner: owner_id, "skill_id": skill_id}
+                for owner_id, raw in rows[start:start + batch_size]
+                for skill_id in resolve(raw)
+            ])
+            db.flush()
+
+
+@invalidations.on_resync
+@on_warmup("skill_matcher")
+def load_skill_matcher():
+    db = SessionLocal()
+    try:
+        if db.query(Skill.id).first() is None:
+            # Fresh database created without migrations (AUTO_CREATE_TABLES)
+            try:
+                seed_skills(db)
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+        skill_matcher.load(db)
+    finally:
+        db.close()
+
+
+@invalidations.handler("user")
+def reload_candidate_skills(db: Session, user_id: int):
+    skill_matcher.set_candidate(user_id, [s for (s,) in db.query(CandidateSkill.skill_id).filter(CandidateSkill.user_id == user_id)])
+
+
+@invalidations.handler("job")
+def reload_job_skills(db: Session, job_id: int):
+    skill_matcher.set_job(job_id, [s for (s,) in db.query(JobSkill.skill_id).filter(JobSkill.job_id == job_id)])
+
+
+def set_candidate_skills(db: Session, user_id: int, raw: Optional[str]) -> List[int]:
+    """Replace a candidate's normalized skills; call before the caller commits."""
+    skill_ids = skill_resolver.resolve(db, raw)
+    db.query(CandidateSkill).filter(CandidateSkill.user_id == user_id).delete(synchronize_session=False)
+    db.add_all(CandidateSkill(user_id=user_id, skill_id=skill_id) for skill_id in skill_ids)
+    run_after_commit(db, lambda: skill_matcher.set_candidate(user_id, skill_ids))
+    return skill_ids
+
+
+def set_job_skills(db: Session, job: Job) -> List[int]:
+    """Replace a job's normalized skills from `job.required_skills`; call before the caller commits."""
+    if job.id is None:
+        db.flush()
+    job_id = job.id
+    skill_ids = skill_resolver.resolve(db, job.required_skills)
+    db.query(JobSkill).filter(JobSkill.job_id == job_id).delete(synchronize_session=False)
+    db.add_all(JobSkill(job_id=job_id, skill_id=skill_id) for skill_id in skill_ids)
+    run_after_commit(db, lambda: skill_matcher.set_job(job_id, skill_ids))
+    return skill_ids
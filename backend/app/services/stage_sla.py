@@ -0,0 +1,113 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.jobs import Job
+from app.models.submissions import Submission, SubmissionAlert, SubmissionStatus
+from app.services.scheduler import scheduler
+from app.services.tasks import task_queue
+
+logger = logging.getLogger(__name__)
+
+# Final stages never stall
+TERMINAL_STAGES = {SubmissionStatus.OFFER, SubmissionStatus.REJECTED}
+
+
+def invalid_stage_names(stage_sla_days: Optional[Dict[str, int]]) -> list:
+    known = {status.value for status in SubmissionStatus}
+    return [stage for stage in (stage_sla_days or {}) if stage not in known]
+
+
+def threshold_days(stage_sla_days: Optional[Dict[str, int]], status: SubmissionStatus) -> Optional[int]:
+    """Days allowed in `status` for a job, its own setting first; None means no limit."""
+    if stage_sla_days and status.value in stage_sla_days:
+        return stage_sla_days[status.value]
+    return settings.SUBMISSION_STAGE_SLA_DAYS.get(status.value)
+
+
+def utc_naive(value: datetime) -> datetime:
+    """stage_entered_at comes back timezone-aware from Postgres and naive (UTC) from SQLite."""
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+def clear_alert(db: Session, submission_id: int):
+    """Drop a submission's alert when it changes stage, rather than at the next scan."""
+    db.query(SubmissionAlert).filter(SubmissionAlert.submission_id == submission_id).delete(synchronize_session=False)
+
+
+@task_queue.task("scan_stalled_submissions")
+def scan_stalled_submissions(db: Session, payload: dict):
+    """
+    Rebuild submission_alerts. For each stage, the smallest threshold of any active job
+    gives a cutoff; submissions in that stage entered before it are read off the
+    (status, stage_entered_at) index in keyset batches of `batch_size`, checked against
+    their own job's threshold and upserted. Alerts the scan didn't see are deleted.
+    """
+    batch_size = payload.get("batch_size", 1000)
+    started = datetime.utcnow()
+
+    overrides = [
+        stage_sla_days for (stage_sla_days,) in
+        db.query(Job.stage_sla_days).filter(Job.is_active == True, Job.stage_sla_days.isnot(None))
+    ]
+    found = 0
+    for status in SubmissionStatus:
+        if status in TERMINAL_STAGES:
+            continue
+        limits = [threshold_days(None, status)] + [threshold_days(o, status) for o in overrides]
+        limits = [days for days in limits if days is not None]
+        if not limits:
+            continue
+        cutoff = started - timedelta(days=min(limits))
+
+        last: Optional[tuple] = None
+        while True:
+            query = (
+                db.query(
+                    Submission.id, Submission.candidate_id, Submission.job_id,
+                    Submission.stage_entered_at, Job.stage_sla_days,
+                )
+                .join(Job, Job.id == Submission.job_id)
+                .filter(Submission.status == status, Submission.stage_entered_at < cutoff, Job.is_active == True)
+            )
+            if last is not None:
+                query = query.filter(or_(
+                    Submission.stage_entered_at > last[0],
+                    and_(Submission.stage_entered_at == last[0], Submission.id > last[1]),
+                ))
+            rows = query.order_by(Submission.stage_entered_at, Submission.id).limit(batch_size).all()
+            if not rows:
+                break
+            last = (rows[-1].stage_entered_at, rows[-1].id)
+
+            alerts = {}
+            for row in rows:
+                days = threshold_days(row.stage_sla_days, status)
+                if days is not None and utc_naive(row.stage_entered_at) < started - timedelta(days=days):
+                    alerts[row.id] = {
+                        "submission_id": row.id, "candidate_id": row.candidate_id, "job_id": row.job_id,
+                        "status": status, "stage_entered_at": row.stage_entered_at,
+                        "threshold_days": days, "last_seen_at": started,
+                    }
+            if alerts:
+                existing = {
+                    submission_id for (submission_id,) in
+                    db.query(SubmissionAlert.submission_id).filter(SubmissionAlert.submission_id.in_(alerts))
+                }
+                db.bulk_update_mappings(SubmissionAlert, [alerts[i] for i in existing])
+                db.bulk_insert_mappings(SubmissionAlert, [
+                    {**alert, "first_seen_at": started} for i, alert in alerts.items() if i not in existing
+                ])
+            db.commit()
+            found += len(alerts)
+
+    cleared = db.query(SubmissionAlert).filter(SubmissionAlert.last_seen_at < started).delete(synchronize_session=False)
+    db.commit()
+    logger.info(f"Stalled submission scan finished: {found} need attention, {cleared} cleared")
+
+
+scheduler.every(settings.STALLED_SUBMISSION_SCAN_SECONDS, "scan_stalled_submissions")
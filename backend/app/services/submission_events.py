@@ -0,0 +1,39 @@
+from typing import Optional
+from sqlalchemy.orm import Session
+
+from app.core.pubsub import broker, SUBMISSION_EVENTS
+from app.db.session import SessionLocal, run_after_commit
+from app.models.submissions import Submission
+from app.models.users import UserRole
+from app.services.assignments import assignment_index
+
+
+def publish_stage_change(db: Session, submission: Submission, notes: Optional[str] = None):
+    """Announce a stage change to SSE subscribers once the current transaction commits."""
+    data = {
+        "submission_id": submission.id,
+        "candidate_id": submission.candidate_id,
+        "job_id": submission.job_id,
+        "job_creator_id": submission.job.creator_id if submission.job else None,
+        "manager_id": assignment_index.manager_of(db, submission.candidate_id),
+        "current_status": submission.current_status,
+        "notes": notes or "",
+    }
+    run_after_commit(db, lambda: broker.publish(SUBMISSION_EVENTS, data))
+
+
+def can_see(user_id: int, role: UserRole, data: dict) -> bool:
+    """Runs in a worker thread per event; the stream itself holds no session."""
+    if role == UserRole.ADMIN:
+        return True
+    if role == UserRole.HIRING_MANAGER:
+        if user_id == data["job_creator_id"]:
+            return True
+        # Current assignment rather than the one at publish time, so reassignments apply to replayed events.
+        # The session only checks out a connection if the index can't answer.
+        db = SessionLocal()
+        try:
+            return assignment_index.is_assigned(db, user_id, data["candidate_id"])
+        finally:
+            db.close()
+    return data["candidate_id"] == user_id
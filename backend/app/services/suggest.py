@@ -0,0 +1,222 @@
+import bisect
+import heapq
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.invalidation import invalidations
+from app.core.startup import on_warmup
+from app.db.session import SessionLocal, run_after_commit
+from app.models.jobs import Job
+from app.models.skills import Skill, CandidateSkill, JobSkill
+from app.models.users import User, UserRole, CandidateProfile
+
+JOB_FIELDS = ("title", "location", "department", "company_name")
+CANDIDATE_FIELDS = ("current_city",)
+# Canonical skill names, from both jobs and candidates
+SKILL_FIELD = "skill"
+FIELDS = JOB_FIELDS + CANDIDATE_FIELDS + (SKILL_FIELD,)
+
+# Prefixes matching more keys than this have their top results memoized until one of them changes
+MEMO_MIN_MATCHES = 256
+
+Owner = Tuple[str, int]
+
+
+def normalize(value: str) -> str:
+    """"  New   York " and "new york" share a key."""
+    return re.sub(r"\s+", " ", value).strip().casefold()
+
+
+class _FieldIndex:
+    """Distinct values of one field as a sorted array of keys, each with a count and a display label."""
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self.counts: Dict[str, int] = {}
+        self.labels: Dict[str, str] = {}
+        self.memo: Dict[str, List[Tuple[str, int]]] = {}
+
+    def _forget(self, key: str):
+        for end in range(len(key) + 1):
+            self.memo.pop(key[:end], None)
+
+    def add(self, key: str, label: str):
+        count = self.counts.get(key, 0)
+        if count == 0:
+            bisect.insort(self.keys, key)
+            self.labels[key] = label
+        self.counts[key] = count + 1
+        self._forget(key)
+
+    def discard(self, key: str):
+        count = self.counts.get(key, 0)
+        if count <= 1:
+            if count:
+                del self.keys[bisect.bisect_left(self.keys, key)]
+                del self.counts[key], self.labels[key]
+        else:
+            self.counts[key] = count - 1
+        self._forget(key)
+
+    def top(self, prefix: str, limit: int) -> List[Tuple[str, int]]:
+        cached = self.memo.get(prefix)
+        if cached is not None and len(cached) >= limit:
+            return cached[:limit]
+        start = bisect.bisect_left(self.keys, prefix)
+        # Every key starting with `prefix` sorts before prefix + the highest code point
+        end = bisect.bisect_left(self.keys, prefix + "\U0010ffff", start)
+        best = heapq.nlargest(limit, self.keys[start:end], key=self.counts.__getitem__)
+        result = [(self.labels[key], self.counts[key]) for key in best]
+        if end - start > MEMO_MIN_MATCHES:
+            self.memo[prefix] = result
+        return result
+
+
+class SuggestIndex:
+    """
+    Typeahead over the free-text values of active jobs and candidate profiles: for a
+    prefix, the most frequent distinct values of a field starting with it. Each field is
+    a sorted key array searched with bisect; the values each job or candidate contributed
+    are kept so a write only adjusts the counts of what changed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.fields: Dict[str, _FieldIndex] = {field: _FieldIndex() for field in FIELDS}
+        self._owned: Dict[Owner, Dict[str, Tuple[str, ...]]] = {}
+
+    def set_values(self, owner: Owner, values: Dict[str, Iterable[Optional[str]]]):
+        """Replace `owner`'s values of the given fields; fields not given are left alone."""
+        with self._lock:
+            owned = self._owned.setdefault(owner, {})
+            for field, new in values.items():
+                index = self.fields[field]
+                new = tuple(dict.fromkeys(v.strip() for v in new if v and v.strip()))
+                for value in owned.get(field, ()):
+                    index.discard(normalize(value))
+                for value in new:
+                    index.add(normalize(value), value)
+                owned[field] = new
+
+    def remove(self, owner: Owner):
+        with self._lock:
+            for field, values in self._owned.pop(owner, {}).items():
+                for value in values:
+                    self.fields[field].discard(normalize(value))
+
+    def suggest(self, field: str, prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+        with self._lock:
+            return self.fields[field].top(normalize(prefix), limit)
+
+    def load(self, db: Session):
+        """
+        Rebuild from the database. Each field's keys are sorted once, and the label of a
+        key is its most common spelling.
+        """
+        owned: Dict[Owner, Dict[str, Tuple[str, ...]]] = {}
+        skill_names = dict(db.query(Skill.id, Skill.name))
+
+        columns = [getattr(Job, field) for field in JOB_FIELDS]
+        for row in db.query(Job.id, *columns).filter(Job.is_active == True).yield_per(1000):
+            owned[("job", row.id)] = {field: (getattr(row, field),) for field in JOB_FIELDS}
+        active_jobs = {owner[1] for owner in owned}
+        for job_id, skill_id in db.query(JobSkill.job_id, JobSkill.skill_id).yield_per(10000):
+            if job_id in active_jobs:
+                values = owned[("job", job_id)]
+                values[SKILL_FIELD] = values.get(SKILL_FIELD, ()) + (skill_names[skill_id],)
+
+        profiles = (
+            db.query(CandidateProfile.user_id, CandidateProfile.current_city)
+            .join(User, User.id == CandidateProfile.user_id)
+            .filter(User.role == UserRole.CANDIDATE, User.is_active == True)
+        )
+        for user_id, current_city in profiles.yield_per(5000):
+            owned[("user", user_id)] = {"current_city": (current_city,)}
+        for user_id, skill_id in db.query(CandidateSkill.user_id, CandidateSkill.skill_id).yield_per(10000):
+            values = owned.get(("user", user_id))
+            if values is not None:
+                values[SKILL_FIELD] = values.get(SKILL_FIELD, ()) + (skill_names[skill_id],)
+
+        spellings: Dict[str, Dict[str, Counter]] = {field: {} for field in FIELDS}
+        for owner, values in owned.items():
+            for field, field_values in values.items():
+                cleaned = tuple(dict.fromkeys(v.strip() for v in field_values if v and v.strip()))
+                values[field] = cleaned
+                for value in cleaned:
+                    spellings[field].setdefault(normalize(value), Counter())[value] += 1
+
+        fields = {}
+        for field, by_key in spellings.items():
+            index = fields[field] = _FieldIndex()
+            index.keys = sorted(by_key)
+            index.counts = {key: sum(counter.values()) for key, counter in by_key.items()}
+            index.labels = {key: counter.most_common(1)[0][0] for key, counter in by_key.items()}
+
+        with self._lock:
+            self.fields, self._owned = fields, owned
+
+
+suggest_index = SuggestIndex()
+
+
+@invalidations.on_resync
+@on_warmup("suggest_index")
+def load_suggest_index():
+    db = SessionLocal()
+    try:
+        suggest_index.load(db)
+    finally:
+        db.close()
+
+
+def _skill_names(db: Session, skill_ids: Iterable[int]) -> List[str]:
+    skill_ids = list(skill_ids)
+    if not skill_ids:
+        return []
+    return [name for (name,) in db.query(Skill.name).filter(Skill.id.in_(skill_ids))]
+
+
+def track_job_suggestions(db: Session, job: Job, skill_ids: Optional[List[int]] = None):
+    """Update `job`'s suggested values once the caller commits; `skill_ids=None` keeps its skills."""
+    owner = ("job", job.id)
+    if job.is_active is False:
+        run_after_commit(db, lambda: suggest_index.remove(owner))
+        return
+    values = {field: (getattr(job, field),) for field in JOB_FIELDS}
+    if skill_ids is not None:
+        values[SKILL_FIELD] = _skill_names(db, skill_ids)
+    run_after_commit(db, lambda: suggest_index.set_values(owner, values))
+
+
+def track_candidate_suggestions(db: Session, user_id: int, profile: CandidateProfile, skill_ids: Optional[List[int]] = None):
+    """Update a candidate's suggested values once the caller commits; `skill_ids=None` keeps their skills."""
+    values = {"current_city": (profile.current_city,)}
+    if skill_ids is not None:
+        values[SKILL_FIELD] = _skill_names(db, skill_ids)
+    run_after_commit(db, lambda: suggest_index.set_values(("user", user_id), values))
+
+
+@invalidations.handler("job")
+def reload_job_suggestions(db: Session, job_id: int):
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if job is None or not job.is_active:
+        suggest_index.remove(("job", job_id))
+        return
+    skill_ids = [s for (s,) in db.query(JobSkill.skill_id).filter(JobSkill.job_id == job_id)]
+    values = {field: (getattr(job, field),) for field in JOB_FIELDS}
+    values[SKILL_FIELD] = _skill_names(db, skill_ids)
+    suggest_index.set_values(("job", job_id), values)
+
+
+@invalidations.handler("user")
+def reload_candidate_suggestions(db: Session, user_id: int):
+    profile = db.query(CandidateProfile).filter(CandidateProfile.user_id == user_id).first()
+    if profile is None:
+        suggest_index.remove(("user", user_id))
+        return
+    skill_ids = [s for (s,) in db.query(CandidateSkill.skill_id).filter(CandidateSkill.user_id == user_id)]
+    suggest_index.set_values(("user", user_id), {"current_city": (profile.current_city,), SKILL_FIELD: _skill_names(db, skill_ids)})
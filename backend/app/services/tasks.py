@@ -0,0 +1,180 @@
+import logging
+import random
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from sqlalchemy import and_, or_, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.tasks import Task, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+
+class RetryLater(Exception):
+    """Raised by a handler when its input isn't ready yet; the task is retried with backoff."""
+
+
+class LeaseHeartbeat:
+    """
+    Extends a running task's lease every third of TASK_VISIBILITY_TIMEOUT while its handler
+    runs, so long handlers aren't claimed again by another worker. The lease is only
+    extended while it is still this attempt's.
+    """
+
+    def __init__(self, task_id: int, attempt: int):
+        self.task_id = task_id
+        self.attempt = attempt
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"lease-{task_id}", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stopping.set()
+        self._thread.join()
+
+    def extend(self) -> bool:
+        db = SessionLocal()
+        try:
+            result = db.execute(
+                update(Task)
+                .where(Task.id == self.task_id, Task.attempts == self.attempt, Task.status == TaskStatus.RUNNING)
+                .values(locked_until=datetime.utcnow() + timedelta(seconds=settings.TASK_VISIBILITY_TIMEOUT))
+            )
+            db.commit()
+            return result.rowcount == 1
+        finally:
+            db.close()
+
+    def _run(self):
+        while not self._stopping.wait(settings.TASK_VISIBILITY_TIMEOUT / 3):
+            try:
+                if not self.extend():
+                    logger.warning(f"Task {self.task_id} lost its lease")
+                    return
+            except Exception as e:
+                logger.error(f"Extending the lease of task {self.task_id} failed: {e}")
+
+
+class TaskQueue:
+    """
+    Durable queue on the `tasks` table. Handlers run in `worker.py`, never in the API process.
+
+    Tasks are enqueued inside the caller's transaction, so they become visible to the
+    worker only once that transaction commits. Workers claim rows with
+    SELECT ... FOR UPDATE SKIP LOCKED and lease them for TASK_VISIBILITY_TIMEOUT seconds,
+    renewed by a heartbeat while the handler runs. A lease that expires (worker crashed)
+    makes the task claimable again, unless that was its last attempt: then it fails.
+    """
+
+    def __init__(self):
+        self.handlers: Dict[str, Callable[[Session, dict], None]] = {}
+
+    def task(self, name: str):
+        def decorator(func: Callable[[Session, dict], None]):
+            self.handlers[name] = func
+            return func
+        return decorator
+
+    def enqueue(self, db: Session, name: str, payload: dict, delay_seconds: float = 0) -> Task:
+        task = Task(
+            name=name,
+            payload=payload,
+            status=TaskStatus.QUEUED,
+            max_attempts=settings.TASK_MAX_ATTEMPTS,
+            run_at=datetime.utcnow() + timedelta(seconds=delay_seconds),
+        )
+        db.add(task)
+        return task
+
+    def claim(self, db: Session, batch_size: int) -> List[Task]:
+        now = datetime.utcnow()
+        tasks = (
+            db.query(Task)
+            .filter(or_(
+                and_(Task.status == TaskStatus.QUEUED, Task.run_at <= now),
+                and_(Task.status == TaskStatus.RUNNING, Task.locked_until < now),
+            ))
+            .order_by(Task.run_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        claimed = []
+        for task in tasks:
+            if task.status == TaskStatus.RUNNING and task.attempts >= task.max_attempts:
+                task.status = TaskStatus.FAILED
+                task.finished_at = now
+                task.locked_until = None
+                task.last_error = f"Lease expired during the last attempt ({task.attempts}/{task.max_attempts})"
+                logger.error(f"Task {task.id} ({task.name}) failed permanently: {task.last_error}")
+                continue
+            task.status = TaskStatus.RUNNING
+            task.attempts += 1
+            task.locked_until = now + timedelta(seconds=settings.TASK_VISIBILITY_TIMEOUT)
+            claimed.append(task)
+        db.commit()
+        return claimed
+
+    def retry_delay(self, attempts: int) -> float:
+        """Exponential backoff with jitter, capped at TASK_RETRY_MAX_SECONDS."""
+        delay = min(settings.TASK_RETRY_BASE_SECONDS * 2 ** (attempts - 1), settings.TASK_RETRY_MAX_SECONDS)
+        return delay * random.uniform(0.8, 1.2)
+
+    def execute(self, task_id: int):
+        db = SessionLocal()
+        try:
+            task = db.query(Task).filter(Task.id == task_id).first()
+            handler = self.handlers.get(task.name)
+            try:
+                if handler is None:
+                    raise LookupError(f"No handler registered for task '{task.name}'")
+                with LeaseHeartbeat(task.id, task.attempts):
+                    handler(db, task.payload or {})
+                task.status = TaskStatus.DONE
+                task.finished_at = datetime.utcnow()
+                task.last_error = None
+            except Exception as e:
+                db.rollback()
+                task = db.query(Task).filter(Task.id == task_id).first()
+                task.last_error = traceback.format_exc() if not isinstance(e, RetryLater) else str(e)
+                if task.attempts >= task.max_attempts:
+                    task.status = TaskStatus.FAILED
+                    task.finished_at = datetime.utcnow()
+                    logger.error(f"Task {task.id} ({task.name}) failed permanently: {e}")
+                else:
+                    task.status = TaskStatus.QUEUED
+                    task.run_at = datetime.utcnow() + timedelta(seconds=self.retry_delay(task.attempts))
+                    logger.warning(f"Task {task.id} ({task.name}) failed, retrying at {task.run_at}: {e}")
+            task.locked_until = None
+            db.commit()
+        finally:
+            db.close()
+
+    def run_once(self, batch_size: int = 10) -> int:
+        db = SessionLocal()
+        try:
+            task_ids = [task.id for task in self.claim(db, batch_size)]
+        finally:
+            db.close()
+
+        for task_id in task_ids:
+            self.execute(task_id)
+        return len(task_ids)
+
+    def run_worker(self, should_stop: Callable[[], bool] = lambda: False):
+        logger.info(f"Task worker started with handlers: {', '.join(sorted(self.handlers))}")
+        while not should_stop():
+            if self.run_once() == 0:
+                time.sleep(settings.TASK_POLL_INTERVAL)
+
+
+task_queue = TaskQueue()
@@ -0,0 +1,109 @@
+import os
+import tempfile
+
+# Configure before anything imports app.core.config
+_tmp = tempfile.mkdtemp(prefix="talentra-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/test.db"
+os.environ["AUTO_CREATE_TABLES"] = "true"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["PUBSUB_BACKEND"] = "local"
+os.environ.setdefault("SECRET_KEY", "test-secret")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.invalidation import invalidations
+from app.core.security import create_access_token, get_password_hash
+from app.db import session as db_session
+from app.db.base import Base
+from app.db.session import SessionLocal, engine
+from app.main import app
+from app.models.jobs import Job
+from app.models.submissions import Submission
+from app.models.users import User, UserRole, CandidateProfile
+from app.services.skills import seed_skills
+
+# Hashing is slow on purpose; one hash serves every test user
+PASSWORD = "password"
+PASSWORD_HASH = get_password_hash(PASSWORD)
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(autouse=True)
+def clean_database(client):
+    """Every test starts from empty tables (plus the seeded skills) and freshly loaded caches."""
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+    db = SessionLocal()
+    try:
+        seed_skills(db)
+        db.commit()
+    finally:
+        db.close()
+    invalidations.resync()
+    # Ids restart with the tables, so earlier tests' writes mustn't count as this user's
+    db_session._last_write_at.clear()
+    yield
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def make_user(db):
+    def make(email: str, role: UserRole = UserRole.CANDIDATE, **profile) -> User:
+        user = User(
+            email=email, hashed_password=PASSWORD_HASH, first_name=email.split("@")[0], last_name="Test", role=role,
+        )
+        if role == UserRole.CANDIDATE:
+            user.profile = CandidateProfile(**profile)
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        invalidations.resync()
+        return user
+    return make
+
+
+@pytest.fixture
+def make_job(db):
+    def make(creator: User, **fields) -> Job:
+        job = Job(**{"title": "Engineer", "company_name": "Acme", "description": "", **fields}, creator_id=creator.id)
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        invalidations.resync()
+        return job
+    return make
+
+
+@pytest.fixture
+def make_submission(db):
+    def make(candidate: User, job: Job, **fields) -> Submission:
+        submission = Submission(**{"timeline_history": [], **fields}, candidate_id=candidate.id, job_id=job.id)
+        db.add(submission)
+        db.commit()
+        db.refresh(submission)
+        return submission
+    return make
+
+
+def auth(user: User) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user.id), 'role': user.role.value})}"}
+
+
+@pytest.fixture
+def headers():
+    return auth
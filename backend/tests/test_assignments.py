@@ -0,0 +1,88 @@
+import threading
+import time
+
+import pytest
+
+from app.core.pubsub import broker
+from app.models.users import CandidateAssignment, UserRole
+from app.services.assignments import AssignmentIndex, assignment_index
+
+
+@pytest.fixture
+def people(make_user):
+    manager = make_user("manager@example.com", role=UserRole.HIRING_MANAGER)
+    other = make_user("other@example.com", role=UserRole.HIRING_MANAGER)
+    candidate = make_user("candidate@example.com")
+    return manager, other, candidate
+
+
+def _assign_elsewhere(db, candidate, manager):
+    """An assignment committed by another worker: no invalidation reaches this process."""
+    db.add(CandidateAssignment(candidate_id=candidate.id, manager_id=manager.id))
+    db.commit()
+
+
+def test_local_transport_reads_the_table(db, people):
+    manager, _, candidate = people
+    assert not broker.transport.cross_process
+    _assign_elsewhere(db, candidate, manager)
+
+    assert assignment_index.is_assigned(db, manager.id, candidate.id)
+    assert assignment_index.candidates_of(db, manager.id) == {candidate.id}
+    assert assignment_index.authorized(db, manager.id, [candidate.id, candidate.id + 100]) == [True, False]
+
+
+def test_local_lookups_use_the_callers_session(db, people):
+    manager, _, candidate = people
+    db.add(CandidateAssignment(candidate_id=candidate.id, manager_id=manager.id))
+    db.flush()
+    # Not committed yet, so only visible to this session
+    assert assignment_index.manager_of(db, candidate.id) == manager.id
+    db.rollback()
+
+
+def test_cross_process_transport_reads_the_index(db, people, monkeypatch):
+    manager, other, candidate = people
+    monkeypatch.setattr(broker.transport, "cross_process", True)
+    _assign_elsewhere(db, candidate, manager)
+    # Until that worker's invalidation arrives
+    assert assignment_index.manager_of(db, candidate.id) is None
+
+    assignment_index.refresh_manager(db, manager.id)
+    assert assignment_index.candidates_of(db, manager.id) == {candidate.id}
+
+    assignment_index.apply([(candidate.id, other.id)])
+    assert assignment_index.is_assigned(db, other.id, candidate.id)
+    assert assignment_index.candidates_of(db, manager.id) == frozenset()
+
+
+def test_expired_index_reloads_in_the_background(db, people, monkeypatch):
+    manager, _, candidate = people
+    monkeypatch.setattr(broker.transport, "cross_process", True)
+    index = AssignmentIndex(max_age=0)
+    index.load(db)
+    _assign_elsewhere(db, candidate, manager)
+
+    release = threading.Event()
+    load = index.load
+    monkeypatch.setattr(index, "load", lambda session: release.wait(5) and load(session))
+    # The caller gets the current copy while the reload is still running
+    assert index.manager_of(db, candidate.id) is None
+    release.set()
+    for _ in range(100):
+        if index.manager_of(db, candidate.id) == manager.id:
+            break
+        time.sleep(0.01)
+    assert index.manager_of(db, candidate.id) == manager.id
+
+
+def test_assign_endpoint_scopes_the_managers_candidates(client, headers, make_user, people):
+    manager, other, candidate = people
+    admin = make_user("admin@example.com", role=UserRole.ADMIN)
+    response = client.post("/api/admin/assign", json={"manager_id": manager.id, "candidate_id": candidate.id}, headers=headers(admin))
+    assert response.status_code == 200
+    assert [u["id"] for u in client.get("/api/hiring/my-candidates", headers=headers(manager)).json()] == [candidate.id]
+
+    client.post("/api/admin/assign", json={"manager_id": other.id, "candidate_id": candidate.id}, headers=headers(admin))
+    assert client.get("/api/hiring/my-candidates", headers=headers(manager)).json() == []
+    assert [u["id"] for u in client.get("/api/hiring/my-candidates", headers=headers(other)).json()] == [candidate.id]
@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import event, text
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.users import UserRole
+from app.repositories.jobs import job_repo
+
+
+@pytest.fixture
+def candidate(make_user):
+    return make_user("candidate@example.com")
+
+
+def test_batch_runs_sub_requests_in_order(client, headers, candidate, make_user, make_job):
+    job = make_job(make_user("manager@example.com", role=UserRole.HIRING_MANAGER), title="Backend")
+    response = client.post(
+        "/api/batch",
+        json={"requests": [{"path": "/api/auth/me"}, {"id": "job", "path": f"/api/jobs/{job.id}"}, {"path": "/api/jobs/999999"}]},
+        headers=headers(candidate),
+    )
+    assert response.status_code == 200
+    results = response.json()["responses"]
+    assert [(r["id"], r["status"]) for r in results] == [("0", 200), ("job", 200), ("2", 404)]
+    assert results[0]["body"]["email"] == "candidate@example.com"
+    assert results[1]["body"]["title"] == "Backend"
+
+
+def test_batch_rejects_streams_and_oversized_batches(client, headers, candidate):
+    response = client.post("/api/batch", json={"requests": [{"path": "/api/submissions/stream"}]}, headers=headers(candidate))
+    assert response.status_code == 400
+    response = client.post("/api/batch", json={"requests": [{"path": "/api/auth/me"}] * (settings.BATCH_MAX_REQUESTS + 1)}, headers=headers(candidate))
+    assert response.status_code == 400
+
+
+def test_failing_sub_request_is_a_500_and_the_lane_goes_on(client, headers, candidate, make_user, make_job, monkeypatch):
+    job = make_job(make_user("manager@example.com", role=UserRole.HIRING_MANAGER))
+    monkeypatch.setattr(settings, "BATCH_MAX_CONCURRENCY", 1)
+
+    def broken(db, id):
+        db.execute(text("SELECT 1"))
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(job_repo, "get_by_id", broken)
+    rollbacks = []
+    listener = lambda session: rollbacks.append(session)
+    event.listen(SessionLocal, "after_rollback", listener)
+    try:
+        response = client.post(
+            "/api/batch",
+            json={"requests": [{"path": f"/api/jobs/{job.id}"}, {"path": "/api/auth/me"}]},
+            headers=headers(candidate),
+        )
+    finally:
+        event.remove(SessionLocal, "after_rollback", listener)
+    assert response.status_code == 200
+    assert [r["status"] for r in response.json()["responses"]] == [500, 200]
+    assert rollbacks
@@ -0,0 +1,73 @@
+from collections import Counter
+
+import pytest
+
+from app.models.users import CandidateAssignment, UserRole
+from app.services.assignments import balance_assignments, upsert_assignments
+
+
+@pytest.fixture
+def admin(make_user):
+    return make_user("admin@example.com", role=UserRole.ADMIN)
+
+
+def test_balance_fills_the_lightest_managers_first(db, make_user):
+    busy = make_user("busy@example.com", role=UserRole.HIRING_MANAGER)
+    idle = make_user("idle@example.com", role=UserRole.HIRING_MANAGER)
+    assigned = make_user("assigned@example.com")
+    db.add(CandidateAssignment(candidate_id=assigned.id, manager_id=busy.id))
+    db.commit()
+    candidates = [make_user(f"c{i}@example.com") for i in range(5)]
+
+    pairs = balance_assignments(db)
+    assert {c for c, _ in pairs} == {c.id for c in candidates}
+    # Loads end up 3 and 3
+    assert Counter(m for _, m in pairs) == {idle.id: 3, busy.id: 2}
+
+
+def test_balance_prefers_skill_overlap_within_the_slack(client, db, make_user, headers):
+    python = make_user("python@example.com", role=UserRole.HIRING_MANAGER)
+    design = make_user("design@example.com", role=UserRole.HIRING_MANAGER)
+    client.post("/api/jobs/", json={"title": "Backend", "company_name": "Acme", "description": "", "required_skills": "Python"}, headers=headers(python))
+    client.post("/api/jobs/", json={"title": "Design", "company_name": "Acme", "description": "", "required_skills": "Figma"}, headers=headers(design))
+    candidates = [make_user(f"c{i}@example.com") for i in range(2)]
+    for candidate in candidates:
+        client.put("/api/candidates/profile", json={"primary_skills": "Python"}, headers=headers(candidate))
+
+    assert Counter(m for _, m in balance_assignments(db, match_skills=True)) == {python.id: 1, design.id: 1}
+    assert balance_assignments(db, match_skills=True, load_slack=1) == [(c.id, python.id) for c in candidates]
+
+
+def test_upsert_replaces_current_assignments(db, make_user):
+    first = make_user("first@example.com", role=UserRole.HIRING_MANAGER)
+    second = make_user("second@example.com", role=UserRole.HIRING_MANAGER)
+    candidate = make_user("candidate@example.com")
+    upsert_assignments(db, [(candidate.id, first.id)])
+    db.commit()
+    upsert_assignments(db, [(candidate.id, second.id)])
+    db.commit()
+    assert [(a.candidate_id, a.manager_id) for a in db.query(CandidateAssignment)] == [(candidate.id, second.id)]
+
+
+def test_bulk_endpoint(client, headers, admin, make_user):
+    manager = make_user("manager@example.com", role=UserRole.HIRING_MANAGER)
+    candidates = [make_user(f"c{i}@example.com") for i in range(3)]
+
+    response = client.post(
+        "/api/admin/assign/bulk",
+        json={"assignments": [{"candidate_id": candidates[0].id, "manager_id": manager.id}]},
+        headers=headers(admin),
+    )
+    assert response.json()["assigned"] == 1
+
+    response = client.post("/api/admin/assign/bulk", json={"auto_balance": True}, headers=headers(admin))
+    assert response.json()["assigned"] == 2
+    mine = client.get("/api/hiring/my-candidates", headers=headers(manager)).json()
+    assert sorted(u["id"] for u in mine) == [c.id for c in candidates]
+
+    response = client.post(
+        "/api/admin/assign/bulk",
+        json={"assignments": [{"candidate_id": candidates[0].id, "manager_id": candidates[1].id}]},
+        headers=headers(admin),
+    )
+    assert response.status_code == 404
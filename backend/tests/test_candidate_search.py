@@ -0,0 +1,66 @@
+from app.models.users import UserRole
+from app.services.candidate_index import CandidateIndex, bits_to_slots, slots_to_bits
+
+
+def _index(*profiles) -> CandidateIndex:
+    index = CandidateIndex()
+    for user_id, skills in enumerate(profiles, start=1):
+        index.upsert(user_id, primary_skills=skills)
+    return index
+
+
+def test_bitset_round_trip():
+    slots = [0, 7, 8, 63, 64, 1000]
+    bits = slots_to_bits(slots)
+    assert bits_to_slots(bits) == slots
+    assert bits_to_slots(bits, skip=2, limit=2) == [8, 63]
+    assert bits_to_slots(0) == []
+
+
+def test_short_terms_match_whole_skills_or_words_only():
+    index = _index("Python, Django", "Go, Docker", "JavaScript, MongoDB", "Java, Spring", "React Native")
+    assert index.matching_skills("go") == {"go"}
+    assert index.matching_skills("java") == {"java"}
+    assert index.matching_skills("react") == {"react native"}
+    assert index.matching_skills("rust") == set()
+
+
+def test_longer_terms_tolerate_typos():
+    index = _index("Python, Django", "Kubernetes")
+    assert index.matching_skills("pythn") == {"python"}
+    assert index.matching_skills("kubernets") == {"kubernetes"}
+
+
+def test_search_filters_facets_and_skill_terms():
+    index = CandidateIndex()
+    index.upsert(1, current_city="Austin", experience_level="SENIOR", primary_skills="Python, Django")
+    index.upsert(2, current_city="Austin", experience_level="JUNIOR", primary_skills="Go, Docker")
+    index.upsert(3, current_city="Boston", experience_level="SENIOR", primary_skills="Python")
+
+    user_ids, total, facets = index.search({"current_city": ["austin"]}, ["python"])
+    assert (user_ids, total) == ([1], 1)
+    # A field's own filter doesn't narrow its facet counts
+    assert {f["value"]: f["count"] for f in facets["current_city"]} == {"Austin": 1, "Boston": 1}
+
+    assert index.search({}, ["go"])[0] == [2]
+
+    index.remove(2)
+    assert index.search({}, ["go"])[1] == 0
+    index.upsert(4, current_city="Denver", primary_skills="Go")
+    assert index.search({}, ["go"])[0] == [4]
+
+
+def test_search_endpoint(client, make_user, headers):
+    admin = make_user("admin@example.com", role=UserRole.ADMIN)
+    make_user("py@example.com", current_city="Austin", primary_skills="Python, Django")
+    go = make_user("go@example.com", current_city="Austin", primary_skills="Go")
+
+    response = client.get("/api/candidates/search", params={"skills": "go"}, headers=headers(admin))
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 1
+    assert [item["id"] for item in body["items"]] == [go.id]
+
+    manager = make_user("manager@example.com", role=UserRole.HIRING_MANAGER)
+    response = client.get("/api/candidates/search", headers=headers(manager))
+    assert response.json()["total"] == 0
@@ -0,0 +1,76 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core import compression
+from app.core.compression import CompressedBody, CompressionMiddleware, negotiate
+from app.models.users import UserRole
+
+
+@pytest.fixture
+def gzip_only(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+
+
+def test_negotiate(gzip_only):
+    assert negotiate("gzip, deflate") == "gzip"
+    assert negotiate("deflate;q=1, gzip;q=0.5") == "gzip"
+    assert negotiate("gzip;q=0") is None
+    assert negotiate("*") == "gzip"
+    assert negotiate("br") is None
+    assert negotiate(None) is None
+
+
+@pytest.fixture
+def small_app():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/big")
+    def big():
+        return {"items": ["x" * 100] * 50}
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"a" * 2000, b"b" * 2000]), media_type="text/plain")
+
+    return TestClient(app)
+
+
+def test_middleware_compresses_large_bodies_only(gzip_only, small_app):
+    response = small_app.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.json() == {"items": ["x" * 100] * 50}
+
+    assert "content-encoding" not in small_app.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in small_app.get("/big", headers={"Accept-Encoding": "identity"}).headers
+    assert "content-encoding" not in small_app.get("/stream", headers={"Accept-Encoding": "gzip"}).headers
+
+
+def test_cached_body_compresses_once(gzip_only, monkeypatch):
+    calls = []
+    real_compress = compression.compress
+    monkeypatch.setattr(compression, "compress", lambda body, encoding: calls.append(encoding) or real_compress(body, encoding))
+    body = CompressedBody(b"[" + b'"job",' * 500 + b'"job"]')
+    for _ in range(3):
+        response = body.response("gzip")
+        assert gzip.decompress(response.body) == body.body
+    assert calls == ["gzip"]
+    assert body.response(None).body == body.body
+
+
+def test_job_board_serves_precompressed_pages(gzip_only, client, make_user, make_job):
+    manager = make_user("manager@example.com", role=UserRole.HIRING_MANAGER)
+    for i in range(10):
+        make_job(manager, title=f"Job {i}", description="Long description. " * 20)
+    response = client.get("/api/jobs/", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()) == 10
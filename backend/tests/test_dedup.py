@@ -0,0 +1,62 @@
+from app.core.config import settings
+from app.models.dedup import CandidateSignature
+from app.models.resumes import Resume
+from app.models.users import UserRole
+from app.services.dedup import compute_signature, dedup_candidate, find_duplicates, similarity
+from app.services.tasks import task_queue
+
+RESUME = """
+Senior backend engineer with eight years of experience building payment systems in Python
+and Go. Led the migration of a monolith to services on Kubernetes, designed the ledger
+schema in PostgreSQL and mentored four engineers. Previously worked on search ranking.
+"""
+OTHER = """
+Product designer focused on onboarding flows and design systems. Ran usability studies,
+built the component library in Figma and partnered with marketing on the brand refresh.
+"""
+
+
+def test_similar_documents_have_similar_signatures():
+    original = compute_signature((RESUME, "Ana", "Lopez", "+1 (555) 010-2030"))
+    edited = compute_signature((RESUME.replace("four", "five"), "Lopez", "Ana", "555 010 2030"))
+    unrelated = compute_signature((OTHER, "Sam", "Reed", None))
+    assert similarity(original, edited) > 0.8
+    assert similarity(original, unrelated) < 0.2
+    assert compute_signature(("", None, None, None)) is None
+
+
+def test_duplicates_are_grouped(db, make_user, headers, client):
+    people = [
+        make_user("ana@example.com", phone="555-010-2030"),
+        make_user("ana.lopez@example.com", phone="5550102030"),
+        make_user("sam@example.com"),
+    ]
+    for user, text in zip(people, (RESUME, RESUME + " Speaks Spanish.", OTHER)):
+        user.first_name, user.last_name = ("Sam", "Reed") if text is OTHER else ("Ana", "Lopez")
+        db.add(Resume(user_id=user.id, file_name="cv.pdf", file_url="cv.pdf", parsed_text=text))
+    db.commit()
+    for user in people:
+        dedup_candidate(db, {"user_id": user.id})
+    db.commit()
+
+    groups = find_duplicates(db, 0.7)
+    assert [members for members, _ in groups] == [sorted([people[0].id, people[1].id])]
+    assert find_duplicates(db, 0.7, user_id=people[2].id) == []
+
+    admin = make_user("admin@example.com", role=UserRole.ADMIN)
+    response = client.get("/api/admin/duplicates", headers=headers(admin))
+    assert response.status_code == 200
+    assert [[c["id"] for c in group["candidates"]] for group in response.json()] == [[people[0].id, people[1].id]]
+
+
+def test_scan_recomputes_every_signature(db, make_user, monkeypatch):
+    monkeypatch.setattr(settings, "DEDUP_SCAN_PROCESSES", 1)
+    users = [make_user(f"c{i}@example.com") for i in range(3)]
+    db.add(Resume(user_id=users[0].id, file_name="cv.pdf", file_url="cv.pdf", parsed_text=RESUME))
+    db.commit()
+
+    task_queue.enqueue(db, "dedup_scan", {"batch_size": 2})
+    db.commit()
+    assert task_queue.run_once() == 1
+    db.expire_all()
+    assert {row.user_id for row in db.query(CandidateSignature)} == {u.id for u in users}
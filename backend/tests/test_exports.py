@@ -0,0 +1,70 @@
+import csv
+import io
+import zipfile
+
+import pytest
+
+from app.models.users import CandidateAssignment, UserRole
+from app.services.exports import EXPORT_COLUMNS, stream_csv
+
+
+@pytest.fixture
+def pipeline(db, make_user, make_job, make_submission):
+    manager = make_user("manager@example.com", role=UserRole.HIRING_MANAGER)
+    job = make_job(manager, title="Backend")
+    other_job = make_job(manager, title="Frontend")
+    ana = make_user("ana@example.com", current_city="Austin")
+    sam = make_user("sam@example.com")
+    make_submission(ana, job, timeline_history=[{"stage": "Applied", "date": "2026-01-02", "notes": "=HYPERLINK()"}])
+    make_submission(sam, job)
+    make_submission(ana, other_job)
+    db.add(CandidateAssignment(candidate_id=ana.id, manager_id=manager.id))
+    db.commit()
+    return manager, job, ana
+
+
+def _rows(text: str) -> list:
+    return list(csv.DictReader(io.StringIO(text)))
+
+
+def test_job_export_streams_csv(client, headers, pipeline):
+    manager, job, ana = pipeline
+    response = client.get(f"/api/jobs/{job.id}/submissions/export", headers={**headers(manager), "Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    rows = _rows(response.text)
+    assert [row["email"] for row in rows] == ["ana@example.com", "sam@example.com"]
+    assert rows[0]["current_city"] == "Austin" and rows[0]["stage"] == "Applied"
+    # Formula-looking cells are defused
+    assert rows[0]["last_event_notes"] == "'=HYPERLINK()"
+
+
+def test_manager_export_covers_assigned_candidates(client, headers, pipeline):
+    manager, _, ana = pipeline
+    response = client.get("/api/hiring/submissions/export", headers=headers(manager))
+    rows = _rows(response.text)
+    assert {row["candidate_id"] for row in rows} == {str(ana.id)}
+    assert {row["job_title"] for row in rows} == {"Backend", "Frontend"}
+
+
+def test_xlsx_export_is_a_workbook(client, headers, pipeline):
+    manager, job, _ = pipeline
+    response = client.get(f"/api/jobs/{job.id}/submissions/export", params={"format": "xlsx"}, headers=headers(manager))
+    with zipfile.ZipFile(io.BytesIO(response.content)) as workbook:
+        sheet = workbook.read("xl/worksheets/sheet1.xml").decode()
+    assert sheet.count("<row>") == 3
+    assert "ana@example.com" in sheet
+
+
+def test_export_is_limited_to_the_jobs_creator(client, headers, make_user, pipeline):
+    _, job, _ = pipeline
+    other = make_user("other@example.com", role=UserRole.HIRING_MANAGER)
+    assert client.get(f"/api/jobs/{job.id}/submissions/export", headers=headers(other)).status_code == 403
+
+
+def test_csv_chunks_are_bounded(monkeypatch):
+    monkeypatch.setattr("app.services.exports.ROWS_PER_CHUNK", 10)
+    chunks = list(stream_csv([[i] * len(EXPORT_COLUMNS) for i in range(35)]))
+    # Header, three full chunks and the remainder
+    assert len(chunks) == 5
+    assert len(_rows(b"".join(chunks).decode())) == 35
@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import event
+
+from app.core.fieldsets import FieldSelection
+from app.db.session import engine
+from app.models.users import UserRole
+from app.schemas.submissions import SubmissionResponse
+
+
+@pytest.fixture
+def application(client, headers, make_user, make_job, make_submission):
+    manager = make_user("manager@example.com", role=UserRole.HIRING_MANAGER)
+    candidate = make_user("candidate@example.com", current_city="Austin")
+    job = make_job(manager, title="Backend", description="Very long description")
+    make_submission(candidate, job)
+    return candidate
+
+
+def test_parse_rejects_unknown_fields():
+    with pytest.raises(ValueError):
+        FieldSelection.parse(SubmissionResponse, [["nope"]], None)
+    with pytest.raises(ValueError):
+        FieldSelection.parse(SubmissionResponse, None, [["current_status"]])
+    selection = FieldSelection.parse(SubmissionResponse, [["current_status"], ["job", "title"]], None)
+    assert selection.fields == {"id", "current_status"}
+    assert set(selection.expand) == {"job"} and selection.expand["job"].fields == {"id", "title"}
+
+
+def test_fields_and_expand_trim_the_response(client, headers, application):
+    url = "/api/submissions/my-applications"
+    full = client.get(url, headers=headers(application)).json()[0]
+    assert {"candidate", "job", "current_status"} <= full.keys()
+
+    trimmed = client.get(url, params={"fields": "current_status,job.title"}, headers=headers(application)).json()
+    assert trimmed == [{"id": full["id"], "current_status": "Applied", "job": {"id": full["job"]["id"], "title": "Backend"}}]
+
+    bare = client.get(url, params={"expand": ""}, headers=headers(application)).json()[0]
+    assert "job" not in bare and "candidate" not in bare and bare["current_status"] == "Applied"
+
+    assert client.get(url, params={"fields": "salary"}, headers=headers(application)).status_code == 400
+
+
+def test_selection_drives_the_columns_loaded(client, headers, application):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        client.get("/api/submissions/my-applications", params={"fields": "job.title"}, headers=headers(application))
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    job_queries = [s for s in statements if "FROM jobs" in s]
+    assert job_queries and not any("jobs.description" in s for s in job_queries)
+    assert not any("submissions.manager_notes" in s for s in statements)
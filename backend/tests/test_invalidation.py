@@ -0,0 +1,128 @@
+import os
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+
+from app.core import invalidation as invalidation_module
+from app.core.invalidation import InvalidationBus, invalidations
+from app.core.pubsub import INVALIDATIONS, Broker, FileTransport, broker
+from app.models.users import UserRole
+from app.services.assignments import assignment_index
+from app.services.candidate_index import candidate_index
+from app.services.job_search import job_search_index
+
+
+@pytest.fixture
+def bus():
+    bus = InvalidationBus()
+    seen, resyncs = [], []
+    bus.handler("job")(lambda db, job_id: seen.append(job_id))
+    bus.on_resync(lambda: resyncs.append(True))
+    return bus, seen, resyncs
+
+
+def test_consecutive_generations_run_handlers(bus):
+    bus, seen, resyncs = bus
+    bus.receive({"origin": "worker-a", "generation": 5, "keys": ["job:1", "user:9"]})
+    bus.receive({"origin": "worker-a", "generation": 6, "keys": ["job:2"]})
+    bus.receive({"origin": "worker-b", "generation": 1, "keys": ["job:3"]})
+    # Our own messages were applied before they were sent
+    bus.receive({"origin": bus.origin, "generation": 1, "keys": ["job:4"]})
+    assert seen == [1, 2, 3] and resyncs == []
+
+
+def test_generation_gap_resyncs(bus):
+    bus, seen, resyncs = bus
+    bus.receive({"origin": "worker-a", "generation": 1, "keys": ["job:1"]})
+    bus.receive({"origin": "worker-a", "generation": 3, "keys": ["job:3"]})
+    assert seen == [1] and resyncs == [True]
+    # Back in step from the new generation on
+    bus.receive({"origin": "worker-a", "generation": 4, "keys": ["job:4"]})
+    assert seen == [1, 4] and resyncs == [True]
+
+
+def test_failed_publish_leaves_a_gap(bus, monkeypatch):
+    sender, _, _ = bus
+    receiver, seen, resyncs = InvalidationBus(), [], []
+    receiver.handler("job")(lambda db, job_id: seen.append(job_id))
+    receiver.on_resync(lambda: resyncs.append(True))
+
+    sent = []
+    attempts = iter([None, ConnectionError("down"), None])
+
+    def publish(channel, data):
+        failure = next(attempts)
+        if failure:
+            raise failure
+        sent.append(data)
+
+    monkeypatch.setattr(invalidation_module.broker, "publish", publish)
+    for job_id in (1, 2, 3):
+        sender.send([f"job:{job_id}"])
+    for data in sent:
+        receiver.receive(data)
+    assert seen == [1] and resyncs == [True]
+
+
+def test_keys_are_split_into_messages(bus, monkeypatch):
+    sender, _, _ = bus
+    sent = []
+    monkeypatch.setattr(invalidation_module.broker, "publish", lambda channel, data: sent.append(data))
+    sender.send([f"job:{n}" for n in range(invalidation_module.KEYS_PER_MESSAGE + 1)])
+    assert [len(data["keys"]) for data in sent] == [invalidation_module.KEYS_PER_MESSAGE, 1]
+    assert [data["generation"] for data in sent] == [1, 2]
+
+
+WORKER = textwrap.dedent("""
+    import sys
+
+    import app.main  # noqa: F401  registers every model
+    from app.core.invalidation import invalidations
+    from app.db.session import SessionLocal
+    from app.models.jobs import Job
+    from app.models.users import CandidateAssignment, CandidateProfile
+
+    job_id, candidate_id, manager_id = map(int, sys.argv[1:])
+    db = SessionLocal()
+    db.query(Job).filter(Job.id == job_id).one().title = "Data platform engineer"
+    db.query(CandidateProfile).filter(CandidateProfile.user_id == candidate_id).one().current_city = "Denver"
+    db.add(CandidateAssignment(candidate_id=candidate_id, manager_id=manager_id))
+    invalidations.publish(db, f"job:{job_id}", f"user:{candidate_id}", f"assignment:{manager_id}")
+    db.commit()
+    db.close()
+""")
+
+
+def _wait_for(condition, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "invalidation never arrived"
+        time.sleep(0.02)
+
+
+def test_file_transport_carries_writes_between_processes(tmp_path, db, make_user, make_job, monkeypatch):
+    manager = make_user("manager@example.com", role=UserRole.HIRING_MANAGER)
+    candidate = make_user("candidate@example.com", current_city="Austin")
+    job = make_job(manager, title="Backend engineer")
+    job_id, candidate_id, manager_id = job.id, candidate.id, manager.id
+    # This worker serves assignments from its index, as it would with a shared transport
+    monkeypatch.setattr(broker.transport, "cross_process", True)
+
+    log = tmp_path / "pubsub.log"
+    listener = Broker(FileTransport(str(log), poll_interval=0.01), channels=[INVALIDATIONS])
+    listener.listen(INVALIDATIONS, invalidations.receive)
+    listener.start()
+    try:
+        env = {**os.environ, "PUBSUB_BACKEND": f"file:{log}"}
+        subprocess.run(
+            [sys.executable, "-c", WORKER, str(job_id), str(candidate_id), str(manager_id)],
+            env=env, cwd=os.path.dirname(os.path.dirname(__file__)), check=True, timeout=60,
+        )
+        _wait_for(lambda: job_search_index.search("platform") == [job_id])
+        _wait_for(lambda: candidate_index.search({"current_city": ["denver"]}, [])[0] == [candidate_id])
+        _wait_for(lambda: assignment_index.candidates_of(db, manager_id) == {candidate_id})
+    finally:
+        listener.stop()
@@ -0,0 +1,87 @@
+import threading
+import time
+
+import pytest
+
+from app.models.users import UserRole
+from app.services.response_cache import ResponseCache, job_detail_cache
+
+
+@pytest.fixture
+def manager(make_user):
+    return make_user("manager@example.com", role=UserRole.HIRING_MANAGER)
+
+
+def test_closed_jobs_are_only_shown_to_their_creator_and_admins(client, headers, make_user, make_job, manager):
+    closed = make_job(manager, title="Closed", is_active=False)
+    admin = make_user("admin@example.com", role=UserRole.ADMIN)
+    other = make_user("other@example.com", role=UserRole.HIRING_MANAGER)
+    url = f"/api/jobs/{closed.id}"
+
+    assert client.get(url).status_code == 404
+    assert client.get(url, headers={"Authorization": "Bearer not-a-token"}).status_code == 404
+    assert client.get(url, headers=headers(other)).status_code == 404
+    for viewer in (manager, admin):
+        response = client.get(url, headers=headers(viewer))
+        assert response.status_code == 200 and response.json()["title"] == "Closed"
+    # Still not cached, so an anonymous caller can't be served the creator's copy
+    assert client.get(url).status_code == 404
+
+
+def test_closing_a_job_hides_its_cached_detail(client, headers, make_job, manager):
+    job = make_job(manager)
+    assert client.get(f"/api/jobs/{job.id}").status_code == 200
+    assert client.put(f"/api/jobs/{job.id}", json={"is_active": False}, headers=headers(manager)).status_code == 200
+    assert client.get(f"/api/jobs/{job.id}").status_code == 404
+    assert client.get(f"/api/jobs/{job.id}", headers=headers(manager)).status_code == 200
+
+
+def _build_in_background(cache, key, body, release):
+    def build():
+        release.wait()
+        return body
+    thread = threading.Thread(target=cache.get_or_build, args=(key, build))
+    thread.start()
+    return thread
+
+
+def test_discard_only_drops_the_build_of_its_own_key():
+    cache = ResponseCache(ttl=60, max_entries=10)
+    release = threading.Event()
+    threads = [_build_in_background(cache, key, f"job {key}".encode(), release) for key in (1, 2)]
+    while cache.stats()["in_flight"] < 2:
+        time.sleep(0.001)
+    cache.discard(1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert cache.stats()["entries"] == 1
+    # Key 2's build is kept; key 1 is rebuilt
+    built = []
+    cache.get_or_build(1, lambda: built.append(1) or b"job 1")
+    cache.get_or_build(2, lambda: built.append(2) or b"job 2")
+    assert built == [1]
+    assert cache._key_generations == {}
+
+
+def test_clear_drops_every_build_in_flight():
+    cache = ResponseCache(ttl=60, max_entries=10)
+    release = threading.Event()
+    thread = _build_in_background(cache, "page", b"[]", release)
+    while cache.stats()["in_flight"] < 1:
+        time.sleep(0.001)
+    cache.clear()
+    release.set()
+    thread.join()
+    assert cache.stats()["entries"] == 0
+
+
+def test_detail_cache_is_discarded_per_job(client, make_job, manager):
+    first, second = make_job(manager, title="First"), make_job(manager, title="Second")
+    for job in (first, second):
+        client.get(f"/api/jobs/{job.id}")
+    job_detail_cache.discard(first.id)
+    hits = job_detail_cache.stats()["hits"]
+    client.get(f"/api/jobs/{second.id}")
+    assert job_detail_cache.stats()["hits"] == hits + 1
@@ -0,0 +1,38 @@
+import pytest
+
+from app.services.job_fields import parse_experience_years, parse_salary
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("$120k-150k", (120000, 150000, "USD")),
+    ("100k+", (100000, None, None)),
+    ("up to €60,000", (None, 60000, "EUR")),
+    ("12-15 LPA", (1200000, 1500000, "INR")),
+    ("120,000 - 150,000 USD", (120000, 150000, "USD")),
+    ("$40 - $50 per hour", (83200, 104000, "USD")),
+    ("Competitive", (None, None, None)),
+    (None, (None, None, None)),
+])
+def test_parse_salary(text, expected):
+    assert parse_salary(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Only the salary's own amount or range counts, not bonuses or benefits after it
+    ("$95k + 15% bonus", (95000, None)),
+    ("up to $150k (10% bonus)", (None, 150000)),
+    ("USD 100k, 401k match", (100000, 100000)),
+    ("10% equity, $200k", (200000, 200000)),
+    # European thousands separators
+    ("€50.000 - €60.000", (50000, 60000)),
+    ("€1.200.000", (1200000, 1200000)),
+])
+def test_parse_salary_ignores_other_numbers(text, expected):
+    assert parse_salary(text)[:2] == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("3-5 Years", 3), ("5+ yrs", 5), ("Fresher", 0), ("6 months", 0), ("Senior", None), (None, None),
+])
+def test_parse_experience_years(text, expected):
+    assert parse_experience_years(text) == expected
@@ -0,0 +1,59 @@
+import pytest
+
+from app.models.users import UserRole
+from app.services.job_search import JobSearchIndex, tokenize
+
+
+@pytest.fixture
+def manager(make_user):
+    return make_user("manager@example.com", role=UserRole.HIRING_MANAGER)
+
+
+def post_job(client, headers, manager, **fields) -> int:
+    job = {"company_name": "Acme", "description": "", **fields}
+    response = client.post("/api/jobs/", json=job, headers=headers(manager))
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def test_tokenize_keeps_language_names():
+    assert tokenize("C++ and C# on .NET, Node.js") == ["c++", "c#", ".net", "node.js"]
+
+
+def test_index_ranks_title_above_description():
+    index = JobSearchIndex()
+    index.upsert(1, {"title": "Office manager", "description": "Some python scripting"})
+    index.upsert(2, {"title": "Python developer", "description": "Backend services"})
+    index.upsert(3, {"title": "Designer", "description": "Figma"})
+    assert index.search("python") == [2, 1]
+    assert index.search("python backend") == [2]
+    index.remove(2)
+    assert index.search("python") == [1]
+
+
+def test_search_endpoint_follows_writes(client, headers, manager):
+    backend = post_job(client, headers, manager, title="Backend engineer", required_skills="Python, Postgres", location="Austin, TX")
+    post_job(client, headers, manager, title="Frontend engineer", required_skills="React", location="Austin, TX")
+
+    found = client.get("/api/jobs/", params={"q": "python"}).json()
+    assert [job["id"] for job in found] == [backend]
+    found = client.get("/api/jobs/", params={"q": "engineer", "location": "austin"}).json()
+    assert len(found) == 2
+
+    response = client.put(f"/api/jobs/{backend}", json={"title": "Data engineer", "required_skills": "Spark"}, headers=headers(manager))
+    assert response.status_code == 200
+    assert client.get("/api/jobs/", params={"q": "python"}).json() == []
+    assert [job["id"] for job in client.get("/api/jobs/", params={"q": "spark"}).json()] == [backend]
+
+    assert client.delete(f"/api/jobs/{backend}", headers=headers(manager)).status_code == 200
+    assert client.get("/api/jobs/", params={"q": "spark"}).json() == []
+
+
+def test_salary_filters_need_a_currency(client, headers, manager):
+    usd = post_job(client, headers, manager, title="Backend engineer", salary_range="$120k-150k")
+    post_job(client, headers, manager, title="Backend engineer", salary_range="€50.000 - €60.000")
+
+    assert client.get("/api/jobs/", params={"salary_min": 100000}).status_code == 400
+    assert client.get("/api/jobs/", params={"q": "backend", "salary_max": 100000}).status_code == 400
+    found = client.get("/api/jobs/", params={"salary_min": 55000, "salary_currency": "usd"}).json()
+    assert [job["id"] for job in found] == [usd]
@@ -0,0 +1,64 @@
+import asyncio
+import threading
+import time
+
+from app.core import profiler
+from app.core.profiler import StackSampler
+from app.models.users import UserRole
+
+
+def _busy(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_signal_sampler_names_threads_without_enumerating_in_the_handler(monkeypatch):
+    calls = []
+    enumerate_threads = threading.enumerate
+    monkeypatch.setattr(profiler.threading, "enumerate", lambda: calls.append(1) or enumerate_threads())
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy, args=(stop,), name="busy-worker")
+
+    async def run():
+        sampler = StackSampler("test", 0.002)
+        assert sampler.start() and sampler._signal_based
+        worker.start()
+        deadline = time.monotonic() + 0.2
+        while time.monotonic() < deadline:
+            sum(range(1000))
+        stop.set()
+        return sampler.stop()
+
+    profile = asyncio.run(run())
+    worker.join()
+    # Once when sampling starts and once when it stops, never per sample
+    assert len(calls) == 2
+    tracks = {track for track, _ in profile.samples}
+    assert "busy-worker" in tracks and "MainThread" in tracks
+    assert all(isinstance(track, str) for track in tracks)
+    assert "_busy" in profile.collapsed()
+
+
+def test_one_profile_at_a_time():
+    async def run():
+        first, second = StackSampler("a", 0.01), StackSampler("b", 0.01)
+        assert first.start()
+        assert not second.start()
+        first.stop()
+        assert second.start()
+        second.stop()
+
+    asyncio.run(run())
+
+
+def test_profile_header_is_for_admins_only(client, headers, make_user):
+    admin = make_user("admin@example.com", role=UserRole.ADMIN)
+    candidate = make_user("candidate@example.com")
+
+    response = client.get("/api/auth/me", headers={**headers(admin), "X-Profile": "speedscope"})
+    assert response.status_code == 200 and response.headers["x-profiled-status"] == "200"
+    assert response.json()["$schema"].startswith("https://www.speedscope.app")
+
+    response = client.get("/api/auth/me", headers={**headers(candidate), "X-Profile": "collapsed"})
+    assert "x-profiled-status" not in response.headers
+    assert response.json()["email"] == "candidate@example.com"
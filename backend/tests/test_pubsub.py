@@ -0,0 +1,54 @@
+import asyncio
+
+from app.core.config import settings
+from app.core.pubsub import Broker, LocalTransport
+
+
+def _broker(channels=("events",)) -> Broker:
+    broker = Broker(LocalTransport(), channels=list(channels), history_size=3)
+    broker.start()
+    return broker
+
+
+def test_listeners_and_history():
+    broker = _broker()
+    received = []
+    broker.listen("events", received.append)
+    ids = [broker.publish("events", {"n": n}) for n in range(5)]
+
+    assert received == [{"n": n} for n in range(5)]
+    assert ids == sorted(ids)
+    # Only the last `history_size` events are kept for replay
+    assert [e["data"]["n"] for e in broker.replay("events", 0)] == [2, 3, 4]
+    assert [e["data"]["n"] for e in broker.replay("events", ids[3])] == [4]
+
+
+def test_subscribers_get_events_in_order():
+    async def run():
+        broker = _broker()
+        queue = broker.subscribe("events")
+        for n in range(3):
+            broker.publish("events", {"n": n})
+        await asyncio.sleep(0)
+        return [queue.get_nowait()["data"]["n"] for _ in range(queue.qsize())]
+
+    assert asyncio.run(run()) == [0, 1, 2]
+
+
+def test_slow_subscriber_is_dropped_not_buffered(monkeypatch):
+    monkeypatch.setattr(settings, "SSE_QUEUE_SIZE", 2)
+
+    async def run():
+        broker = _broker()
+        slow, fast = broker.subscribe("events"), broker.subscribe("events")
+        for n in range(5):
+            broker.publish("events", {"n": n})
+            await asyncio.sleep(0)
+            while not fast.empty():
+                fast.get_nowait()
+        return broker, slow, fast
+
+    broker, slow, fast = asyncio.run(run())
+    assert slow.qsize() == 2 and slow.overflowed
+    assert slow not in broker.subscribers["events"]
+    assert not fast.overflowed and fast in broker.subscribers["events"]
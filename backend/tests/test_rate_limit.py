@@ -0,0 +1,56 @@
+import pytest
+
+from app.core.config import settings
+from app.core.rate_limit import InMemoryBackend, Limit, RateLimiter, SQLiteBackend, rate_limiter
+from app.models.users import UserRole
+from tests.conftest import PASSWORD
+
+
+@pytest.fixture
+def limits_on(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUST_PROXY", True)
+    monkeypatch.setattr(rate_limiter, "backend", InMemoryBackend())
+
+
+def test_limit_parse():
+    assert Limit.parse("5/60") == Limit(capacity=5, refill_per_second=5 / 60)
+    assert Limit.parse("unlimited") is None
+
+
+def test_bucket_refills():
+    backend, limit = InMemoryBackend(), Limit(capacity=2, refill_per_second=1)
+    assert backend.take("k", limit, 0.0) == 0
+    assert backend.take("k", limit, 0.0) == 0
+    assert backend.take("k", limit, 0.0) == pytest.approx(1.0)
+    assert backend.take("k", limit, 1.0) == 0
+
+
+def test_sqlite_backend_is_shared(tmp_path):
+    limit = Limit(capacity=1, refill_per_second=0.001)
+    first, second = SQLiteBackend(str(tmp_path / "rl.db")), SQLiteBackend(str(tmp_path / "rl.db"))
+    assert first.take("k", limit, 100.0) == 0
+    assert second.take("k", limit, 100.0) > 0
+
+
+def test_role_override():
+    limiter = RateLimiter(InMemoryBackend(), {"apply": "1/60", "apply:ADMIN": "unlimited"})
+    assert limiter.get_limit("apply", "ADMIN") is None
+    assert limiter.get_limit("apply", "CANDIDATE") == Limit.parse("1/60")
+
+
+def _login(client, email, password, ip):
+    return client.post(
+        "/api/auth/token", data={"username": email, "password": password}, headers={"X-Forwarded-For": ip},
+    )
+
+
+def test_failed_logins_only_throttle_their_own_ip(client, make_user, limits_on):
+    user = make_user("victim@example.com", UserRole.CANDIDATE)
+    for _ in range(5):
+        assert _login(client, user.email, "wrong", "10.0.0.1").status_code == 401
+    blocked = _login(client, user.email, PASSWORD, "10.0.0.1")
+    assert blocked.status_code == 429
+    assert int(blocked.headers["Retry-After"]) > 0
+
+    assert _login(client, user.email, PASSWORD, "10.0.0.2").status_code == 200
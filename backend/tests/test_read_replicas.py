@@ -0,0 +1,96 @@
+import pytest
+from sqlalchemy import create_engine, event
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db import session as db_session
+from app.db.session import ReplicaPool, SessionLocal, engine, get_read_db, wrote_recently
+from app.models.jobs import Job
+from app.models.users import UserRole
+
+
+def _request(user=None) -> Request:
+    headers = []
+    if user is not None:
+        token = create_access_token({"sub": str(user.id), "role": user.role.value})
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+    return Request({"type": "http", "headers": headers})
+
+
+@pytest.fixture
+def replica():
+    # The replica is the primary database file opened through another engine
+    return create_engine(str(engine.url))
+
+
+def test_pick_uses_probe_results_only(replica, tmp_path, monkeypatch):
+    broken = create_engine(f"sqlite:///{tmp_path}/missing/dir/replica.db")
+    pool = ReplicaPool([broken, replica], check_interval=60)
+    # Out of rotation until probed
+    assert pool.pick() is None
+
+    pool.probe_all()
+    probes = []
+    monkeypatch.setattr(pool, "probe", lambda engine: probes.append(engine))
+    assert {pool.pick() for _ in range(4)} == {replica}
+    assert probes == []
+
+
+def test_background_probe_brings_replicas_into_rotation(replica):
+    pool = ReplicaPool([replica], check_interval=0.05)
+    pool.start()
+    try:
+        for _ in range(100):
+            if pool.pick() is replica:
+                break
+            pool._stopping.wait(0.01)
+        assert pool.pick() is replica
+    finally:
+        pool.stop()
+
+
+def test_replica_session_refuses_writes_before_sending_them(replica):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(replica, "before_cursor_execute", listener)
+    read_db = SessionLocal(bind=replica)
+    read_db.info["read_only"] = True
+    try:
+        read_db.add(Job(title="t", company_name="c", description="d"))
+        with pytest.raises(RuntimeError):
+            read_db.flush()
+        assert not any(s.lstrip().upper().startswith("INSERT") for s in statements)
+    finally:
+        read_db.close()
+        event.remove(replica, "before_cursor_execute", listener)
+
+
+def test_reads_stay_on_primary_right_after_a_write(db, make_user, replica, monkeypatch):
+    pool = ReplicaPool([replica], check_interval=60)
+    pool.probe_all()
+    monkeypatch.setattr(db_session, "replica_pool", pool)
+    user = make_user("writer@example.com", UserRole.HIRING_MANAGER)
+
+    reads = get_read_db(_request(user), db)
+    assert next(reads).info.get("read_only") is True
+    reads.close()
+
+    db.info["user_id"] = user.id
+    db.add(Job(title="t", company_name="c", description="d", creator_id=user.id))
+    db.commit()
+    assert wrote_recently(user.id)
+    reads = get_read_db(_request(user), db)
+    assert next(reads) is db
+    reads.close()
+
+
+def test_old_write_marks_are_pruned(db, make_user, monkeypatch):
+    monkeypatch.setattr(settings, "READ_YOUR_WRITES_SECONDS", 0.0)
+    monkeypatch.setattr(db_session, "_last_pruned_at", 0.0)
+    db_session._last_write_at[-1] = 0.0
+    user = make_user("pruner@example.com", UserRole.HIRING_MANAGER)
+    db.info["user_id"] = user.id
+    db.add(Job(title="t", company_name="c", description="d", creator_id=user.id))
+    db.commit()
+    assert -1 not in db_session._last_write_at
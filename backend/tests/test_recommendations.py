@@ -0,0 +1,61 @@
+from app.models.users import UserRole
+from app.services.recommendations import RecommendationEngine, candidate_features, job_features, score
+
+
+def test_score_needs_a_shared_skill_or_city():
+    candidate = candidate_features({1, 2}, None, "1-3 years")
+    # Neither side knows its city: that's no city match
+    assert score(candidate, job_features({1}, None, "5 years")) == 0.6
+    assert score(candidate, job_features({3}, None, None)) == 0.0
+    assert score(candidate_features({1}, "Boston", "5+ years"), job_features({1, 2}, "boston, MA", "4 years")) == 0.7
+
+
+def test_heaps_follow_job_and_profile_changes():
+    engine = RecommendationEngine(k=2)
+    engine.upsert_candidate(1, candidate_features({1, 2}, "Austin", "5+ years"))
+    engine.upsert_job(10, {1, 7}, None, None)
+    engine.upsert_job(11, {1, 2}, None, None)
+    engine.upsert_job(12, {3}, None, None)
+    assert [job_id for job_id, _ in engine.recommendations(1)] == [11, 10]
+
+    # A better job displaces the weakest entry of an existing heap
+    engine.upsert_job(13, {1, 2}, "Austin", None)
+    engine.upsert_job(14, {2, 5}, None, "1 year")
+    assert [job_id for job_id, _ in engine.recommendations(1)] == [13, 11]
+
+    # Closing a held job brings back the best one that was cut
+    engine.remove_job(13)
+    assert [job_id for job_id, _ in engine.recommendations(1)] == [11, 14]
+
+    engine.upsert_candidate(1, candidate_features({3}, None, None))
+    assert [job_id for job_id, _ in engine.recommendations(1)] == [12]
+
+
+def test_recompute_scores_like_offer():
+    engine = RecommendationEngine(k=5)
+    engine.upsert_job(10, {1}, None, "2 years")
+    engine.upsert_candidate(1, candidate_features({1}, None, None))
+    built = engine.recommendations(1)
+
+    offered = RecommendationEngine(k=5)
+    offered.upsert_candidate(1, candidate_features({1}, None, None))
+    offered.recommendations(1)
+    offered.upsert_job(10, {1}, None, "2 years")
+    assert built == offered.recommendations(1) == ((10, 0.6),)
+
+
+def test_recommendations_endpoint(client, make_user, headers):
+    manager = make_user("manager@example.com", role=UserRole.HIRING_MANAGER)
+    candidate = make_user("candidate@example.com")
+    client.put("/api/candidates/profile", json={"primary_skills": "Python, Docker", "current_city": "Austin"}, headers=headers(candidate))
+    job = {"company_name": "Acme", "description": ""}
+    python = client.post("/api/jobs/", json={**job, "title": "Backend", "required_skills": "Python"}, headers=headers(manager)).json()
+    client.post("/api/jobs/", json={**job, "title": "Design", "required_skills": "Figma"}, headers=headers(manager))
+
+    response = client.get("/api/candidates/recommendations", headers=headers(candidate))
+    assert response.status_code == 200
+    assert [item["job"]["id"] for item in response.json()] == [python["id"]]
+
+    client.delete(f"/api/jobs/{python['id']}", headers=headers(manager))
+    assert client.get("/api/candidates/recommendations", headers=headers(candidate)).json() == []
+    assert client.get("/api/candidates/recommendations", headers=headers(manager)).status_code == 403
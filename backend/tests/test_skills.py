@@ -0,0 +1,54 @@
+from app.models.skills import CandidateSkill, Skill
+from app.models.users import UserRole
+from app.services.skills import SkillMatcher, skill_resolver
+
+
+def test_resolve_maps_aliases_and_creates_unknown_skills(db):
+    ids = skill_resolver.resolve(db, "JS, javascript; golang, Rust")
+    db.commit()
+    assert len(ids) == 3
+    assert sorted(name for (name,) in db.query(Skill.name).filter(Skill.id.in_(ids))) == ["Go", "JavaScript", "rust"]
+
+
+def test_at_least_counts_matches_per_candidate():
+    matcher = SkillMatcher()
+    holdings = {1: {1, 2, 3, 4, 5}, 2: {1, 2, 3, 4}, 3: {1, 2, 3}, 4: {6}, 5: set()}
+    for user_id, skill_ids in holdings.items():
+        matcher.set_candidate(user_id, skill_ids)
+    matcher.set_job(10, {1, 2, 3, 4, 5})
+
+    matches, required = matcher.covering(10, 0.8)
+    assert required == 5
+    assert matches == [(1, 5), (2, 4)]
+    assert [user_id for user_id, _ in matcher.covering(10, 0.2)[0]] == [1, 2, 3]
+    # `within` limits the scope to a subset of candidates
+    assert matcher.covering(10, 0.2, within=matcher.user_ids_to_bits([3, 4]))[0] == [(3, 3)]
+
+    matcher.set_candidate(1, {6})
+    assert matcher.covering(10, 0.8)[0] == [(2, 4)]
+    assert matcher.covering(11, 0.8) == ([], 0)
+
+
+def test_matching_candidates_endpoint(client, db, make_user, headers):
+    manager = make_user("manager@example.com", role=UserRole.HIRING_MANAGER)
+    admin = make_user("admin@example.com", role=UserRole.ADMIN)
+    strong = make_user("strong@example.com")
+    weak = make_user("weak@example.com")
+    for user, skills in ((strong, "JS, py, k8s, docker"), (weak, "Python")):
+        response = client.put("/api/candidates/profile", json={"primary_skills": skills}, headers=headers(user))
+        assert response.status_code == 200
+    assert {row.user_id for row in db.query(CandidateSkill)} == {strong.id, weak.id}
+
+    job = client.post(
+        "/api/jobs/",
+        json={"title": "Platform", "company_name": "Acme", "description": "", "required_skills": "JavaScript, Python, Kubernetes, Docker, Go"},
+        headers=headers(manager),
+    ).json()
+
+    response = client.get(f"/api/jobs/{job['id']}/matching-candidates", params={"min_coverage": 0.8}, headers=headers(admin))
+    assert response.status_code == 200
+    assert [(m["candidate"]["id"], m["matched_skills"], m["required_skills"]) for m in response.json()] == [(strong.id, 4, 5)]
+
+    # Managers only see the candidates assigned to them
+    response = client.get(f"/api/jobs/{job['id']}/matching-candidates", params={"min_coverage": 0.2}, headers=headers(manager))
+    assert response.json() == []
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.submissions import Submission, SubmissionAlert, SubmissionStatus
+from app.models.tasks import Task, TaskStatus
+from app.models.users import CandidateAssignment, UserRole
+from app.services import scheduler as scheduler_module
+from app.services.scheduler import Scheduler
+from app.services.stage_sla import scan_stalled_submissions
+
+
+def days_ago(days: float) -> datetime:
+    return datetime.utcnow() - timedelta(days=days)
+
+
+@pytest.fixture
+def pipeline(db, make_user, make_job, make_submission):
+    manager = make_user("manager@example.com", role=UserRole.HIRING_MANAGER)
+    other_manager = make_user("other@example.com", role=UserRole.HIRING_MANAGER)
+    mine = make_user("mine@example.com")
+    theirs = make_user("theirs@example.com")
+    db.add_all([
+        CandidateAssignment(candidate_id=mine.id, manager_id=manager.id),
+        CandidateAssignment(candidate_id=theirs.id, manager_id=other_manager.id),
+    ])
+    db.commit()
+
+    job = make_job(manager)
+    # Technical interviews may take 3 days here instead of the default 14
+    strict = make_job(manager, stage_sla_days={"Technical Interview": 3})
+    closed = make_job(manager, is_active=False)
+    ids = {
+        "stalled": make_submission(mine, job, stage_entered_at=days_ago(10)).id,
+        "fresh": make_submission(mine, strict, stage_entered_at=days_ago(2)).id,
+        "strict": make_submission(mine, strict, status=SubmissionStatus.INTERVIEW_TECH, stage_entered_at=days_ago(5)).id,
+        "default": make_submission(theirs, job, status=SubmissionStatus.INTERVIEW_TECH, stage_entered_at=days_ago(5)).id,
+        "offer": make_submission(theirs, strict, status=SubmissionStatus.OFFER, stage_entered_at=days_ago(90)).id,
+        "closed": make_submission(theirs, closed, stage_entered_at=days_ago(30)).id,
+        "theirs": make_submission(theirs, strict, stage_entered_at=days_ago(8)).id,
+    }
+    return manager, ids
+
+
+def alerted(db) -> set:
+    db.expire_all()
+    return {alert.submission_id for alert in db.query(SubmissionAlert)}
+
+
+def test_scan_applies_each_jobs_thresholds(db, pipeline):
+    _, ids = pipeline
+    scan_stalled_submissions(db, {"batch_size": 1})
+    assert alerted(db) == {ids["stalled"], ids["strict"], ids["theirs"]}
+    alert = db.query(SubmissionAlert).filter(SubmissionAlert.submission_id == ids["strict"]).one()
+    assert alert.threshold_days == 3 and alert.status == SubmissionStatus.INTERVIEW_TECH
+
+
+def test_rescan_keeps_first_seen_and_drops_resolved_alerts(db, pipeline):
+    _, ids = pipeline
+    scan_stalled_submissions(db, {})
+    first_seen = db.query(SubmissionAlert.first_seen_at).filter(SubmissionAlert.submission_id == ids["stalled"]).scalar()
+
+    db.query(Submission).filter(Submission.id == ids["theirs"]).one().stage_entered_at = days_ago(1)
+    db.commit()
+    scan_stalled_submissions(db, {})
+
+    assert alerted(db) == {ids["stalled"], ids["strict"]}
+    assert db.query(SubmissionAlert.first_seen_at).filter(SubmissionAlert.submission_id == ids["stalled"]).scalar() == first_seen
+
+
+def test_needs_attention_feed(client, db, headers, make_user, pipeline):
+    manager, ids = pipeline
+    admin = make_user("admin@example.com", role=UserRole.ADMIN)
+    scan_stalled_submissions(db, {})
+
+    feed = client.get("/api/hiring/needs-attention", headers=headers(manager)).json()
+    # Only the manager's own candidates, longest stuck first
+    assert [alert["submission_id"] for alert in feed] == [ids["stalled"], ids["strict"]]
+    assert feed[0]["days_in_stage"] == 10 and feed[0]["current_status"] == "Applied"
+
+    feed = client.get("/api/hiring/needs-attention", params={"stage": "Applied"}, headers=headers(admin)).json()
+    assert [alert["submission_id"] for alert in feed] == [ids["stalled"], ids["theirs"]]
+    assert client.get("/api/hiring/needs-attention", params={"stage": "Hired"}, headers=headers(admin)).status_code == 400
+
+
+def test_moving_a_submission_clears_its_alert(client, db, headers, pipeline):
+    manager, ids = pipeline
+    scan_stalled_submissions(db, {})
+    response = client.put(
+        f"/api/submissions/{ids['stalled']}/stage", json={"current_status": "Online Assessment"}, headers=headers(manager),
+    )
+    assert response.status_code == 200
+    assert ids["stalled"] not in alerted(db)
+
+
+def test_scheduler_enqueues_due_tasks_once(db, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(scheduler_module, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+    scheduler = Scheduler()
+    scheduler.every(60, "scan_stalled_submissions", {"batch_size": 10})
+    scheduler.every(3600, "archive_submissions")
+
+    assert scheduler.run_pending() == ["scan_stalled_submissions", "archive_submissions"]
+    clock[0] += 30
+    assert scheduler.run_pending() == []
+
+    # The scan's previous run is still queued, so its slot is skipped
+    clock[0] += 31
+    assert scheduler.run_pending() == []
+    db.query(Task).filter(Task.name == "scan_stalled_submissions").update({Task.status: TaskStatus.DONE})
+    db.commit()
+    clock[0] += 60
+    assert scheduler.run_pending() == ["scan_stalled_submissions"]
+
+    tasks = db.query(Task).filter(Task.name == "scan_stalled_submissions").order_by(Task.id).all()
+    assert len(tasks) == 2 and tasks[-1].payload == {"batch_size": 10}
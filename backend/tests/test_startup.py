@@ -0,0 +1,61 @@
+from sqlalchemy import create_engine, text
+
+from app.core.startup import StartupTimer, on_warmup, run_warmup_hooks, startup_timer, _warmup_hooks
+from app.db.schema import check_schema_revision, get_head_revision, warm_up_pool
+
+
+def test_revision_check_without_alembic_table(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/empty.db")
+    assert check_schema_revision(engine) is False
+
+
+def test_revision_check_compares_with_head(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/versioned.db")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)"))
+        conn.execute(text("INSERT INTO alembic_version VALUES ('0000000000')"))
+    assert check_schema_revision(engine) is False
+
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE alembic_version SET version_num = :head"), {"head": get_head_revision()})
+    assert check_schema_revision(engine) is True
+
+
+def test_pool_warmup_returns_connections(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/pool.db")
+    warm_up_pool(engine, 2)
+    assert engine.pool.checkedout() == 0
+
+
+def test_startup_records_phases(client):
+    for phase in ("imports", "routers", "db_check", "pool_warmup"):
+        assert phase in startup_timer.phases
+    assert any(name.startswith("warmup:") for name in startup_timer.phases)
+
+
+def test_failing_warmup_hook_does_not_stop_the_others():
+    ran = []
+
+    @on_warmup("test_failing")
+    def failing():
+        raise RuntimeError("boom")
+
+    @on_warmup("test_after")
+    def after():
+        ran.append(True)
+
+    try:
+        run_warmup_hooks()
+    finally:
+        del _warmup_hooks[-2:]
+    assert ran == [True]
+
+
+def test_timer_phase_records_on_error():
+    timer = StartupTimer()
+    try:
+        with timer.phase("broken"):
+            raise ValueError
+    except ValueError:
+        pass
+    assert "broken" in timer.phases
@@ -0,0 +1,72 @@
+from app.models.users import UserRole
+from app.services import suggest
+from app.services.suggest import SuggestIndex, suggest_index
+
+
+def test_prefix_lookup_counts_distinct_values():
+    index = SuggestIndex()
+    index.set_values(("job", 1), {"location": ["New  York", "Remote"]})
+    index.set_values(("job", 2), {"location": ["new york"]})
+    index.set_values(("job", 3), {"location": ["Newark", " ", None]})
+    assert index.suggest("location", "NEW") == [("New  York", 2), ("Newark", 1)]
+    assert index.suggest("location", "new y") == [("New  York", 2)]
+    assert index.suggest("location", "", limit=1) == [("New  York", 2)]
+
+    index.set_values(("job", 1), {"location": ["Remote"]})
+    index.remove(("job", 2))
+    assert index.suggest("location", "new") == [("Newark", 1)]
+    assert index.suggest("location", "re") == [("Remote", 1)]
+
+
+def test_memoized_prefixes_follow_changes(monkeypatch):
+    monkeypatch.setattr(suggest, "MEMO_MIN_MATCHES", 2)
+    index = SuggestIndex()
+    for job_id, title in enumerate(["Engineer", "Engineer", "Engine tuner", "Envoy"], start=1):
+        index.set_values(("job", job_id), {"title": [title]})
+    assert index.suggest("title", "en", limit=2) == [("Engineer", 2), ("Engine tuner", 1)]
+    assert "en" in index.fields["title"].memo
+
+    index.set_values(("job", 5), {"title": ["Envoy"]})
+    index.set_values(("job", 6), {"title": ["Envoy"]})
+    assert index.suggest("title", "en", limit=2) == [("Envoy", 3), ("Engineer", 2)]
+
+
+def test_endpoint_follows_job_writes(client, headers, make_user):
+    manager = make_user("manager@example.com", role=UserRole.HIRING_MANAGER)
+    body = {"title": "Engineer", "company_name": "Acme", "description": "", "location": "Denver", "required_skills": "Python"}
+    job_id = client.post("/api/jobs/", json=body, headers=headers(manager)).json()["id"]
+
+    def values(field, prefix):
+        response = client.get("/api/suggest", params={"field": field, "prefix": prefix}, headers=headers(manager))
+        assert response.status_code == 200
+        return [(s["value"], s["count"]) for s in response.json()]
+
+    assert values("location", "den") == [("Denver", 1)]
+    assert values("skill", "pyt") == [("Python", 1)]
+
+    client.put(f"/api/jobs/{job_id}", json={"location": "Boulder"}, headers=headers(manager))
+    assert values("location", "den") == [] and values("location", "b") == [("Boulder", 1)]
+
+    client.put(f"/api/jobs/{job_id}", json={"is_active": False}, headers=headers(manager))
+    assert values("location", "b") == [] and values("skill", "pyt") == []
+
+
+def test_load_matches_incremental_updates(client, headers, db, make_user, make_job):
+    manager = make_user("manager@example.com", role=UserRole.HIRING_MANAGER)
+    candidate = make_user("candidate@example.com", current_city="Austin")
+    client.put("/api/candidates/profile", json={"primary_skills": "Python, Go", "current_city": "austin "}, headers=headers(candidate))
+    make_job(manager, location="Austin")
+    make_job(manager, location="Closed town", is_active=False)
+
+    incremental = {field: suggest_index.suggest(field, "", 50) for field in suggest.FIELDS}
+    reloaded = SuggestIndex()
+    reloaded.load(db)
+    assert {field: reloaded.suggest(field, "", 50) for field in suggest.FIELDS} == incremental
+    assert incremental["location"] == [("Austin", 1)]
+    assert incremental["current_city"] == [("austin", 1)]
+
+
+def test_unknown_field_or_anonymous_is_rejected(client, headers, make_user):
+    user = make_user("candidate@example.com")
+    assert client.get("/api/suggest", params={"field": "salary"}, headers=headers(user)).status_code == 422
+    assert client.get("/api/suggest", params={"field": "title"}).status_code == 401
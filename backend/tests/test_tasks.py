@@ -0,0 +1,103 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.models.tasks import Task, TaskStatus
+from app.services.tasks import RetryLater, task_queue
+
+
+def _register(monkeypatch, name, handler):
+    monkeypatch.setitem(task_queue.handlers, name, handler)
+
+
+def _enqueue(db, name, payload=None, **fields):
+    task = task_queue.enqueue(db, name, payload or {})
+    for key, value in fields.items():
+        setattr(task, key, value)
+    db.commit()
+    return task.id
+
+
+def _task(db, task_id) -> Task:
+    db.expire_all()
+    return db.query(Task).filter(Task.id == task_id).one()
+
+
+def test_task_runs_once_committed(db, monkeypatch):
+    seen = []
+    _register(monkeypatch, "test_echo", lambda session, payload: seen.append(payload["n"]))
+    task_id = _enqueue(db, "test_echo", {"n": 1})
+
+    assert task_queue.run_once() == 1
+    assert seen == [1]
+    task = _task(db, task_id)
+    assert task.status == TaskStatus.DONE and task.attempts == 1 and task.locked_until is None
+
+
+def test_failures_retry_then_fail(db, monkeypatch):
+    def failing(session, payload):
+        raise RetryLater("input not ready")
+    _register(monkeypatch, "test_failing", failing)
+    task_id = _enqueue(db, "test_failing", max_attempts=2)
+
+    task_queue.run_once()
+    task = _task(db, task_id)
+    assert task.status == TaskStatus.QUEUED and task.last_error == "input not ready"
+    assert task.run_at > datetime.utcnow()
+
+    task.run_at = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+    task_queue.run_once()
+    assert _task(db, task_id).status == TaskStatus.FAILED
+
+
+def test_expired_lease_on_last_attempt_fails_instead_of_running(db, monkeypatch):
+    ran = []
+    _register(monkeypatch, "test_crashed", lambda session, payload: ran.append(True))
+    task_id = _enqueue(
+        db, "test_crashed", status=TaskStatus.RUNNING, attempts=3, max_attempts=3,
+        locked_until=datetime.utcnow() - timedelta(seconds=1),
+    )
+
+    assert task_queue.run_once() == 0
+    assert ran == []
+    task = _task(db, task_id)
+    assert task.status == TaskStatus.FAILED and "Lease expired" in task.last_error
+
+
+def test_expired_lease_is_claimed_again(db, monkeypatch):
+    ran = []
+    _register(monkeypatch, "test_crashed", lambda session, payload: ran.append(True))
+    task_id = _enqueue(
+        db, "test_crashed", status=TaskStatus.RUNNING, attempts=1, max_attempts=3,
+        locked_until=datetime.utcnow() - timedelta(seconds=1),
+    )
+    assert task_queue.run_once() == 1
+    assert ran == [True]
+    assert _task(db, task_id).attempts == 2
+
+
+def test_heartbeat_keeps_long_handlers_leased(db, monkeypatch):
+    monkeypatch.setattr(settings, "TASK_VISIBILITY_TIMEOUT", 0.3)
+    started, release = threading.Event(), threading.Event()
+
+    def slow(session, payload):
+        started.set()
+        release.wait(5)
+    _register(monkeypatch, "test_slow", slow)
+    task_id = _enqueue(db, "test_slow")
+
+    worker = threading.Thread(target=task_queue.run_once)
+    worker.start()
+    try:
+        assert started.wait(5)
+        # Three original lease lengths later the task is still leased to the first worker
+        time.sleep(0.9)
+        assert task_queue.claim(db, 10) == []
+        assert _task(db, task_id).locked_until > datetime.utcnow()
+    finally:
+        release.set()
+        worker.join()
+    task = _task(db, task_id)
+    assert task.status == TaskStatus.DONE and task.attempts == 1
@@ -0,0 +1,72 @@
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal, commit_unit_of_work, get_db
+from app.models.jobs import Job
+from app.models.users import User, UserRole
+
+
+@pytest.fixture
+def commits():
+    committed = []
+    listener = lambda session: committed.append(session)
+    event.listen(SessionLocal, "after_commit", listener)
+    yield committed
+    event.remove(SessionLocal, "after_commit", listener)
+
+
+@pytest.fixture
+def uow_client(make_user):
+    """A bare app with the same app-wide dependency as app.main."""
+    creator = make_user("manager@example.com", role=UserRole.HIRING_MANAGER)
+    uow = FastAPI(dependencies=[Depends(commit_unit_of_work, scope="function")])
+
+    @uow.post("/jobs")
+    def create(title: str, fail: bool = False, db: Session = Depends(get_db)):
+        job = Job(title=title, company_name="Acme", description="", creator_id=creator.id)
+        db.add(job)
+        db.flush()
+        if fail:
+            raise HTTPException(status_code=400, detail="rejected after the flush")
+        return {"id": job.id}
+
+    @uow.put("/jobs/{job_id}")
+    def rename(job_id: int, title: str, db: Session = Depends(get_db)):
+        db.query(Job).filter(Job.id == job_id).one().title = title
+        # Another request wins the race before this one's commit
+        other = SessionLocal()
+        try:
+            other.query(Job).filter(Job.id == job_id).one().title = "Theirs"
+            other.commit()
+        finally:
+            other.close()
+        return {"id": job_id}
+
+    with TestClient(uow) as client:
+        yield client
+
+
+def test_request_commits_once(client, commits, db):
+    response = client.post(
+        "/api/auth/register",
+        json={"email": "new@example.com", "password": "password", "first_name": "New", "last_name": "User", "role": "CANDIDATE"},
+    )
+    assert response.status_code == 200
+    assert len(commits) == 1
+    assert db.query(User).filter(User.email == "new@example.com").count() == 1
+
+
+def test_nothing_is_committed_when_the_endpoint_raises(uow_client, db):
+    assert uow_client.post("/jobs", params={"title": "Kept"}).status_code == 200
+    assert uow_client.post("/jobs", params={"title": "Dropped", "fail": True}).status_code == 400
+    assert [job.title for job in db.query(Job)] == ["Kept"]
+
+
+def test_version_conflict_at_commit_is_the_response(uow_client, db):
+    job_id = uow_client.post("/jobs", params={"title": "Original"}).json()["id"]
+    response = uow_client.put(f"/jobs/{job_id}", params={"title": "Mine"})
+    assert response.status_code == 409
+    assert db.query(Job.title).filter(Job.id == job_id).scalar() == "Theirs"
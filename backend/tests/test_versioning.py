@@ -0,0 +1,63 @@
+import pytest
+from fastapi import HTTPException
+
+from app.core.versioning import flush_versioned
+from app.db.session import SessionLocal
+from app.models.submissions import Submission, SubmissionStatus
+from app.models.users import CandidateAssignment, UserRole
+
+
+@pytest.fixture
+def pipeline(db, make_user, make_job, make_submission):
+    manager = make_user("manager@example.com", role=UserRole.HIRING_MANAGER)
+    candidate = make_user("candidate@example.com")
+    job = make_job(manager)
+    submission = make_submission(candidate, job)
+    db.add(CandidateAssignment(candidate_id=candidate.id, manager_id=manager.id))
+    db.commit()
+    return manager, job, submission
+
+
+def test_stage_updates_honour_if_match(client, headers, pipeline):
+    manager, _, submission = pipeline
+    url = f"/api/submissions/{submission.id}/stage"
+
+    response = client.put(url, json={"current_status": "Online Assessment"}, headers={**headers(manager), "If-Match": '"1"'})
+    assert response.status_code == 200
+    assert response.headers["etag"] == '"2"' and response.json()["version"] == 2
+
+    # A second writer still holding version 1 is refused
+    response = client.put(url, json={"current_status": "Rejected"}, headers={**headers(manager), "If-Match": '"1"'})
+    assert response.status_code == 409
+    assert response.headers["etag"] == '"2"'
+
+    response = client.put(url, json={"current_status": "Rejected"}, headers={**headers(manager), "If-Match": 'W/"2"'})
+    assert response.status_code == 200
+
+
+def test_job_updates_honour_if_match(client, headers, pipeline):
+    manager, job, _ = pipeline
+    response = client.put(f"/api/jobs/{job.id}", json={"title": "Staff engineer"}, headers={**headers(manager), "If-Match": '"7"'})
+    assert response.status_code == 409
+    response = client.put(f"/api/jobs/{job.id}", json={"title": "Staff engineer"}, headers={**headers(manager), "If-Match": "*"})
+    assert response.status_code == 200 and response.headers["etag"] == '"2"'
+
+
+def test_lost_race_is_a_conflict(db, pipeline):
+    _, _, submission = pipeline
+    mine = db.query(Submission).filter(Submission.id == submission.id).one()
+
+    other = SessionLocal()
+    try:
+        theirs = other.query(Submission).filter(Submission.id == submission.id).one()
+        theirs.status = SubmissionStatus.REJECTED
+        other.commit()
+    finally:
+        other.close()
+
+    mine.status = SubmissionStatus.OFFER
+    with pytest.raises(HTTPException) as raised:
+        flush_versioned(db)
+    assert raised.value.status_code == 409
+    db.expire_all()
+    assert db.query(Submission.status).filter(Submission.id == submission.id).scalar() == SubmissionStatus.REJECTED
@@ -0,0 +1,31 @@
+import argparse
+import logging
+import signal
+import threading
+
+from app.services.scheduler import scheduler
+from app.services.tasks import task_queue
+
+# Importing these registers their task handlers and schedules
+from app.services import ats_service, resume_parser, dedup, archival, stage_sla  # noqa: F401
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+stopping = False
+
+def request_stop(signum, frame):
+    global stopping
+    logger.info("Stopping task worker after the current batch")
+    stopping = True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run background tasks")
+    parser.add_argument("--no-scheduler", action="store_true", help="don't enqueue periodic tasks (run the scheduler in one worker only)")
+    args = parser.parse_args()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    if not args.no_scheduler:
+        threading.Thread(target=scheduler.run, args=(lambda: stopping,), name="scheduler", daemon=True).start()
+    task_queue.run_worker(should_stop=lambda: stopping)